@@ -0,0 +1,94 @@
+"""Throughput of core.antispam.SpamDetector on a synthetic message stream.
+
+Replays a mix of normal chatter (many users, a few channels) and bursts
+from spammers (rapid posts, repeated text, mass mentions, copy-pasted
+raid messages) through the detector on one core, and reports messages
+per second, hits by kind and how much state the detector ended up with.
+Exits non-zero if throughput falls below --target.
+
+    python benchmarks/antispam_throughput.py [--messages 500000] [--users 50000] [--target 10000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.antispam import SpamDetector, SpamRules
+
+GUILD_ID = 1
+WORDS = "the a bot deploy error python rust async await cache shard thread merge review fix test".split()
+
+
+def build_stream(messages: int, users: int, channels: int, spam_ratio: float, seed: int) -> list[tuple]:
+    rng = random.Random(seed)
+    spammers = list(range(users, users + max(users // 100, 1)))
+    stream = []
+    now = 0.0
+
+    while len(stream) < messages:
+        now += rng.expovariate(100.0)
+        channel_id = rng.randrange(channels)
+
+        if rng.random() < spam_ratio:
+            user_id = rng.choice(spammers)
+            style = rng.randrange(3)
+            # A burst of a few messages in quick succession
+            for _ in range(rng.randint(3, 8)):
+                if style == 0:
+                    content, mentions = "FREE NITRO https://example.invalid", 0
+                elif style == 1:
+                    content, mentions = "@everyone look", 10
+                else:
+                    content, mentions = f"spam {rng.randrange(1_000_000)}", 0
+                now += 0.05
+                stream.append((channel_id, user_id, len(stream), content, mentions, now))
+        else:
+            content = " ".join(rng.choices(WORDS, k=rng.randint(2, 12)))
+            stream.append((channel_id, rng.randrange(users), len(stream), content, 0, now))
+
+    return stream[:messages]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500_000)
+    parser.add_argument("--users", type=int, default=50_000)
+    parser.add_argument("--channels", type=int, default=40)
+    parser.add_argument("--spam-ratio", type=float, default=0.02)
+    parser.add_argument("--capacity", type=int, default=50_000)
+    parser.add_argument("--target", type=int, default=10_000, help="minimum messages/sec")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    stream = build_stream(args.messages, args.users, args.channels, args.spam_ratio, args.seed)
+    detector = SpamDetector(user_capacity=args.capacity)
+    rules = SpamRules()
+    hits = Counter()
+
+    message = detector.message
+    started = time.perf_counter()
+    for channel_id, user_id, message_id, content, mentions, now in stream:
+        hit = message(rules, GUILD_ID, channel_id, user_id, message_id, content, mentions, now)
+        if hit is not None:
+            hits[hit.kind] += 1
+    elapsed = time.perf_counter() - started
+
+    rate = len(stream) / elapsed
+    print(f"{len(stream):,} messages from {args.users:,} users in {args.channels} channels")
+    print(f"{elapsed:.2f}s  ->  {rate:,.0f} messages/sec  ({elapsed / len(stream) * 1e6:.1f} µs each)")
+    print("hits: " + ", ".join(f"{kind} {count:,}" for kind, count in sorted(hits.items())))
+    print(f"state: {len(detector.users):,} users (cap {args.capacity:,}), {len(detector.channels)} channels")
+
+    if rate < args.target:
+        print(f"below target of {args.target:,} messages/sec")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
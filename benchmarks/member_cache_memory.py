@@ -0,0 +1,139 @@
+"""Memory held by the member cache: "full" vs. "lean" policy.
+
+Builds a synthetic guild with real discord.py Member objects (no
+gateway connection) in a fresh subprocess per policy and reports the
+resident memory the cache adds.
+
+* full -- every member is cached, as with chunking at startup.
+* lean -- every member passes through core.member_cache.MemberCache once
+  (as message/interaction activity would), which keeps the staff plus
+  the most recently active ``--capacity`` members.
+
+    python benchmarks/member_cache_memory.py [--members 100000] [--staff 50] [--capacity 10000]
+"""
+
+import argparse
+import asyncio
+import gc
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import discord
+
+from core.config import GuildConfig
+from core.member_cache import MemberCache, LEAN
+
+GUILD_ID = 1
+STAFF_ROLE_ID = 2
+MEMBER_ROLE_ID = 3
+USER_ID_BASE = 1_200_000_000_000_000_000
+
+
+class SyntheticConfig:
+    def guild(self, guild_id):
+        return GuildConfig(staff_role_id=STAFF_ROLE_ID)
+
+
+class SyntheticBot:
+    # Just the attributes MemberCache reads from HorizonBot.
+    def __init__(self, guild: discord.Guild):
+        self.config = SyntheticConfig()
+        self.user = discord.Object(id=0)
+        self._guild = guild
+
+    def get_guild(self, guild_id):
+        return self._guild if guild_id == self._guild.id else None
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def role(role_id: int, name: str, position: int) -> dict:
+    return {
+        "id": str(role_id), "name": name, "permissions": "0", "position": position,
+        "color": 0, "hoist": False, "managed": False, "mentionable": False,
+    }
+
+
+def member_data(index: int, staff: bool) -> dict:
+    user_id = USER_ID_BASE + index
+    return {
+        "user": {
+            "id": str(user_id), "username": f"member{index}", "discriminator": "0",
+            "avatar": None, "global_name": f"Member {index}",
+        },
+        "roles": [str(STAFF_ROLE_ID if staff else MEMBER_ROLE_ID)],
+        "joined_at": "2024-01-01T00:00:00+00:00",
+        "deaf": False,
+        "mute": False,
+        "flags": 0,
+    }
+
+
+async def build(policy: str, members: int, staff: int, capacity: int) -> tuple[int, int]:
+    client = discord.Client(intents=discord.Intents.all())
+    state = client._connection
+    guild = discord.Guild(
+        data={
+            "id": str(GUILD_ID), "name": "Synthetic", "member_count": members,
+            "roles": [role(GUILD_ID, "@everyone", 0), role(STAFF_ROLE_ID, "Staff", 2), role(MEMBER_ROLE_ID, "Member", 1)],
+        },
+        state=state
+    )
+
+    cache = MemberCache(SyntheticBot(guild), policy=LEAN, capacity=capacity)
+
+    gc.collect()
+    before = rss_bytes()
+
+    for index in range(members):
+        member = discord.Member(data=member_data(index, index < staff), guild=guild, state=state)
+        if policy == LEAN:
+            cache.touch(member)
+        else:
+            guild._add_member(member)
+        del member
+
+    gc.collect()
+    return rss_bytes() - before, len(guild._members)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=100_000)
+    parser.add_argument("--staff", type=int, default=50)
+    parser.add_argument("--capacity", type=int, default=10_000)
+    parser.add_argument("--policy", choices=("full", "lean"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.policy:
+        added, cached = asyncio.run(build(args.policy, args.members, args.staff, args.capacity))
+        print(added, cached)
+        return
+
+    print(f"{args.members:,} members, {args.staff} staff, lean LRU capacity {args.capacity:,}\n")
+    print(f"{'policy':<8}{'cached':>10}{'RSS added':>14}")
+
+    results = {}
+    for policy in ("full", "lean"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--policy", policy, "--members", str(args.members),
+             "--staff", str(args.staff), "--capacity", str(args.capacity)],
+            check=True, capture_output=True, text=True, cwd=ROOT
+        )
+        added, cached = map(int, out.stdout.split())
+        results[policy] = added
+        print(f"{policy:<8}{cached:>10,}{added / 2**20:>11.1f} MiB")
+
+    saved = results["full"] - results["lean"]
+    print(f"\nlean saves {saved / 2**20:.1f} MiB ({saved / results['full']:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Near-duplicate lookup latency over a large corpus (core.near_duplicates).
+
+Indexes synthetic suggestions built from a small shared vocabulary (the
+worst case for LSH: many texts share many shingles), then times
+similar() end to end for fresh texts and for lightly reworded copies of
+indexed ones, and reports how often the reworded copies were found.
+Exits non-zero if the p95 is above --budget milliseconds.
+
+    python benchmarks/near_duplicate_lookup.py [--docs 100000] [--queries 500] [--budget 50]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.near_duplicates import NearDuplicateIndex
+
+GUILD_ID = 1
+OPENERS = ["add", "please add", "can we get", "we need", "it would be nice to have", "suggest adding", "make"]
+WORDS = (
+    "channel role bot command emoji sticker voice stage event music game leaderboard rank level "
+    "reaction poll giveaway ticket support help python rust javascript web design art meme news "
+    "announcement rules verification welcome message color nickname permission moderator staff "
+    "weekly monthly daily contest challenge showcase project review feedback tutorial resource"
+).split()
+
+
+def suggestion(rng: random.Random) -> str:
+    return f"{rng.choice(OPENERS)} " + " ".join(rng.choices(WORDS, k=rng.randint(3, 14)))
+
+
+def reword(rng: random.Random, text: str) -> str:
+    words = text.split()
+    words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return " ".join(words) + rng.choice(("", "!", " please", " pls"))
+
+
+async def run(docs: int, queries: int, seed: int):
+    rng = random.Random(seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = NearDuplicateIndex(os.path.join(directory, "dupes.db"), "suggestions")
+        await index.open()
+
+        texts = []
+        started = time.perf_counter()
+        for doc_id in range(1, docs + 1):
+            text = suggestion(rng)
+            texts.append(text)
+            index.add(doc_id, GUILD_ID, text)
+            if doc_id % 10_000 == 0:
+                await index.flush()
+        await index.flush()
+        build = time.perf_counter() - started
+
+        timings, found = [], 0
+        for i in range(queries):
+            if i % 2:
+                doc_id = rng.randrange(1, docs + 1)
+                text = reword(rng, texts[doc_id - 1])
+            else:
+                doc_id, text = None, suggestion(rng)
+
+            started = time.perf_counter()
+            results = await index.similar(GUILD_ID, text)
+            timings.append((time.perf_counter() - started) * 1000)
+            if doc_id is not None:
+                found += any(result == doc_id for result, _ in results)
+
+        await index.close()
+        return build, timings, found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--budget", type=float, default=50.0, help="p95 budget in milliseconds")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    build, timings, found = asyncio.run(run(args.docs, args.queries, args.seed))
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+
+    print(f"indexed {args.docs:,} texts in {build:.1f}s")
+    print(
+        f"{args.queries} lookups: p50 {statistics.median(timings):.1f} ms, "
+        f"p95 {p95:.1f} ms, max {timings[-1]:.1f} ms"
+    )
+    print(f"reworded copies found: {found}/{args.queries // 2}")
+
+    if p95 > args.budget:
+        print(f"p95 above the {args.budget:g} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
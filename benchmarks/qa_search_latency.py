@@ -0,0 +1,99 @@
+"""/search latency over a large Q&A index (core.qa_index.QAIndex).
+
+Fills a throwaway database with synthetic questions through the same
+queued write path /ask uses, then times ranked searches end to end
+(query building, FTS5 match, bm25 ordering, snippets, executor hop).
+Exits non-zero if the p95 is above --budget milliseconds.
+
+    python benchmarks/qa_search_latency.py [--threads 100000] [--queries 500] [--budget 50]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.qa_index import QAIndex
+
+GUILD_ID = 1
+LANGUAGES = ["Python", "Rust", "JavaScript", "TypeScript", "Go", "C++", "Java", "Kotlin", "SQL", "Docker"]
+WORDS = (
+    "async await thread lock deadlock memory leak segfault import module package build compile "
+    "linker error exception traceback null pointer index bounds cache redis postgres query index "
+    "migration schema docker compose network timeout socket http request response json parse "
+    "serialize regex unicode string bytes encoding file path permission denied install version "
+    "dependency conflict test mock fixture coverage deploy kubernetes pod crash restart loop "
+    "closure lifetime borrow checker generic trait interface class inheritance decorator"
+).split()
+
+
+def sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high)))
+
+
+async def run(threads: int, queries: int, seed: int) -> tuple[float, list[float], int]:
+    rng = random.Random(seed)
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = QAIndex(os.path.join(directory, "qa.db"))
+        await index.open()
+
+        started = time.perf_counter()
+        for thread_id in range(1, threads + 1):
+            index.add(
+                thread_id, GUILD_ID, rng.randrange(10_000),
+                sentence(rng, 4, 10), rng.choice(LANGUAGES), sentence(rng, 20, 60),
+                sentence(rng, 5, 30) if rng.random() < 0.5 else None
+            )
+            if thread_id % 3 == 0:
+                index.mark_solved(thread_id)
+            if thread_id % 10_000 == 0:
+                await index.flush()
+        await index.flush()
+        build = time.perf_counter() - started
+
+        timings, hits = [], 0
+        for _ in range(queries):
+            text = sentence(rng, 1, 3)
+            solved = rng.choice((None, True, False))
+            started = time.perf_counter()
+            results = await index.search(GUILD_ID, text, solved=solved)
+            timings.append((time.perf_counter() - started) * 1000)
+            hits += bool(results)
+
+        await index.close()
+        return build, timings, hits
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--threads", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--budget", type=float, default=50.0, help="p95 budget in milliseconds")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    build, timings, hits = asyncio.run(run(args.threads, args.queries, args.seed))
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+
+    print(f"indexed {args.threads:,} threads in {build:.1f}s")
+    print(
+        f"{args.queries} searches ({hits} with results): "
+        f"p50 {statistics.median(timings):.1f} ms, p95 {p95:.1f} ms, max {timings[-1]:.1f} ms"
+    )
+
+    if p95 > args.budget:
+        print(f"p95 above the {args.budget:g} ms budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Memory cost of suggestion vote storage: plain sets vs. VoteSet.
+
+Builds N suggestions with V votes each (split between upvotes and
+downvotes) in a fresh subprocess per layout and reports the resident
+memory it added.
+
+    python benchmarks/vote_memory.py [--suggestions 100000] [--votes 50]
+"""
+
+import argparse
+import os
+import random
+import resource
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# Snowflakes from 2024, so IDs have realistic magnitude.
+SNOWFLAKE_MIN = 1_200_000_000_000_000_000
+SNOWFLAKE_MAX = 1_400_000_000_000_000_000
+
+
+class SetVotes:
+    # Same attributes the old per-message SuggestionPublicView carried.
+    def __init__(self, message_id, channel_id, content, upvotes=(), downvotes=()):
+        self.message_id = message_id
+        self.channel_id = channel_id
+        self.content = content
+        self.upvotes = set(upvotes)
+        self.downvotes = set(downvotes)
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        # ru_maxrss is KiB on Linux, bytes on macOS; only a fallback.
+        scale = 1 if sys.platform == "darwin" else 1024
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+
+
+def build(layout: str, suggestions: int, votes: int) -> int:
+    if layout == "compact":
+        from core.vote_store import SuggestionVotes as record_type
+    else:
+        record_type = SetVotes
+
+    rng = random.Random(0)
+    content = "Add a dedicated channel for code reviews"
+    half = votes // 2
+
+    before = rss_bytes()
+    records = {}
+    for i in range(suggestions):
+        voters = [rng.randrange(SNOWFLAKE_MIN, SNOWFLAKE_MAX) for _ in range(votes)]
+        message_id = SNOWFLAKE_MIN + i
+        records[message_id] = record_type(message_id, 1, content, voters[:half], voters[half:])
+    return rss_bytes() - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--suggestions", type=int, default=100_000)
+    parser.add_argument("--votes", type=int, default=50)
+    parser.add_argument("--layout", choices=("sets", "compact"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.layout:
+        print(build(args.layout, args.suggestions, args.votes))
+        return
+
+    total_votes = args.suggestions * args.votes
+    print(f"{args.suggestions:,} suggestions x {args.votes} votes = {total_votes:,} votes\n")
+    print(f"{'layout':<10}{'RSS added':>14}{'per vote':>12}")
+
+    results = {}
+    for layout in ("sets", "compact"):
+        out = subprocess.run(
+            [sys.executable, __file__, "--layout", layout,
+             "--suggestions", str(args.suggestions), "--votes", str(args.votes)],
+            check=True, capture_output=True, text=True, cwd=ROOT
+        )
+        added = int(out.stdout.strip())
+        results[layout] = added
+        print(f"{layout:<10}{added / 2**20:>11.1f} MiB{added / total_votes:>10.1f} B")
+
+    if results["compact"]:
+        print(f"\ncompact uses {results['sets'] / results['compact']:.1f}x less memory")
+
+
+if __name__ == "__main__":
+    main()
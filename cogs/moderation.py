@@ -1,19 +1,122 @@
+import asyncio
+import logging
+import time
 import discord
 from discord.ext import commands
 from discord import app_commands
-import json
-from datetime import timedelta
-
-# ---------------- CONFIG ----------------
-
-with open("config.json") as f:
-    config = json.load(f)
+from datetime import datetime, timedelta, timezone
+
+from core.antispam import Hit, SpamDetector, SpamRules
+from core.bulk import (
+    BULK_BAN_CHUNK, BulkResult, ProgressReporter, format_failures, match_members, parse_ids, resolve_ids, run_bulk
+)
+from core.case_store import Case, CaseStore
+from core.config import GuildConfig, has_staff_role, is_staff
+from core.mod_log import ModLog
+from core.purge import PurgeFilter, PurgeJob, compile_pattern
+from core.timers import MAX_DURATION, Timer, parse_duration
+from core.rest_scheduler import Priority
+
+log = logging.getLogger(__name__)
+
+# Slowmode applied to a flooded channel, in seconds
+FLOOD_SLOWMODE = 10
+# Anti-spam hits acted on with antispam_duplicate_actions
+REPEATED_TEXT = {"duplicate", "copypasta"}
+
+# Discord caps a timeout at 28 days; longer mutes are renewed by a timer
+# shortly before each timeout runs out.
+MAX_TIMEOUT = timedelta(days=28) - timedelta(minutes=1)
+RENEW_MARGIN = timedelta(hours=1)
+
+# ---------------- CASE BROWSER ----------------
+
+PAGE_SIZE = 10
+
+ACTION_ICONS = {"mute": "🔇", "unmute": "🔊", "kick": "👢", "ban": "⛔", "tempban": "⏳", "unban": "🔓", "purge": "🧹"}
+
+
+class ModLogsView(discord.ui.View):
+    def __init__(self, store: CaseStore, guild_id: int, title: str, **filters):
+        super().__init__(timeout=300)
+        self.store = store
+        self.guild_id = guild_id
+        self.title = title
+        self.filters = filters
+
+        # Keyset cursor of every page up to the current one
+        self.cursors: list[tuple[float, int] | None] = [None]
+        self.cases: list[Case] = []
+
+    async def load(self):
+        cases = await self.store.page(self.guild_id, after=self.cursors[-1], limit=PAGE_SIZE + 1, **self.filters)
+        self.cases = cases[:PAGE_SIZE]
+        self.newer.disabled = len(self.cursors) == 1
+        self.older.disabled = len(cases) <= PAGE_SIZE
+
+    def embed(self) -> discord.Embed:
+        lines = []
+        for case in self.cases:
+            target = f"<@{case.target_id}>" if case.target_id else "—"
+            line = (
+                f"**#{case.id}** {ACTION_ICONS.get(case.action, '•')} {case.action.title()} · "
+                f"{target} by <@{case.moderator_id}> · <t:{int(case.created_at)}:R>"
+            )
+            if case.duration_seconds:
+                line += f" · {case.duration_seconds // 60} min"
+            if case.reason:
+                line += f"\n> {case.reason[:200]}"
+            lines.append(line)
+
+        embed = discord.Embed(
+            title=self.title,
+            description="\n".join(lines) or "No cases found.",
+            color=discord.Color.blurple()
+        )
+        embed.set_footer(text=f"Page {len(self.cursors)}")
+        return embed
+
+    @discord.ui.button(label="◀ Newer", style=discord.ButtonStyle.secondary)
+    async def newer(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.cursors.pop()
+        await self.load()
+        await interaction.response.edit_message(embed=self.embed(), view=self)
+
+    @discord.ui.button(label="Older ▶", style=discord.ButtonStyle.secondary)
+    async def older(self, interaction: discord.Interaction, button: discord.ui.Button):
+        last = self.cases[-1]
+        self.cursors.append((last.created_at, last.id))
+        await self.load()
+        await interaction.response.edit_message(embed=self.embed(), view=self)
 
 # ---------------- COG ----------------
 
 class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.mod_log = ModLog(bot, bot.config.settings.mod_log_window_seconds)
+        self.cases = CaseStore(bot.config.settings.database_path)
+        self.purges: dict[int, PurgeJob] = {}
+
+        self.spam = SpamDetector()
+        self.spam_rules: dict[int, SpamRules] = {}
+
+    async def cog_load(self):
+        await self.cases.open()
+        self.bot.timers.register("unban", self.expire_bans)
+        self.bot.timers.register("remute", self.renew_mutes)
+        self.bot.timers.register("unlock", self.lift_lockdowns)
+        self.bot.config.on_reload(lambda config: self.spam_rules.clear())
+
+    async def cog_unload(self):
+        self.bot.timers.unregister("unban")
+        self.bot.timers.unregister("remute")
+        self.bot.timers.unregister("unlock")
+        for job in list(self.purges.values()):
+            job.cancel()
+        # Drain queued log entries and cases before the bot shuts down
+        await self.mod_log.close()
+        await self.cases.close()
 
     # ---------------- HELPERS ----------------
 
@@ -26,16 +129,33 @@ class Moderation(commands.Cog):
             return False
         return moderator.top_role > target.top_role
 
-    async def log(self, guild: discord.Guild, embed: discord.Embed):
-        channel = guild.get_channel(config["mod_log_channel_id"])
-        if channel:
-            await channel.send(embed=embed)
+    async def act(self, factory, guild: discord.Guild):
+        # Moderation writes jump every other queue in the REST scheduler.
+        return await self.bot.rest.submit(
+            Priority.MODERATION,
+            factory,
+            route=f"guild:{guild.id}"
+        )
+
+    def log(self, guild: discord.Guild, embed: discord.Embed):
+        # Queued and batched; never blocks the command
+        self.mod_log.log(guild, embed)
+
+    def record(self, interaction: discord.Interaction, action: str, target_id: int | None, reason: str | None = None, duration_seconds: int | None = None):
+        # Also queued; written to the case store in batches
+        self.cases.record(interaction.guild.id, action, target_id, interaction.user.id, reason, duration_seconds)
 
     # ---------------- MOD COMMANDS ----------------
 
     @app_commands.command(name="mute", description="Timeout a user")
-    @app_commands.checks.has_role(config["staff_role_id"])
-    async def mute(self, interaction: discord.Interaction, user: discord.Member, minutes: int, reason: str):
+    @has_staff_role()
+    async def mute(
+        self,
+        interaction: discord.Interaction,
+        user: discord.Member,
+        minutes: app_commands.Range[int, 1, MAX_DURATION.days * 1440],
+        reason: str
+    ):
         if not self.can_moderate(interaction.user, user):
             await interaction.response.send_message(
                 embed=discord.Embed(description="❌ You cannot moderate this user.", color=discord.Color.red()),
@@ -43,7 +163,8 @@ class Moderation(commands.Cog):
             )
             return
 
-        await user.timeout(timedelta(minutes=minutes), reason=reason)
+        until = discord.utils.utcnow() + timedelta(minutes=minutes)
+        await self.apply_mute(user, until, reason)
 
         embed = discord.Embed(title="🔇 User Muted", color=discord.Color.orange())
         embed.add_field(name="User", value=str(user), inline=False)
@@ -52,22 +173,25 @@ class Moderation(commands.Cog):
         embed.add_field(name="Moderator", value=interaction.user.mention, inline=False)
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
-        await self.log(interaction.guild, embed)
+        self.record(interaction, "mute", user.id, reason, minutes * 60)
+        self.log(interaction.guild, embed)
 
     @app_commands.command(name="unmute", description="Remove timeout")
-    @app_commands.checks.has_role(config["staff_role_id"])
+    @has_staff_role()
     async def unmute(self, interaction: discord.Interaction, user: discord.Member):
-        await user.timeout(None)
+        await self.act(lambda: user.timeout(None), interaction.guild)
+        await self.bot.timers.cancel("remute", interaction.guild.id, user.id)
 
         embed = discord.Embed(title="🔊 User Unmuted", color=discord.Color.green())
         embed.add_field(name="User", value=str(user), inline=False)
         embed.add_field(name="Moderator", value=interaction.user.mention, inline=False)
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
-        await self.log(interaction.guild, embed)
+        self.record(interaction, "unmute", user.id)
+        self.log(interaction.guild, embed)
 
     @app_commands.command(name="kick", description="Kick a user")
-    @app_commands.checks.has_role(config["staff_role_id"])
+    @has_staff_role()
     async def kick(self, interaction: discord.Interaction, user: discord.Member, reason: str):
         if not self.can_moderate(interaction.user, user):
             await interaction.response.send_message(
@@ -76,7 +200,7 @@ class Moderation(commands.Cog):
             )
             return
 
-        await user.kick(reason=reason)
+        await self.act(lambda: user.kick(reason=reason), interaction.guild)
 
         embed = discord.Embed(title="👢 User Kicked", color=discord.Color.red())
         embed.add_field(name="User", value=str(user), inline=False)
@@ -84,10 +208,11 @@ class Moderation(commands.Cog):
         embed.add_field(name="Moderator", value=interaction.user.mention, inline=False)
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
-        await self.log(interaction.guild, embed)
+        self.record(interaction, "kick", user.id, reason)
+        self.log(interaction.guild, embed)
 
     @app_commands.command(name="ban", description="Ban a user")
-    @app_commands.checks.has_role(config["staff_role_id"])
+    @has_staff_role()
     async def ban(self, interaction: discord.Interaction, user: discord.Member, reason: str):
         if not self.can_moderate(interaction.user, user):
             await interaction.response.send_message(
@@ -96,7 +221,7 @@ class Moderation(commands.Cog):
             )
             return
 
-        await user.ban(reason=reason, delete_message_days=1)
+        await self.act(lambda: user.ban(reason=reason, delete_message_days=1), interaction.guild)
 
         embed = discord.Embed(title="⛔ User Banned", color=discord.Color.dark_red())
         embed.add_field(name="User", value=str(user), inline=False)
@@ -104,10 +229,48 @@ class Moderation(commands.Cog):
         embed.add_field(name="Moderator", value=interaction.user.mention, inline=False)
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
-        await self.log(interaction.guild, embed)
+        self.record(interaction, "ban", user.id, reason)
+        self.log(interaction.guild, embed)
+
+    @app_commands.command(name="tempban", description="Ban a user for a limited time")
+    @app_commands.describe(duration="How long, e.g. 12h, 7d, 2w3d")
+    @has_staff_role()
+    async def tempban(self, interaction: discord.Interaction, user: discord.Member, duration: str, reason: str):
+        try:
+            length = parse_duration(duration)
+        except ValueError:
+            length = None
+
+        error = None
+        if length is None or length.total_seconds() < 60:
+            error = f"❌ Give a duration like 30m, 12h or 7d, up to {MAX_DURATION.days} days."
+        elif not self.can_moderate(interaction.user, user):
+            error = "❌ You cannot ban this user."
+
+        if error:
+            await interaction.response.send_message(
+                embed=discord.Embed(description=error, color=discord.Color.red()),
+                ephemeral=True
+            )
+            return
+
+        expires = discord.utils.utcnow() + length
+        await self.act(lambda: user.ban(reason=reason, delete_message_days=1), interaction.guild)
+        await self.bot.timers.cancel("unban", interaction.guild.id, user.id)
+        await self.bot.timers.schedule("unban", expires.timestamp(), interaction.guild.id, user.id)
+
+        embed = discord.Embed(title="⏳ User Temporarily Banned", color=discord.Color.dark_red())
+        embed.add_field(name="User", value=str(user), inline=False)
+        embed.add_field(name="Expires", value=discord.utils.format_dt(expires, "R"), inline=False)
+        embed.add_field(name="Reason", value=reason, inline=False)
+        embed.add_field(name="Moderator", value=interaction.user.mention, inline=False)
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+        self.record(interaction, "tempban", user.id, reason, int(length.total_seconds()))
+        self.log(interaction.guild, embed)
 
     @app_commands.command(name="unban", description="Unban a user by ID")
-    @app_commands.checks.has_role(config["staff_role_id"])
+    @has_staff_role()
     async def unban(self, interaction: discord.Interaction, user_id: str, reason: str = "Ban revoked"):
         try:
             user = discord.Object(id=int(user_id))
@@ -118,7 +281,8 @@ class Moderation(commands.Cog):
             )
             return
 
-        await interaction.guild.unban(user, reason=reason)
+        await self.act(lambda: interaction.guild.unban(user, reason=reason), interaction.guild)
+        await self.bot.timers.cancel("unban", interaction.guild.id, user.id)
 
         embed = discord.Embed(title="🔓 User Unbanned", color=discord.Color.green())
         embed.add_field(name="User ID", value=user_id, inline=False)
@@ -126,10 +290,11 @@ class Moderation(commands.Cog):
         embed.add_field(name="Moderator", value=interaction.user.mention, inline=False)
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
-        await self.log(interaction.guild, embed)
+        self.record(interaction, "unban", user.id, reason)
+        self.log(interaction.guild, embed)
 
     @app_commands.command(name="purge", description="Delete recent messages in this channel")
-    @app_commands.checks.has_role(config["staff_role_id"])
+    @has_staff_role()
     async def purge(self, interaction: discord.Interaction, amount: int):
         if amount < 1 or amount > 100:
             await interaction.response.send_message(
@@ -138,7 +303,7 @@ class Moderation(commands.Cog):
             )
             return
 
-        deleted = await interaction.channel.purge(limit=amount)
+        deleted = await self.act(lambda: interaction.channel.purge(limit=amount), interaction.guild)
 
         embed = discord.Embed(title="🧹 Messages Purged", color=discord.Color.orange())
         embed.add_field(name="Channel", value=interaction.channel.mention, inline=False)
@@ -146,10 +311,11 @@ class Moderation(commands.Cog):
         embed.add_field(name="Moderator", value=interaction.user.mention, inline=False)
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
-        await self.log(interaction.guild, embed)
+        self.record(interaction, "purge", None, f"{len(deleted)} messages in #{interaction.channel}")
+        self.log(interaction.guild, embed)
 
     @app_commands.command(name="purge_user", description="Delete messages from a specific user")
-    @app_commands.checks.has_role(config["staff_role_id"])
+    @has_staff_role()
     async def purge_user(self, interaction: discord.Interaction, user: discord.Member, amount: int):
         if amount < 1 or amount > 100:
             await interaction.response.send_message(
@@ -161,7 +327,7 @@ class Moderation(commands.Cog):
         def is_target(m: discord.Message):
             return m.author.id == user.id
 
-        deleted = await interaction.channel.purge(limit=amount, check=is_target)
+        deleted = await self.act(lambda: interaction.channel.purge(limit=amount, check=is_target), interaction.guild)
 
         embed = discord.Embed(title="🧹 User Messages Purged", color=discord.Color.orange())
         embed.add_field(name="User", value=str(user), inline=False)
@@ -170,11 +336,617 @@ class Moderation(commands.Cog):
         embed.add_field(name="Moderator", value=interaction.user.mention, inline=False)
 
         await interaction.response.send_message(embed=embed, ephemeral=True)
-        await self.log(interaction.guild, embed)
+        self.record(interaction, "purge", user.id, f"{len(deleted)} messages in #{interaction.channel}")
+        self.log(interaction.guild, embed)
+
+    # ---------------- TIMERS ----------------
+
+    async def apply_mute(self, member: discord.Member, until, reason: str | None):
+        # One timeout of at most 28 days, plus a renewal timer if the mute runs longer
+        timeout_until = min(until, discord.utils.utcnow() + MAX_TIMEOUT)
+        await self.act(lambda: member.timeout(timeout_until, reason=reason), member.guild)
+
+        await self.bot.timers.cancel("remute", member.guild.id, member.id)
+        if until > timeout_until:
+            await self.bot.timers.schedule(
+                "remute",
+                (timeout_until - RENEW_MARGIN).timestamp(),
+                member.guild.id,
+                member.id,
+                {"until": until.timestamp(), "reason": reason}
+            )
+
+    def timer_guild(self, timer: Timer) -> tuple[discord.Guild | None, bool]:
+        # (guild, retry): retry while the guild is in an outage, drop if the bot left it
+        guild = self.bot.get_guild(timer.guild_id)
+        if guild is None:
+            return None, False
+        return guild, guild.unavailable
+
+    async def lift_ban(self, timer: Timer) -> bool:
+        guild, retry = self.timer_guild(timer)
+        if guild is None or retry:
+            return retry
+
+        try:
+            await self.act(
+                lambda: guild.unban(discord.Object(id=timer.target_id), reason="Temporary ban expired"),
+                guild
+            )
+        except discord.NotFound:
+            # Already unbanned by hand
+            return False
+        except discord.Forbidden:
+            return False
+
+        embed = discord.Embed(title="🔓 Temporary Ban Expired", color=discord.Color.green())
+        embed.add_field(name="User", value=f"<@{timer.target_id}> ({timer.target_id})", inline=False)
+        self.log(guild, embed)
+        self.cases.record(guild.id, "unban", timer.target_id, self.bot.user.id, "Temporary ban expired")
+        return False
+
+    async def renew_mute(self, timer: Timer) -> bool:
+        guild, retry = self.timer_guild(timer)
+        if guild is None or retry:
+            return retry
+
+        until = datetime.fromtimestamp(timer.payload["until"], tz=timezone.utc)
+        try:
+            member = guild.get_member(timer.target_id) or await guild.fetch_member(timer.target_id)
+            await self.apply_mute(member, until, timer.payload.get("reason"))
+        except (discord.NotFound, discord.Forbidden):
+            # Left the server, or is now above the bot
+            pass
+        return False
+
+    async def expire_bans(self, timers: list[Timer]):
+        await self.bot.wait_until_ready()
+        results = await asyncio.gather(*(self.lift_ban(timer) for timer in timers))
+        return [timer for timer, retry in zip(timers, results) if retry]
+
+    async def renew_mutes(self, timers: list[Timer]):
+        await self.bot.wait_until_ready()
+        results = await asyncio.gather(*(self.renew_mute(timer) for timer in timers))
+        return [timer for timer, retry in zip(timers, results) if retry]
+
+    # ---------------- ANTI-SPAM ----------------
+
+    def rules_for(self, guild_id: int) -> SpamRules:
+        rules = self.spam_rules.get(guild_id)
+        if rules is None:
+            rules = self.spam_rules[guild_id] = SpamRules.from_config(self.bot.config.guild(guild_id))
+        return rules
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        if message.guild is None or message.author.bot:
+            return
+
+        config = self.bot.config.guild(message.guild.id)
+        if not config.antispam_enabled or is_staff(message.author, config):
+            return
+
+        hit = self.spam.message(
+            self.rules_for(message.guild.id),
+            message.guild.id,
+            message.channel.id,
+            message.author.id,
+            message.id,
+            message.content,
+            len(message.raw_mentions) + len(message.raw_role_mentions) + message.mention_everyone,
+            time.monotonic()
+        )
+        if hit is None:
+            return
+
+        self.bot.metrics.incr(f"antispam.{hit.kind}")
+        try:
+            if hit.kind == "flood":
+                await self.handle_flood(message.channel, config)
+            else:
+                self.handle_spam(hit, message.guild, config)
+        except discord.HTTPException:
+            log.exception("Anti-spam action for %s in guild %s failed", hit.kind, message.guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member: discord.Member):
+        config = self.bot.config.guild(member.guild.id)
+        if not config.antispam_enabled:
+            return
+
+        hit = self.spam.join(self.rules_for(member.guild.id), member.guild.id, time.monotonic())
+        if hit is None:
+            return
+
+        self.bot.metrics.incr("antispam.raid")
+        try:
+            await self.handle_raid(member.guild, config)
+        except discord.HTTPException:
+            log.exception("Anti-spam raid lockdown in guild %s failed", member.guild.id)
+
+    def handle_spam(self, hit: Hit, guild: discord.Guild, config: GuildConfig):
+        # Repeated text is the easiest rule for normal chat to trip, so it
+        # only cleans up unless the server opts into more
+        configured = config.antispam_duplicate_actions if hit.kind in REPEATED_TEXT else config.antispam_actions
+        actions = {action.strip() for action in configured.split(",")}
+        reason = f"Anti-spam: {hit.kind}"
+        members = [
+            member for member in map(guild.get_member, hit.user_ids)
+            if member is not None and self.can_moderate(guild.me, member)
+        ]
+        taken = []
+
+        if "timeout" in actions and members:
+            length = timedelta(minutes=config.antispam_timeout_minutes)
+            for member in members:
+                self.bot.rest.post(
+                    Priority.MODERATION,
+                    lambda member=member: member.timeout(length, reason=reason),
+                    route=f"guild:{guild.id}"
+                )
+                self.cases.record(guild.id, "mute", member.id, self.bot.user.id, reason, int(length.total_seconds()))
+            taken.append(f"timed out for {config.antispam_timeout_minutes} minutes")
+
+        if "purge" in actions and hit.messages:
+            by_channel: dict[int, list[discord.Object]] = {}
+            for channel_id, message_id in hit.messages:
+                by_channel.setdefault(channel_id, []).append(discord.Object(id=message_id))
+
+            for channel_id, messages in by_channel.items():
+                channel = guild.get_channel_or_thread(channel_id)
+                if channel is not None:
+                    self.bot.rest.post(
+                        Priority.MODERATION,
+                        lambda channel=channel, messages=messages: channel.delete_messages(messages, reason=reason),
+                        route=f"channel:{channel_id}"
+                    )
+            taken.append(f"{len(hit.messages)} messages deleted")
+
+        embed = discord.Embed(title=f"🚨 Anti-spam: {hit.kind}", color=discord.Color.red())
+        embed.add_field(name="Users", value=" ".join(f"<@{user_id}>" for user_id in hit.user_ids), inline=False)
+        embed.add_field(name="Channel", value=f"<#{hit.channel_id}>", inline=False)
+        embed.add_field(name="Action", value=", ".join(taken) or "none", inline=False)
+        self.log(guild, embed)
+
+    async def handle_flood(self, channel: discord.abc.GuildChannel, config: GuildConfig):
+        guild = channel.guild
+        action = config.antispam_flood_action
+        reason = "Anti-spam: channel flood"
+        payload = {"channel_id": channel.id}
+
+        if action == "lockdown" and isinstance(channel, discord.TextChannel):
+            overwrite = channel.overwrites_for(guild.default_role)
+            if overwrite.send_messages is False:
+                return
+            payload["send_messages"] = overwrite.send_messages
+            overwrite.send_messages = False
+            await self.act(lambda: channel.set_permissions(guild.default_role, overwrite=overwrite, reason=reason), guild)
+            taken = "locked"
+        elif action == "slowmode" and hasattr(channel, "slowmode_delay"):
+            if channel.slowmode_delay >= FLOOD_SLOWMODE:
+                return
+            payload["slowmode"] = channel.slowmode_delay
+            await self.act(lambda: channel.edit(slowmode_delay=FLOOD_SLOWMODE, reason=reason), guild)
+            taken = f"{FLOOD_SLOWMODE}s slowmode"
+        else:
+            taken = None
+
+        embed = discord.Embed(title="🚨 Anti-spam: channel flood", color=discord.Color.red())
+        embed.add_field(name="Channel", value=channel.mention, inline=False)
+        if taken:
+            expires = discord.utils.utcnow() + timedelta(minutes=config.antispam_lockdown_minutes)
+            await self.bot.timers.schedule("unlock", expires.timestamp(), guild.id, channel.id, payload)
+            embed.add_field(name="Action", value=f"{taken} until {discord.utils.format_dt(expires, 't')}", inline=False)
+        self.log(guild, embed)
+
+    async def handle_raid(self, guild: discord.Guild, config: GuildConfig):
+        embed = discord.Embed(title="🚨 Join raid detected", color=discord.Color.dark_red())
+        embed.add_field(
+            name="Joins",
+            value=f"{config.antispam_raid_joins} in {config.antispam_raid_window_seconds:g}s",
+            inline=False
+        )
+
+        highest = discord.VerificationLevel.highest
+        if config.antispam_raid_action == "lockdown" and guild.verification_level < highest:
+            previous = guild.verification_level
+            await self.act(lambda: guild.edit(verification_level=highest, reason="Anti-spam: join raid"), guild)
+
+            expires = discord.utils.utcnow() + timedelta(minutes=config.antispam_lockdown_minutes)
+            await self.bot.timers.schedule("unlock", expires.timestamp(), guild.id, None, {"verification_level": previous.value})
+            embed.add_field(
+                name="Action",
+                value=f"verification raised to highest until {discord.utils.format_dt(expires, 't')}",
+                inline=False
+            )
+
+        embed.add_field(name="Next step", value="Review recent joins with `/bulk ban joined_within:`", inline=False)
+        self.log(guild, embed)
+
+    async def lift_lockdown(self, timer: Timer) -> bool:
+        guild, retry = self.timer_guild(timer)
+        if guild is None or retry:
+            return retry
+
+        payload = timer.payload
+        reason = "Anti-spam lockdown over"
+        try:
+            if "verification_level" in payload:
+                level = discord.VerificationLevel(payload["verification_level"])
+                await self.act(lambda: guild.edit(verification_level=level, reason=reason), guild)
+                target = "Server verification level"
+            else:
+                channel = guild.get_channel_or_thread(payload["channel_id"])
+                if channel is None:
+                    return False
+                if "send_messages" in payload:
+                    overwrite = channel.overwrites_for(guild.default_role)
+                    overwrite.send_messages = payload["send_messages"]
+                    await self.act(lambda: channel.set_permissions(guild.default_role, overwrite=overwrite, reason=reason), guild)
+                if "slowmode" in payload:
+                    await self.act(lambda: channel.edit(slowmode_delay=payload["slowmode"], reason=reason), guild)
+                target = channel.mention
+        except (discord.NotFound, discord.Forbidden):
+            return False
+
+        embed = discord.Embed(title="🔓 Lockdown Lifted", description=f"{target} restored.", color=discord.Color.green())
+        self.log(guild, embed)
+        return False
+
+    async def lift_lockdowns(self, timers: list[Timer]):
+        await self.bot.wait_until_ready()
+        results = await asyncio.gather(*(self.lift_lockdown(timer) for timer in timers))
+        return [timer for timer, retry in zip(timers, results) if retry]
+
+    # ---------------- CASES ----------------
+
+    @app_commands.command(name="modlogs", description="Browse moderation cases")
+    @app_commands.describe(
+        user="Cases against this user",
+        moderator="Cases handled by this moderator",
+        days="Only cases from the last N days"
+    )
+    @has_staff_role()
+    async def modlogs(
+        self,
+        interaction: discord.Interaction,
+        user: discord.User | None = None,
+        moderator: discord.User | None = None,
+        days: app_commands.Range[int, 1, 3650] | None = None
+    ):
+        if user:
+            title = f"📁 Cases for {user} ({await self.cases.count(interaction.guild.id, user.id)} total)"
+        elif moderator:
+            title = f"📁 Cases by {moderator}"
+        else:
+            title = "📁 Recent cases"
+
+        view = ModLogsView(
+            self.cases,
+            interaction.guild.id,
+            title,
+            target_id=user.id if user else None,
+            moderator_id=moderator.id if moderator else None,
+            since=time.time() - days * 86400 if days else None
+        )
+        await view.load()
+        await interaction.response.send_message(embed=view.embed(), view=view, ephemeral=True)
+
+    # ---------------- DEEP PURGE ----------------
+
+    @app_commands.command(name="deep_purge", description="Delete matching messages from deep in this channel's history")
+    @app_commands.describe(
+        scan="How many recent messages to look through",
+        user="Only messages from this user (works for users who left)",
+        pattern="Only messages whose text matches this regex",
+        attachments="Only messages with attachments",
+        links="Only messages containing links",
+        bots="Only messages from bots",
+        newer_than_hours="Only messages sent within the last N hours",
+        older_than_hours="Only messages older than N hours"
+    )
+    @has_staff_role()
+    async def deep_purge(
+        self,
+        interaction: discord.Interaction,
+        scan: app_commands.Range[int, 1, 50000] = 1000,
+        user: discord.User | None = None,
+        pattern: str | None = None,
+        attachments: bool = False,
+        links: bool = False,
+        bots: bool = False,
+        newer_than_hours: app_commands.Range[int, 1, 87600] | None = None,
+        older_than_hours: app_commands.Range[int, 1, 87600] | None = None
+    ):
+        channel = interaction.channel
+        error = None
+        compiled = None
+
+        if channel.id in self.purges:
+            error = "❌ A purge is already running here. Use /purge_cancel to stop it."
+        elif pattern:
+            try:
+                compiled = compile_pattern(pattern)
+            except ValueError as problem:
+                error = f"❌ {problem}"
+
+        if error:
+            await interaction.response.send_message(
+                embed=discord.Embed(description=error, color=discord.Color.red()),
+                ephemeral=True
+            )
+            return
+
+        now = discord.utils.utcnow()
+        rules = PurgeFilter(
+            author_id=user.id if user else None,
+            pattern=compiled,
+            attachments=attachments,
+            links=links,
+            bots=bots,
+            after=now - timedelta(hours=newer_than_hours) if newer_than_hours else None,
+            before=now - timedelta(hours=older_than_hours) if older_than_hours else None
+        )
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        title = "🧹 Deep Purge"
+        progress = ProgressReporter(
+            self.bot.rest, interaction, title,
+            lambda: f"Scanned {job.scanned}/{scan}, deleted {job.deleted}, failed {job.failed}"
+        )
+        job = PurgeJob(channel, rules, self.bot.rest, scan, progress)
+
+        self.purges[channel.id] = job
+        job.start()
+        try:
+            await job.wait()
+        finally:
+            self.purges.pop(channel.id, None)
+
+        embed = discord.Embed(title=title, color=discord.Color.orange())
+        embed.add_field(name="Channel", value=channel.mention, inline=False)
+        embed.add_field(name="Filter", value=rules.describe(), inline=False)
+        embed.add_field(name="Scanned", value=job.scanned)
+        embed.add_field(name="Deleted", value=job.deleted)
+        embed.add_field(name="Failed", value=job.failed)
+        if job.cancelled:
+            embed.add_field(name="Status", value="Cancelled", inline=False)
+        embed.add_field(name="Moderator", value=interaction.user.mention, inline=False)
+
+        await progress.finish(embed)
+        self.record(interaction, "purge", rules.author_id, f"{job.deleted} messages in #{channel}")
+        self.log(interaction.guild, embed)
+
+    @app_commands.command(name="purge_cancel", description="Stop the deep purge running in this channel")
+    @has_staff_role()
+    async def purge_cancel(self, interaction: discord.Interaction):
+        job = self.purges.get(interaction.channel.id)
+        if job:
+            job.cancel()
+            embed = discord.Embed(description="🛑 Purge cancelled.", color=discord.Color.orange())
+        else:
+            embed = discord.Embed(description="❌ No purge is running here.", color=discord.Color.red())
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    # ---------------- BULK COMMANDS ----------------
+
+    bulk = app_commands.Group(name="bulk", description="Moderate many members at once")
+
+    async def collect_targets(self, guild: discord.Guild, user_ids: str | None, joined_within: int | None, name_pattern: str | None):
+        # Listed IDs, plus everyone matching the join window and name pattern
+        members, outside = await resolve_ids(guild, parse_ids(user_ids))
+        if joined_within or name_pattern:
+            window = timedelta(minutes=joined_within) if joined_within else None
+            members += await match_members(guild, window, name_pattern)
+
+        return list({m.id: m for m in members}.values()), outside
+
+    async def ban_many(self, guild: discord.Guild, targets: list, reason: str, result: BulkResult, concurrency: int, progress):
+        fallback = []
+        for start in range(0, len(targets), BULK_BAN_CHUNK):
+            chunk = targets[start:start + BULK_BAN_CHUNK]
+            try:
+                banned = await self.act(
+                    lambda chunk=chunk: guild.bulk_ban(chunk, reason=reason, delete_message_seconds=86400),
+                    guild
+                )
+            except discord.HTTPException:
+                # Discord rejects the whole request when nobody could be banned;
+                # retry those one at a time to get a reason per user.
+                fallback += chunk
+                continue
+
+            for user in banned.banned:
+                result.ok(user.id)
+            for user in banned.failed:
+                result.fail(user.id, "ban failed")
+            progress(result)
+
+        if fallback:
+            await run_bulk(
+                fallback,
+                lambda target: self.act(lambda: guild.ban(target, reason=reason, delete_message_seconds=86400), guild),
+                result,
+                concurrency,
+                progress
+            )
+
+    async def run_bulk_action(
+        self,
+        interaction: discord.Interaction,
+        title: str,
+        color: discord.Color,
+        action,
+        reason: str,
+        user_ids: str | None,
+        joined_within: int | None,
+        name_pattern: str | None,
+        case_action: str,
+        details: tuple = (),
+        duration_seconds: int | None = None,
+        ban: bool = False
+    ):
+        if not (user_ids or joined_within or name_pattern):
+            await interaction.response.send_message(
+                embed=discord.Embed(
+                    description="❌ Give user IDs, a join window or a name pattern.",
+                    color=discord.Color.red()
+                ),
+                ephemeral=True
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+
+        guild = interaction.guild
+        config = self.bot.config.guild(guild.id)
+        members, outside = await self.collect_targets(guild, user_ids, joined_within, name_pattern)
+
+        result = BulkResult(len(members) + len(outside))
+        if result.total == 0:
+            await interaction.edit_original_response(
+                embed=discord.Embed(description="❌ No members matched.", color=discord.Color.red())
+            )
+            return
+        if result.total > config.bulk_action_limit:
+            await interaction.edit_original_response(
+                embed=discord.Embed(
+                    description=f"❌ {result.total} members matched; the limit is {config.bulk_action_limit}.",
+                    color=discord.Color.red()
+                )
+            )
+            return
+
+        targets = []
+        for member in members:
+            if self.can_moderate(interaction.user, member):
+                targets.append(member)
+            else:
+                result.fail(member.id, "cannot moderate (role hierarchy)")
+
+        # Users who already left can still be banned ahead of time
+        for user_id in outside:
+            if ban:
+                targets.append(discord.Object(id=user_id))
+            else:
+                result.fail(user_id, "not in this server")
+
+        progress = ProgressReporter(
+            self.bot.rest, interaction, title,
+            lambda: f"{result.done}/{result.total} done, {len(result.failed)} failed"
+        )
+        # Every action goes through act() on the guild route; more
+        # concurrency than the route allows would only queue there.
+        concurrency = min(config.bulk_action_concurrency, self.bot.rest.route_limit)
+        if ban:
+            await self.ban_many(guild, targets, reason, result, concurrency, progress)
+        else:
+            await run_bulk(
+                targets,
+                lambda target: self.act(lambda: action(target), guild),
+                result,
+                concurrency,
+                progress
+            )
+
+        selection = []
+        if user_ids:
+            selection.append(f"{len(parse_ids(user_ids))} IDs")
+        if joined_within:
+            selection.append(f"joined in the last {joined_within} minutes")
+        if name_pattern:
+            selection.append(f"name matches `{name_pattern}`")
+
+        embed = discord.Embed(title=title, color=color)
+        embed.add_field(name="Targets", value=result.total)
+        embed.add_field(name="Succeeded", value=len(result.succeeded))
+        embed.add_field(name="Failed", value=len(result.failed))
+        embed.add_field(name="Selection", value=", ".join(selection), inline=False)
+        for name, value in details:
+            embed.add_field(name=name, value=value, inline=False)
+        embed.add_field(name="Reason", value=reason, inline=False)
+        embed.add_field(name="Moderator", value=interaction.user.mention, inline=False)
+        if result.failed:
+            embed.add_field(name="Failures", value=format_failures(result.failed), inline=False)
+
+        await progress.finish(embed)
+        self.log(guild, embed)
+        for user_id in result.succeeded:
+            self.record(interaction, case_action, user_id, reason, duration_seconds)
+
+    @bulk.command(name="kick", description="Kick many users at once")
+    @app_commands.describe(
+        user_ids="User IDs or mentions, separated by spaces",
+        joined_within="Everyone who joined in the last N minutes",
+        name_pattern="Name or nickname glob, e.g. spam*"
+    )
+    @has_staff_role()
+    async def bulk_kick(
+        self,
+        interaction: discord.Interaction,
+        reason: str,
+        user_ids: str | None = None,
+        joined_within: app_commands.Range[int, 1, 10080] | None = None,
+        name_pattern: str | None = None
+    ):
+        await self.run_bulk_action(
+            interaction, "👢 Bulk Kick", discord.Color.red(),
+            lambda member: member.kick(reason=reason),
+            reason, user_ids, joined_within, name_pattern, "kick"
+        )
+
+    @bulk.command(name="ban", description="Ban many users at once")
+    @app_commands.describe(
+        user_ids="User IDs or mentions, separated by spaces",
+        joined_within="Everyone who joined in the last N minutes",
+        name_pattern="Name or nickname glob, e.g. spam*"
+    )
+    @has_staff_role()
+    async def bulk_ban(
+        self,
+        interaction: discord.Interaction,
+        reason: str,
+        user_ids: str | None = None,
+        joined_within: app_commands.Range[int, 1, 10080] | None = None,
+        name_pattern: str | None = None
+    ):
+        await self.run_bulk_action(
+            interaction, "⛔ Bulk Ban", discord.Color.dark_red(),
+            None, reason, user_ids, joined_within, name_pattern, "ban", ban=True
+        )
+
+    @bulk.command(name="mute", description="Timeout many users at once")
+    @app_commands.describe(
+        user_ids="User IDs or mentions, separated by spaces",
+        joined_within="Everyone who joined in the last N minutes",
+        name_pattern="Name or nickname glob, e.g. spam*"
+    )
+    @has_staff_role()
+    async def bulk_mute(
+        self,
+        interaction: discord.Interaction,
+        minutes: app_commands.Range[int, 1, MAX_TIMEOUT // timedelta(minutes=1)],
+        reason: str,
+        user_ids: str | None = None,
+        joined_within: app_commands.Range[int, 1, 10080] | None = None,
+        name_pattern: str | None = None
+    ):
+        await self.run_bulk_action(
+            interaction, "🔇 Bulk Mute", discord.Color.orange(),
+            lambda member: member.timeout(timedelta(minutes=minutes), reason=reason),
+            reason, user_ids, joined_within, name_pattern, "mute",
+            details=(("Duration", f"{minutes} minutes"),),
+            duration_seconds=minutes * 60
+        )
 
     # ---------------- ERROR HANDLER ----------------
 
     async def cog_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        command = interaction.command
+        self.bot.metrics.count("command.errors", command.qualified_name if command else "unknown")
+
         embed = discord.Embed(color=discord.Color.red())
 
         if isinstance(error, app_commands.MissingRole):
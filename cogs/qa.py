@@ -1,39 +1,64 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import json
+import asyncio
+import logging
+import time
 
-# ---------- CONFIG ----------
+from core.config import has_staff_role, is_staff
+from core.near_duplicates import NearDuplicateIndex
+from core.qa_analytics import ASK, REPLY, SOLVE, QAAnalytics
+from core.qa_index import QAIndex
+from core.rest_scheduler import Priority
 
-with open("config.json") as f:
-    config = json.load(f)
+log = logging.getLogger(__name__)
 
-QA_CHANNEL_ID = config.get("qa_channel_id")
-STAFF_ROLE_ID = config["staff_role_id"]
+
+def format_seconds(seconds: float | None) -> str:
+    if seconds is None:
+        return "—"
+    if seconds < 3600:
+        return f"{max(round(seconds / 60), 1)}m"
+    if seconds < 86400:
+        return f"{seconds / 3600:.1f}h"
+    return f"{seconds / 86400:.1f}d"
 
 # ---------- VIEW ----------
 
-class SolvedView(discord.ui.View):
-    def __init__(self, author_id: int):
-        super().__init__()
-        self.author_id = author_id
+STALE_PREFIX = "💤 "
 
-    @discord.ui.button(
-        label="Mark as Solved",
-        style=discord.ButtonStyle.success,
-        emoji="✅"
-    )
-    async def solved(
-        self,
-        interaction: discord.Interaction,
-        button: discord.ui.Button
-    ):
-        is_staff = any(
-            role.id == STAFF_ROLE_ID
-            for role in interaction.user.roles
+# Pause between sweeper batches so the thread edits never crowd out
+# interaction responses on the REST queue
+SWEEP_PAUSE = 5.0
+
+
+class SolvedButton(
+    discord.ui.DynamicItem[discord.ui.Button],
+    template=r"horizon:qa:solved:(?P<author_id>[0-9]+)"
+):
+    # The author is encoded in the custom_id, so the button keeps working
+    # on any thread, across restarts, without per-message state.
+
+    def __init__(self, author_id: int, disabled: bool = False):
+        super().__init__(
+            discord.ui.Button(
+                label="Mark as Solved",
+                style=discord.ButtonStyle.success,
+                emoji="✅",
+                custom_id=f"horizon:qa:solved:{author_id}",
+                disabled=disabled
+            )
         )
+        self.author_id = author_id
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: discord.ui.Button, match):
+        return cls(int(match["author_id"]))
 
-        if interaction.user.id != self.author_id and not is_staff:
+    async def callback(self, interaction: discord.Interaction):
+        config = interaction.client.config.guild(interaction.guild_id)
+
+        if interaction.user.id != self.author_id and not is_staff(interaction.user, config):
             await interaction.response.send_message(
                 "❌ Only the author or staff can mark this solved.",
                 ephemeral=True
@@ -42,25 +67,128 @@ class SolvedView(discord.ui.View):
 
         thread = interaction.channel
 
+        rest = interaction.client.rest
+
+        await rest.submit(
+            Priority.INTERACTION,
+            lambda: interaction.message.edit(view=SolvedView(self.author_id, solved=True)),
+            route=f"channel:{interaction.channel.id}"
+        )
+
         if isinstance(thread, discord.Thread):
-            await thread.edit(
-                name=f"✅ SOLVED | {thread.name}",
-                archived=True
-            )
+            cog = interaction.client.get_cog("QASystem")
+            if cog:
+                cog.index.mark_solved(thread.id)
+                cog.analytics.record(SOLVE, interaction.guild_id, thread.id, interaction.user.id)
 
-        button.disabled = True
-        await interaction.message.edit(view=self)
+            name = thread.name.removeprefix(STALE_PREFIX)
+            await rest.submit(
+                Priority.INTERACTION,
+                lambda: thread.edit(
+                    name=f"✅ SOLVED | {name}"[:100],
+                    archived=True
+                ),
+                route=f"channel:{thread.id}"
+            )
 
         await interaction.response.send_message(
             "✅ Marked as solved.",
             ephemeral=True
         )
 
+
+class SolvedView(discord.ui.View):
+    def __init__(self, author_id: int, solved: bool = False):
+        super().__init__(timeout=None)
+        self.add_item(SolvedButton(author_id, disabled=solved))
+
+class DuplicatePromptView(discord.ui.View):
+    """Shown instead of posting when /ask looks like an existing question."""
+
+    def __init__(self, cog: "QASystem", author_id: int, question: tuple):
+        super().__init__(timeout=120)
+        self.cog = cog
+        self.author_id = author_id
+        self.question = question
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author_id
+
+    @discord.ui.button(
+        label="Post anyway",
+        style=discord.ButtonStyle.primary,
+        emoji="📨"
+    )
+    async def post(
+        self,
+        interaction: discord.Interaction,
+        button: discord.ui.Button
+    ):
+        self.stop()
+        await interaction.response.edit_message(content="⏳ Posting your question...", embed=None, view=None)
+
+        thread = await self.cog.post_question(interaction, *self.question)
+        if thread is None:
+            await interaction.edit_original_response(content="❌ Q&A channel is not configured.")
+            return
+
+        await interaction.edit_original_response(
+            content=f"✅ Your question has been posted: {thread.mention}"
+        )
+
+    @discord.ui.button(
+        label="Cancel",
+        style=discord.ButtonStyle.secondary
+    )
+    async def cancel(
+        self,
+        interaction: discord.Interaction,
+        button: discord.ui.Button
+    ):
+        self.stop()
+        await interaction.response.edit_message(content="👍 Question not posted.", embed=None, view=None)
+
 # ---------- COG ----------
 
 class QASystem(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.index = QAIndex(bot.config.settings.database_path)
+        self.duplicates = NearDuplicateIndex(bot.config.settings.database_path, "qa")
+        self.analytics = QAAnalytics(bot.config.settings.database_path)
+
+        self.sweeper: asyncio.Task | None = None
+
+    async def cog_load(self):
+        await self.index.open()
+        await self.duplicates.open()
+        await self.analytics.open()
+        # Solved buttons on every existing thread route back here by custom_id
+        self.bot.add_dynamic_items(SolvedButton)
+        self.sweeper = asyncio.create_task(self.sweep_loop())
+
+    async def cog_unload(self):
+        self.sweeper.cancel()
+        self.bot.remove_dynamic_items(SolvedButton)
+        await self.index.close()
+        await self.duplicates.close()
+        await self.analytics.close()
+
+    @commands.Cog.listener()
+    async def on_raw_thread_delete(self, payload: discord.RawThreadDeleteEvent):
+        self.index.remove(payload.thread_id)
+        self.duplicates.remove(payload.thread_id)
+
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message):
+        channel = message.channel
+        if message.author.bot or not isinstance(channel, discord.Thread):
+            return
+        if channel.parent_id != self.bot.config.guild(message.guild.id).qa_channel_id:
+            return
+
+        # The rollup works out whether this is the first answer and skips the asker
+        self.analytics.record(REPLY, message.guild.id, channel.id, message.author.id)
 
     @app_commands.command(
         name="ask",
@@ -80,15 +208,62 @@ class QASystem(commands.Cog):
         description: str,
         code: str | None = None
     ):
-        channel = interaction.guild.get_channel(QA_CHANNEL_ID)
-
-        if not channel:
+        if not interaction.guild.get_channel(self.bot.config.guild(interaction.guild_id).qa_channel_id):
             await interaction.response.send_message(
                 "❌ Q&A channel is not configured.",
                 ephemeral=True
             )
             return
 
+        question = (title, language, description, code)
+
+        similar = await self.duplicates.similar(interaction.guild_id, f"{title}\n{description}")
+        threads = await self.index.threads([thread_id for thread_id, _ in similar])
+
+        if threads:
+            embed = discord.Embed(
+                title="🔁 This may already have been asked",
+                description="Check these threads first, or post your question anyway.",
+                color=discord.Color.orange()
+            )
+            for thread_id, score in similar:
+                if thread_id not in threads:
+                    continue
+                found_title, found_language, solved = threads[thread_id]
+                embed.add_field(
+                    name=f"{'✅' if solved else '❓'} {found_language} | {found_title[:200]}",
+                    value=f"<#{thread_id}> · {score:.0%} similar",
+                    inline=False
+                )
+
+            await interaction.response.send_message(
+                embed=embed,
+                view=DuplicatePromptView(self, interaction.user.id, question),
+                ephemeral=True
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        thread = await self.post_question(interaction, *question)
+
+        await interaction.followup.send(
+            f"✅ Your question has been posted: {thread.mention}",
+            ephemeral=True
+        )
+
+    async def post_question(
+        self,
+        interaction: discord.Interaction,
+        title: str,
+        language: str,
+        description: str,
+        code: str | None
+    ) -> discord.Thread | None:
+        channel = interaction.guild.get_channel(self.bot.config.guild(interaction.guild_id).qa_channel_id)
+
+        if not channel:
+            return None
+
         embed = discord.Embed(
             title=title,
             description=description,
@@ -106,20 +281,228 @@ class QASystem(commands.Cog):
 
         embed.set_footer(text="Please continue discussion in the thread")
 
-        message = await channel.send(embed=embed)
+        rest = self.bot.rest
+
+        message = await rest.submit(
+            Priority.INTERACTION,
+            lambda: channel.send(embed=embed),
+            route=f"channel:{channel.id}"
+        )
+
+        thread = await rest.submit(
+            Priority.INTERACTION,
+            lambda: message.create_thread(
+                name=f"❓ {language} | {title[:80]}"
+            ),
+            route=f"channel:{channel.id}"
+        )
+
+        await rest.submit(
+            Priority.INTERACTION,
+            lambda: thread.send(
+                "🔍 **Discussion Thread**\n"
+                "Use replies here to help solve the problem.",
+                view=SolvedView(interaction.user.id)
+            ),
+            route=f"channel:{thread.id}"
+        )
+
+        # Queued; written to the search and duplicate indexes in the background
+        self.index.add(thread.id, interaction.guild_id, interaction.user.id, title, language, description, code)
+        self.duplicates.add(thread.id, interaction.guild_id, f"{title}\n{description}")
+        self.analytics.record(ASK, interaction.guild_id, thread.id, interaction.user.id, language)
+
+        return thread
+
+    @app_commands.command(
+        name="search",
+        description="Search previous Q&A threads"
+    )
+    @app_commands.describe(
+        query="Words to look for in titles, descriptions and code",
+        solved="Only solved (or only unsolved) questions"
+    )
+    async def search(
+        self,
+        interaction: discord.Interaction,
+        query: str,
+        solved: bool | None = None
+    ):
+        results = await self.index.search(interaction.guild_id, query, solved=solved)
+
+        if not results:
+            await interaction.response.send_message(
+                "🔍 No matching questions found.",
+                ephemeral=True
+            )
+            return
 
-        thread = await message.create_thread(
-            name=f"❓ {language} | {title[:80]}"
+        embed = discord.Embed(
+            title=f"🔍 Results for \"{query[:200]}\"",
+            color=discord.Color.blurple()
         )
+        for result in results:
+            embed.add_field(
+                name=f"{'✅' if result.solved else '❓'} {result.language} | {result.title[:200]}",
+                value=f"<#{result.thread_id}>\n{result.snippet[:800]}",
+                inline=False
+            )
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @app_commands.command(
+        name="qa_stats",
+        description="Q&A response and resolution times"
+    )
+    @app_commands.describe(
+        days="Questions asked in the last N days",
+        language="Only this language or tech"
+    )
+    @has_staff_role()
+    async def qa_stats(
+        self,
+        interaction: discord.Interaction,
+        days: app_commands.Range[int, 1, 365] = 30,
+        language: str | None = None
+    ):
+        stats = await self.analytics.stats(interaction.guild_id, days, language)
+        total = stats.total
+
+        if not total.asked:
+            await interaction.response.send_message(
+                "📊 No questions recorded for that period.",
+                ephemeral=True
+            )
+            return
 
-        await thread.send(
-            "🔍 **Discussion Thread**\n"
-            "Use replies here to help solve the problem.",
-            view=SolvedView(interaction.user.id)
+        embed = discord.Embed(
+            title=f"📊 Q&A stats, last {days} day{'s' * (days != 1)}" + (f" ({language})" if language else ""),
+            color=discord.Color.blurple()
+        )
+        embed.add_field(
+            name="Questions",
+            value=(
+                f"**{total.asked}** asked\n"
+                f"**{total.replied}** answered ({total.replied / total.asked:.0%})\n"
+                f"**{total.solved}** solved ({total.solved / total.asked:.0%})"
+            ),
+            inline=True
+        )
+        embed.add_field(
+            name="First reply",
+            value=f"median {format_seconds(total.reply.quantile(0.5))}\np90 {format_seconds(total.reply.quantile(0.9))}",
+            inline=True
+        )
+        embed.add_field(
+            name="Solved in",
+            value=f"median {format_seconds(total.solve.quantile(0.5))}\np90 {format_seconds(total.solve.quantile(0.9))}",
+            inline=True
         )
 
+        if not language:
+            embed.add_field(
+                name="By language",
+                value="\n".join(
+                    f"`{r.language[:20]}` {r.asked} asked · {r.unanswered} unanswered · "
+                    f"first reply {format_seconds(r.reply.quantile(0.5))}"
+                    for r in stats.languages[:10]
+                )[:1024],
+                inline=False
+            )
+
+        if stats.answerers:
+            embed.add_field(
+                name="Top answerers",
+                value="\n".join(
+                    f"<@{user_id}> {replies} replies · first on {first}"
+                    for user_id, replies, first in stats.answerers
+                ),
+                inline=False
+            )
+
+        embed.set_footer(text="Grouped by the day each question was asked · updated every 30 seconds")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    # ---------- STALE THREADS ----------
+
+    def stale_threads(self, guild: discord.Guild) -> list[discord.Thread]:
+        # Cached metadata only: the guild's active threads arrive with
+        # GUILD_CREATE and last_message_id is kept current by the gateway,
+        # so finding idle threads costs no API calls at all.
+        config = self.bot.config.guild(guild.id)
+        channel = guild.get_channel(config.qa_channel_id) if config.qa_channel_id else None
+        if not isinstance(channel, discord.TextChannel) or config.qa_stale_days <= 0:
+            return []
+
+        cutoff = time.time() - config.qa_stale_days * 86400
+        tagging = config.qa_stale_action == "tag"
+        stale = []
+        for thread in channel.threads:
+            if thread.archived or thread.locked:
+                continue
+            if tagging and thread.name.startswith(STALE_PREFIX):
+                continue
+            last_active = discord.utils.snowflake_time(thread.last_message_id or thread.id).timestamp()
+            if last_active < cutoff:
+                stale.append(thread)
+        return stale
+
+    def sweep_edit(self, thread: discord.Thread, action: str):
+        if action == "tag":
+            return lambda: thread.edit(name=f"{STALE_PREFIX}{thread.name}"[:100])
+        return lambda: thread.edit(archived=True)
+
+    async def sweep(self) -> int:
+        batch_size = max(self.bot.config.settings.qa_sweep_batch_size, 1)
+        swept = 0
+
+        for guild in self.bot.guilds:
+            action = self.bot.config.guild(guild.id).qa_stale_action
+            threads = self.stale_threads(guild)
+
+            for start in range(0, len(threads), batch_size):
+                batch = threads[start:start + batch_size]
+                results = await asyncio.gather(
+                    *(
+                        self.bot.rest.submit(
+                            Priority.COSMETIC,
+                            self.sweep_edit(thread, action),
+                            route=f"channel:{thread.id}"
+                        )
+                        for thread in batch
+                    ),
+                    return_exceptions=True
+                )
+                for thread, result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        log.warning("Could not sweep stale thread %s: %s", thread.id, result)
+                    elif result is not None:
+                        swept += 1
+                await asyncio.sleep(SWEEP_PAUSE)
+
+        return swept
+
+    async def sweep_loop(self):
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                swept = await self.sweep()
+                if swept:
+                    log.info("Swept %d stale Q&A threads", swept)
+            except Exception:
+                log.exception("Stale Q&A thread sweep failed")
+            await asyncio.sleep(self.bot.config.settings.qa_sweep_interval_seconds)
+
+    async def cog_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        command = interaction.command
+        self.bot.metrics.count("command.errors", command.qualified_name if command else "unknown")
+
+        # Anything else is left to the tree's default handler, which logs it
+        if not isinstance(error, app_commands.MissingRole):
+            return
+
         await interaction.response.send_message(
-            f"✅ Your question has been posted: {thread.mention}",
+            "❌ Only staff can use this command.",
             ephemeral=True
         )
 
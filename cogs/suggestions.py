@@ -1,73 +1,98 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-import json
+import asyncio
+import logging
+import re
+import time
 
-# ---------------- CONFIG ----------------
+from core.config import is_staff
+from core.edit_coalescer import EditCoalescer
+from core.near_duplicates import NearDuplicateIndex
+from core.rest_scheduler import Priority
+from core.vote_store import VoteStore, SuggestionVotes, UPVOTE, DOWNVOTE
 
-with open("config.json", "r", encoding="utf-8") as f:
-    config = json.load(f)
-
-SUGGESTION_CHANNEL_ID = config["suggestion_channel_id"]
-STAFF_ROLE_ID = config["staff_role_id"]
+log = logging.getLogger(__name__)
 
 # ---------------- PUBLIC VIEW (EVERYONE) ----------------
 
 class SuggestionPublicView(discord.ui.View):
-    def __init__(self):
+    # One persistent instance serves every suggestion message; vote state
+    # lives in the VoteStore, keyed by the public message ID, and embed
+    # edits go through the coalescer so a burst of votes costs one PATCH.
+
+    def __init__(self, store: VoteStore, edits: EditCoalescer):
         super().__init__(timeout=None)
-        self.upvotes: set[int] = set()
-        self.downvotes: set[int] = set()
+        self.store = store
+        self.edits = edits
 
-    def update_embed(self, embed: discord.Embed):
+    def update_embed(self, embed: discord.Embed, record: SuggestionVotes):
         embed.set_field_at(
             2,
             name="Results",
-            value=f"✅ {len(self.upvotes)} ❌ {len(self.downvotes)}",
+            value=record.results(),
             inline=False
         )
 
-    @discord.ui.button(label="Approve", style=discord.ButtonStyle.success, emoji="✅")
-    async def approve(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id in self.upvotes:
+    async def cast_vote(self, interaction: discord.Interaction, value: int, already: str):
+        record = self.store.get(interaction.message.id)
+
+        if not record:
             await interaction.response.send_message(
-                "You already approved this suggestion.",
+                "❌ This suggestion is no longer open for voting.",
                 ephemeral=True
             )
             return
 
-        self.downvotes.discard(interaction.user.id)
-        self.upvotes.add(interaction.user.id)
+        if not self.store.vote(record.message_id, interaction.user.id, value):
+            await interaction.response.send_message(already, ephemeral=True)
+            return
 
-        embed = interaction.message.embeds[0]
-        self.update_embed(embed)
-        await interaction.message.edit(embed=embed, view=self)
         await interaction.response.defer()
 
-    @discord.ui.button(label="Reject", style=discord.ButtonStyle.danger, emoji="❌")
-    async def reject(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if interaction.user.id in self.downvotes:
-            await interaction.response.send_message(
-                "You already rejected this suggestion.",
-                ephemeral=True
-            )
-            return
+        message = interaction.message
 
-        self.upvotes.discard(interaction.user.id)
-        self.downvotes.add(interaction.user.id)
+        def render():
+            embed = message.embeds[0]
+            self.update_embed(embed, record)
+            return {"embed": embed}
 
-        embed = interaction.message.embeds[0]
-        self.update_embed(embed)
-        await interaction.message.edit(embed=embed, view=self)
-        await interaction.response.defer()
+        self.edits.submit(message, render)
+
+    @discord.ui.button(
+        label="Approve",
+        style=discord.ButtonStyle.success,
+        emoji="✅",
+        custom_id="horizon:suggestion:approve"
+    )
+    async def approve(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.cast_vote(interaction, UPVOTE, "You already approved this suggestion.")
+
+    @discord.ui.button(
+        label="Reject",
+        style=discord.ButtonStyle.danger,
+        emoji="❌",
+        custom_id="horizon:suggestion:reject"
+    )
+    async def reject(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.cast_vote(interaction, DOWNVOTE, "You already rejected this suggestion.")
 
-    @discord.ui.button(label="View Votes", style=discord.ButtonStyle.secondary, emoji="👁️")
+    @discord.ui.button(
+        label="View Votes",
+        style=discord.ButtonStyle.secondary,
+        emoji="👁️",
+        custom_id="horizon:suggestion:votes"
+    )
     async def view_votes(self, interaction: discord.Interaction, button: discord.ui.Button):
+        record = self.store.get(interaction.message.id)
+        upvotes = record.upvotes if record else ()
+        downvotes = record.downvotes if record else ()
+
         voters = (
             "✅ Upvotes:\n" +
-            ("\n".join(f"<@{u}>" for u in self.upvotes) or "None") +
+            ("\n".join(f"<@{u}>" for u in upvotes) or "None") +
             "\n\n❌ Downvotes:\n" +
-            ("\n".join(f"<@{d}>" for d in self.downvotes) or "None")
+            ("\n".join(f"<@{d}>" for d in downvotes) or "None")
         )
 
         embed = discord.Embed(
@@ -81,35 +106,75 @@ class SuggestionPublicView(discord.ui.View):
 # ---------------- STAFF VIEW (THREAD ONLY) ----------------
 
 class SuggestionStaffView(discord.ui.View):
-    def __init__(self, public_message: discord.Message, public_view: SuggestionPublicView):
+    # Lives in the staff thread, which is created from the public message
+    # and therefore shares its ID -- that is how we find the suggestion.
+
+    def __init__(self, store: VoteStore, edits: EditCoalescer, duplicates: NearDuplicateIndex):
         super().__init__(timeout=None)
-        self.public_message = public_message
-        self.public_view = public_view
+        self.store = store
+        self.edits = edits
+        self.duplicates = duplicates
+
+    def resolve(self, interaction: discord.Interaction):
+        thread = interaction.channel
+        record = self.store.get(thread.id)
 
-    def is_staff(self, member: discord.Member) -> bool:
-        return any(role.id == STAFF_ROLE_ID for role in member.roles)
+        if not record:
+            return None, None
 
-    @discord.ui.button(label="Accept", style=discord.ButtonStyle.success, emoji="✔️")
+        # Editing only needs the IDs; don't depend on the channel being cached
+        client = interaction.client
+        public_channel = client.get_channel(record.channel_id) or client.get_partial_messageable(
+            record.channel_id, guild_id=interaction.guild_id
+        )
+        return record, public_channel.get_partial_message(record.message_id)
+
+    @discord.ui.button(
+        label="Accept",
+        style=discord.ButtonStyle.success,
+        emoji="✔️",
+        custom_id="horizon:suggestion:accept"
+    )
     async def accept(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if not self.is_staff(interaction.user):
+        if not is_staff(interaction.user, interaction.client.config.guild(interaction.guild_id)):
             await interaction.response.send_message(
                 "❌ Only staff can accept suggestions.",
                 ephemeral=True
             )
             return
 
+        record, public_message = self.resolve(interaction)
+        if not record:
+            await interaction.response.send_message(
+                "❌ This suggestion has already been reviewed.",
+                ephemeral=True
+            )
+            return
+
+        if not await self.store.close_suggestion(record.message_id, "accepted"):
+            # Another staff member reviewed it in the meantime
+            await interaction.response.send_message(
+                "❌ This suggestion has already been reviewed.",
+                ephemeral=True
+            )
+            return
+
+        # Answer first: the edits below can queue behind a busy channel
+        await interaction.response.defer(ephemeral=True)
+        await self.edits.discard(record.message_id)
+
         embed = discord.Embed(
             title="Status: ACCEPTED",
             color=discord.Color.green()
         )
         embed.add_field(
             name="Suggestion",
-            value=self.public_message.embeds[0].description,
+            value=record.content,
             inline=False
         )
         embed.add_field(
             name="Results",
-            value=f"✅ {len(self.public_view.upvotes)} ❌ {len(self.public_view.downvotes)}",
+            value=record.results(),
             inline=False
         )
         embed.add_field(
@@ -118,23 +183,66 @@ class SuggestionStaffView(discord.ui.View):
             inline=False
         )
 
-        await self.public_message.edit(embed=embed, view=None)
-        await interaction.response.send_message(
+        await interaction.client.rest.submit(
+            Priority.INTERACTION,
+            lambda: public_message.edit(embed=embed, view=None),
+            route=f"channel:{record.channel_id}"
+        )
+        await interaction.followup.send(
             "✅ Suggestion accepted.",
             ephemeral=True
         )
 
-    @discord.ui.button(label="Deny", style=discord.ButtonStyle.danger, emoji="⛔")
+    @discord.ui.button(
+        label="Deny",
+        style=discord.ButtonStyle.danger,
+        emoji="⛔",
+        custom_id="horizon:suggestion:deny"
+    )
     async def deny(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if not self.is_staff(interaction.user):
+        if not is_staff(interaction.user, interaction.client.config.guild(interaction.guild_id)):
             await interaction.response.send_message(
                 "❌ Only staff can reject suggestions.",
                 ephemeral=True
             )
             return
 
+        record, public_message = self.resolve(interaction)
+        if not record:
+            await interaction.response.send_message(
+                "❌ This suggestion has already been reviewed.",
+                ephemeral=True
+            )
+            return
+
+        await interaction.response.send_modal(
+            DenyModal(self.store, self.edits, record, public_message)
+        )
+
+    @discord.ui.button(
+        label="Merge",
+        style=discord.ButtonStyle.secondary,
+        emoji="🔀",
+        custom_id="horizon:suggestion:merge"
+    )
+    async def merge(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if not is_staff(interaction.user, interaction.client.config.guild(interaction.guild_id)):
+            await interaction.response.send_message(
+                "❌ Only staff can merge suggestions.",
+                ephemeral=True
+            )
+            return
+
+        record, public_message = self.resolve(interaction)
+        if not record:
+            await interaction.response.send_message(
+                "❌ This suggestion has already been reviewed.",
+                ephemeral=True
+            )
+            return
+
         await interaction.response.send_modal(
-            DenyModal(self.public_message, self.public_view)
+            MergeModal(self.store, self.edits, self.duplicates, record, public_message)
         )
 
 # ---------------- DENY MODAL ----------------
@@ -147,19 +255,38 @@ class DenyModal(discord.ui.Modal, title="Reject Suggestion"):
         required=True
     )
 
-    def __init__(self, public_message: discord.Message, public_view: SuggestionPublicView):
+    def __init__(
+        self,
+        store: VoteStore,
+        edits: EditCoalescer,
+        record: SuggestionVotes,
+        public_message: discord.PartialMessage
+    ):
         super().__init__()
+        self.store = store
+        self.edits = edits
+        self.record = record
         self.public_message = public_message
-        self.public_view = public_view
 
     async def on_submit(self, interaction: discord.Interaction):
+        if not await self.store.close_suggestion(self.record.message_id, "rejected"):
+            await interaction.response.send_message(
+                "❌ This suggestion has already been reviewed.",
+                ephemeral=True
+            )
+            return
+
+        # Answer first: the edits below can queue behind a busy channel
+        await interaction.response.defer(ephemeral=True)
+        await self.edits.discard(self.record.message_id)
+
         embed = discord.Embed(
             title="Status: REJECTED",
             color=discord.Color.red()
         )
         embed.add_field(
             name="Suggestion",
-            value=self.public_message.embeds[0].description,
+            value=self.record.content,
             inline=False
         )
         embed.add_field(
@@ -169,7 +296,7 @@ class DenyModal(discord.ui.Modal, title="Reject Suggestion"):
         )
         embed.add_field(
             name="Results",
-            value=f"✅ {len(self.public_view.upvotes)} ❌ {len(self.public_view.downvotes)}",
+            value=self.record.results(),
             inline=False
         )
         embed.add_field(
@@ -178,29 +305,387 @@ class DenyModal(discord.ui.Modal, title="Reject Suggestion"):
             inline=False
         )
 
-        await self.public_message.edit(embed=embed, view=None)
-        await interaction.response.send_message(
+        await interaction.client.rest.submit(
+            Priority.INTERACTION,
+            lambda: self.public_message.edit(embed=embed, view=None),
+            route=f"channel:{self.record.channel_id}"
+        )
+        await interaction.followup.send(
             "⛔ Suggestion rejected.",
             ephemeral=True
         )
 
+# ---------------- MERGE MODAL ----------------
+
+class MergeModal(discord.ui.Modal, title="Merge Suggestion"):
+    target = discord.ui.TextInput(
+        label="Merge into (message link or ID)",
+        placeholder="https://discord.com/channels/…",
+        max_length=200,
+        required=True
+    )
+
+    def __init__(
+        self,
+        store: VoteStore,
+        edits: EditCoalescer,
+        duplicates: NearDuplicateIndex,
+        record: SuggestionVotes,
+        public_message: discord.PartialMessage
+    ):
+        super().__init__()
+        self.store = store
+        self.edits = edits
+        self.duplicates = duplicates
+        self.record = record
+        self.public_message = public_message
+
+    async def on_submit(self, interaction: discord.Interaction):
+        ids = re.findall(r"[0-9]{15,20}", self.target.value)
+        entry = self.store.ranking.entries.get(int(ids[-1])) if ids else None
+        target = self.store.get(entry.message_id) if entry and entry.guild_id == interaction.guild_id else None
+
+        if target is None or target is self.record:
+            await interaction.response.send_message(
+                "❌ That is not another open suggestion in this server.",
+                ephemeral=True
+            )
+            return
+
+        moved = await self.store.merge(self.record.message_id, target.message_id)
+        if moved is None:
+            await interaction.response.send_message(
+                "❌ One of these suggestions has already been reviewed.",
+                ephemeral=True
+            )
+            return
+
+        self.duplicates.remove(self.record.message_id)
+
+        # Answer before the REST calls below, which queue behind other writes
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        await self.edits.discard(self.record.message_id)
+
+        target_link = f"https://discord.com/channels/{interaction.guild_id}/{target.channel_id}/{target.message_id}"
+        embed = discord.Embed(
+            title="Status: MERGED",
+            color=discord.Color.greyple()
+        )
+        embed.add_field(
+            name="Suggestion",
+            value=self.record.content,
+            inline=False
+        )
+        embed.add_field(
+            name="Merged Into",
+            value=target_link,
+            inline=False
+        )
+        embed.add_field(
+            name="Results",
+            value=self.record.results(),
+            inline=False
+        )
+        embed.add_field(
+            name="Merged By",
+            value=interaction.user.mention,
+            inline=False
+        )
+
+        rest = interaction.client.rest
+        await rest.submit(
+            Priority.INTERACTION,
+            lambda: self.public_message.edit(embed=embed, view=None),
+            route=f"channel:{self.record.channel_id}"
+        )
+
+        # The target's tally goes through the coalescer like any vote, so
+        # it costs one edit even if votes are landing on it right now.
+        if moved:
+            client = interaction.client
+            target_channel = client.get_channel(target.channel_id) or client.get_partial_messageable(
+                target.channel_id, guild_id=interaction.guild_id
+            )
+            try:
+                target_message = await rest.submit(
+                    Priority.INTERACTION,
+                    lambda: target_channel.fetch_message(target.message_id),
+                    route=f"channel:{target.channel_id}"
+                )
+            except discord.NotFound:
+                target_message = None
+
+            if target_message and target_message.embeds:
+                def render():
+                    embed = target_message.embeds[0]
+                    embed.set_field_at(2, name="Results", value=target.results(), inline=False)
+                    return {"embed": embed}
+
+                self.edits.submit(target_message, render)
+
+        await interaction.followup.send(
+            f"🔀 Merged into {target_link} ({moved} vote{'s' * (moved != 1)} moved).",
+            ephemeral=True
+        )
+
+# ---------------- DUPLICATE PROMPT ----------------
+
+class DuplicateSuggestionView(discord.ui.View):
+    """Shown instead of posting when /suggest looks like an existing suggestion."""
+
+    def __init__(self, cog: "Suggestions", author_id: int, suggestion: str):
+        super().__init__(timeout=120)
+        self.cog = cog
+        self.author_id = author_id
+        self.suggestion = suggestion
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user.id == self.author_id
+
+    @discord.ui.button(label="Post anyway", style=discord.ButtonStyle.primary, emoji="📨")
+    async def post(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.stop()
+        await interaction.response.edit_message(content="⏳ Posting your suggestion...", embed=None, view=None)
+
+        if not await self.cog.post_suggestion(interaction, self.suggestion):
+            await interaction.edit_original_response(content="❌ Suggestion channel not configured.")
+            return
+
+        await interaction.edit_original_response(content="✅ Your suggestion has been posted.")
+
+    @discord.ui.button(label="Cancel", style=discord.ButtonStyle.secondary)
+    async def cancel(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.stop()
+        await interaction.response.edit_message(content="👍 Suggestion not posted.", embed=None, view=None)
+
+# ---------------- LEADERBOARD ----------------
+
+PAGE_SIZE = 10
+
+STATUS_ICONS = {"pending": "⏳", "accepted": "✔️", "rejected": "⛔", "merged": "🔀"}
+
+
+class TopSuggestionsView(discord.ui.View):
+    # Pages are slices of the in-memory ranking, so paging is instant;
+    # only the ten suggestions shown are looked up for their text.
+
+    def __init__(self, store: VoteStore, guild_id: int, status: str):
+        super().__init__(timeout=300)
+        self.store = store
+        self.guild_id = guild_id
+        self.status = status
+        self.page = 0
+        self.lines: list[str] = []
+
+    async def load(self):
+        ranking = self.store.ranking
+        entries = ranking.page(self.guild_id, self.status, self.page * PAGE_SIZE, PAGE_SIZE)
+        contents = await self.store.contents([entry.message_id for entry in entries])
+
+        self.lines = []
+        for rank, entry in enumerate(entries, start=self.page * PAGE_SIZE + 1):
+            channel_id, content = contents.get(entry.message_id, (None, "*(missing)*"))
+            link = (
+                f"https://discord.com/channels/{self.guild_id}/{channel_id}/{entry.message_id}"
+                if channel_id else None
+            )
+            title = content.splitlines()[0][:120] if content else "—"
+            self.lines.append(
+                f"**{rank}.** {f'[{title}]({link})' if link else title}\n"
+                f"✅ {entry.upvotes} ❌ {entry.downvotes} · score {entry.score:.2f}"
+            )
+
+        self.previous.disabled = self.page == 0
+        self.next.disabled = (self.page + 1) * PAGE_SIZE >= ranking.count(self.guild_id, self.status)
+
+    def embed(self) -> discord.Embed:
+        total = self.store.ranking.count(self.guild_id, self.status)
+        embed = discord.Embed(
+            title=f"{STATUS_ICONS[self.status]} Top {self.status} suggestions",
+            description="\n".join(self.lines) or "No suggestions found.",
+            color=discord.Color.dark_purple()
+        )
+        pages = max((total + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+        embed.set_footer(text=f"Page {self.page + 1}/{pages} · {total} total · ranked by Wilson score")
+        return embed
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.secondary)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page -= 1
+        await self.load()
+        await interaction.response.edit_message(embed=self.embed(), view=self)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        await self.load()
+        await interaction.response.edit_message(embed=self.embed(), view=self)
+
 # ---------------- COG ----------------
 
 class Suggestions(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        settings = bot.config.settings
+        self.store = VoteStore(settings.database_path)
+        self.edits = EditCoalescer(bot.rest, settings.vote_edit_window_seconds)
+        self.duplicates = NearDuplicateIndex(settings.database_path, "suggestions")
+        self.fanout_jobs: set[asyncio.Task] = set()
+        self.backfill: asyncio.Task | None = None
+
+    async def cog_load(self):
+        # Load every open suggestion in one pass, then attach a single
+        # persistent view per kind so buttons survive restarts.
+        await self.store.open()
+        await self.duplicates.open()
+        self.bot.add_view(SuggestionPublicView(self.store, self.edits))
+        self.bot.add_view(SuggestionStaffView(self.store, self.edits, self.duplicates))
+        self.bot.config.on_reload(self.apply_config)
+        self.backfill = asyncio.create_task(self.backfill_duplicates())
+
+    def apply_config(self, config):
+        self.edits.window = config.settings.vote_edit_window_seconds
+
+    async def cog_unload(self):
+        self.backfill.cancel()
+        for job in self.fanout_jobs:
+            job.cancel()
+        await self.edits.close()
+        await self.duplicates.close()
+        await self.store.close()
+
+    async def backfill_duplicates(self, chunk: int = 200):
+        # Suggestions made before the similarity index existed (or while
+        # it was failing) are hashed in small chunks so startup never
+        # stalls the event loop, even with 100k of them.
+        try:
+            indexed = await self.duplicates.indexed()
+            missing = [row for row in await self.store.texts() if row[0] not in indexed]
+            for start in range(0, len(missing), chunk):
+                for message_id, guild_id, content in missing[start:start + chunk]:
+                    self.duplicates.add(message_id, guild_id, content)
+                await self.duplicates.flush()
+                await asyncio.sleep(0)
+            if missing:
+                log.info("Indexed %d earlier suggestions for duplicate detection", len(missing))
+        except Exception:
+            log.exception("Backfilling the suggestion similarity index failed")
+
+    # ---------------- STAFF FAN-OUT ----------------
+
+    async def add_staff(self, thread: discord.Thread, role: discord.Role, concurrency: int) -> int:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def add(member: discord.Member) -> bool:
+            async with semaphore:
+                try:
+                    await self.bot.rest.submit(
+                        Priority.LOG,
+                        lambda: thread.add_user(member),
+                        route=f"channel:{thread.id}"
+                    )
+                    return True
+                except discord.HTTPException:
+                    log.warning("Could not add %s to staff thread %s", member.id, thread.id)
+                    return False
+
+        results = await asyncio.gather(*(add(member) for member in role.members))
+        return sum(results)
+
+    async def fan_out(self, thread: discord.Thread):
+        started = time.perf_counter()
+        config = self.bot.config.guild(thread.guild.id)
+        role = thread.guild.get_role(config.staff_role_id)
+
+        if not role:
+            log.warning("Staff role %s not found; staff thread %s left empty", config.staff_role_id, thread.id)
+            return
+
+        if config.staff_thread_mode == "mention":
+            try:
+                await self.bot.rest.submit(
+                    Priority.LOG,
+                    lambda: thread.send(
+                        role.mention,
+                        allowed_mentions=discord.AllowedMentions(roles=[role])
+                    ),
+                    route=f"channel:{thread.id}"
+                )
+                added = len(role.members)
+            except discord.HTTPException:
+                log.warning("Could not mention staff role in thread %s", thread.id)
+                added = 0
+        else:
+            await self.bot.member_cache.ensure_staff(thread.guild)
+            added = await self.add_staff(thread, role, config.staff_fanout_concurrency)
+
+        metrics = self.bot.metrics
+        metrics.observe("suggest.staff_fanout", time.perf_counter() - started)
+        metrics.incr("suggest.staff_fanout.members", added)
+
+    def start_fan_out(self, thread: discord.Thread):
+        job = asyncio.create_task(self.fan_out(thread))
+        self.fanout_jobs.add(job)
+        job.add_done_callback(self.fanout_jobs.discard)
 
     @app_commands.command(name="suggest", description="Submit a server suggestion")
     async def suggest(self, interaction: discord.Interaction, suggestion: str):
-        channel = interaction.guild.get_channel(SUGGESTION_CHANNEL_ID)
+        config = self.bot.config.guild(interaction.guild_id)
 
-        if not channel:
+        if not interaction.guild.get_channel(config.suggestion_channel_id):
             await interaction.response.send_message(
                 "❌ Suggestion channel not configured.",
                 ephemeral=True
             )
             return
 
+        similar = [
+            (message_id, score)
+            for message_id, score in await self.duplicates.similar(interaction.guild_id, suggestion)
+            if message_id in self.store.ranking.entries
+        ]
+
+        if similar:
+            contents = await self.store.contents([message_id for message_id, _ in similar])
+            embed = discord.Embed(
+                title="🔁 Something similar was already suggested",
+                description="Vote on an existing suggestion instead, or post yours anyway.",
+                color=discord.Color.orange()
+            )
+            for message_id, score in similar:
+                entry = self.store.ranking.entries[message_id]
+                channel_id, content = contents.get(message_id, (config.suggestion_channel_id, ""))
+                embed.add_field(
+                    name=f"{STATUS_ICONS.get(entry.status, '•')} {content.splitlines()[0][:200] if content else '—'}",
+                    value=(
+                        f"https://discord.com/channels/{interaction.guild_id}/{channel_id}/{message_id}\n"
+                        f"✅ {entry.upvotes} ❌ {entry.downvotes} · {score:.0%} similar"
+                    ),
+                    inline=False
+                )
+
+            await interaction.response.send_message(
+                embed=embed,
+                view=DuplicateSuggestionView(self, interaction.user.id, suggestion),
+                ephemeral=True
+            )
+            return
+
+        await interaction.response.defer(ephemeral=True)
+        await self.post_suggestion(interaction, suggestion)
+
+        await interaction.followup.send(
+            "✅ Your suggestion has been posted.",
+            ephemeral=True
+        )
+
+    async def post_suggestion(self, interaction: discord.Interaction, suggestion: str) -> bool:
+        config = self.bot.config.guild(interaction.guild_id)
+        channel = interaction.guild.get_channel(config.suggestion_channel_id)
+
+        if not channel:
+            return False
+
         embed = discord.Embed(
             title="📌 New Suggestion",
             description=suggestion,
@@ -210,33 +695,59 @@ class Suggestions(commands.Cog):
         embed.add_field(name="Status", value="⏳ Pending", inline=False)
         embed.add_field(name="Results", value="✅ 0 ❌ 0", inline=False)
 
-        public_view = SuggestionPublicView()
-        public_message = await channel.send(embed=embed, view=public_view)
+        rest = self.bot.rest
+        public_message = await rest.submit(
+            Priority.INTERACTION,
+            lambda: channel.send(embed=embed, view=SuggestionPublicView(self.store, self.edits)),
+            route=f"channel:{channel.id}"
+        )
+        await self.store.create(
+            public_message.id,
+            interaction.guild.id,
+            channel.id,
+            interaction.user.id,
+            suggestion
+        )
+        self.duplicates.add(public_message.id, interaction.guild.id, suggestion)
 
         # -------- CREATE STAFF THREAD (SAFE) --------
         staff_thread = None
         try:
-            staff_thread = await public_message.create_thread(
-                name="Staff Review",
-                auto_archive_duration=1440
+            staff_thread = await rest.submit(
+                Priority.INTERACTION,
+                lambda: public_message.create_thread(
+                    name="Staff Review",
+                    auto_archive_duration=1440
+                ),
+                route=f"channel:{channel.id}"
             )
         except Exception:
             staff_thread = None
 
         if staff_thread:
-            for member in interaction.guild.members:
-                if any(role.id == STAFF_ROLE_ID for role in member.roles):
-                    await staff_thread.add_user(member)
-
-            await staff_thread.send(
-                "🔐 **Staff-only controls for this suggestion**",
-                view=SuggestionStaffView(public_message, public_view)
+            await rest.submit(
+                Priority.INTERACTION,
+                lambda: staff_thread.send(
+                    "🔐 **Staff-only controls for this suggestion**",
+                    view=SuggestionStaffView(self.store, self.edits, self.duplicates)
+                ),
+                route=f"channel:{staff_thread.id}"
             )
-
-        await interaction.response.send_message(
-            "✅ Your suggestion has been posted.",
-            ephemeral=True
-        )
+            self.start_fan_out(staff_thread)
+
+        return True
+
+    @app_commands.command(name="top_suggestions", description="Suggestions ranked by community votes")
+    @app_commands.describe(status="Which suggestions to rank (default: pending)")
+    @app_commands.choices(status=[
+        app_commands.Choice(name="Pending", value="pending"),
+        app_commands.Choice(name="Accepted", value="accepted"),
+        app_commands.Choice(name="Rejected", value="rejected")
+    ])
+    async def top_suggestions(self, interaction: discord.Interaction, status: str = "pending"):
+        view = TopSuggestionsView(self.store, interaction.guild_id, status)
+        await view.load()
+        await interaction.response.send_message(embed=view.embed(), view=view, ephemeral=True)
 
 # ---------------- SETUP ----------------
 
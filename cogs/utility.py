@@ -3,6 +3,8 @@ from discord.ext import commands
 import time
 from datetime import timedelta
 
+from core.rest_scheduler import Priority
+
 class Utility(commands.Cog):
     def __init__(self, bot: commands.Bot):
         self.bot = bot
@@ -12,12 +14,19 @@ class Utility(commands.Cog):
 
     async def cog_check(self, ctx: commands.Context):
         if not ctx.author.guild_permissions.manage_guild:
-            await ctx.send("❌ Staff only command.")
+            await self.reply(ctx, "❌ Staff only command.")
             return False
         return True
 
     # ---------- HELPERS ----------
 
+    async def reply(self, ctx: commands.Context, *args, **kwargs):
+        return await self.bot.rest.submit(
+            Priority.INTERACTION,
+            lambda: ctx.send(*args, **kwargs),
+            route=f"channel:{ctx.channel.id}"
+        )
+
     def get_uptime(self) -> str:
         return str(timedelta(seconds=int(time.time() - self.start_time)))
 
@@ -25,7 +34,8 @@ class Utility(commands.Cog):
 
     @commands.command(name="ping")
     async def ping(self, ctx: commands.Context):
-        await ctx.send(
+        await self.reply(
+            ctx,
             embed=discord.Embed(
                 title="🏓 Pong",
                 description=f"Latency: `{round(self.bot.latency * 1000)} ms`",
@@ -41,14 +51,22 @@ class Utility(commands.Cog):
         )
         embed.add_field(name="Uptime", value=self.get_uptime(), inline=False)
         embed.add_field(name="Latency", value=f"{round(self.bot.latency * 1000)} ms", inline=False)
-        embed.add_field(name="Servers", value=len(self.bot.guilds), inline=True)
-        embed.add_field(
-            name="Users",
-            value=len({m.id for g in self.bot.guilds for m in g.members}),
-            inline=True
-        )
+        if self.bot.cluster:
+            # Summed across every cluster by the launcher; users in servers
+            # on several clusters are counted once per cluster
+            totals = await self.bot.global_stats()
+            shards, servers, users = totals["shards"], totals["guilds"], f"~{totals['users']}"
+        else:
+            shards = len(self.bot.shards)
+            servers = self.bot.stats.guilds
+            # Servers without a cached member list can't be deduplicated
+            users = self.bot.stats.users if self.bot.stats.exact else f"~{self.bot.stats.users}"
+
+        embed.add_field(name="Servers", value=servers, inline=True)
+        embed.add_field(name="Users", value=users, inline=True)
+        embed.add_field(name="Shards", value=shards, inline=True)
         embed.set_footer(text=f"Bot ID: {self.bot.user.id}")
-        await ctx.send(embed=embed)
+        await self.reply(ctx, embed=embed)
 
     @commands.command(name="bot_status")
     async def status_cmd(self, ctx: commands.Context):
@@ -63,7 +81,7 @@ class Utility(commands.Cog):
         embed.add_field(name="Manage Threads", value="✅" if perms.manage_threads else "❌", inline=True)
         embed.add_field(name="Latency", value=f"{round(self.bot.latency * 1000)} ms", inline=True)
 
-        await ctx.send(embed=embed)
+        await self.reply(ctx, embed=embed)
 
     # ---------- USER ----------
 
@@ -90,18 +108,23 @@ class Utility(commands.Cog):
         )
         embed.add_field(name="Roles", value=roles, inline=False)
 
-        await ctx.send(embed=embed)
+        await self.reply(ctx, embed=embed)
 
     # ---------- ROLE MANAGEMENT ----------
 
     @commands.command(name="add_role")
     async def add_role(self, ctx: commands.Context, member: discord.Member, role: discord.Role):
         if role >= ctx.author.top_role:
-            await ctx.send("❌ You cannot assign this role.")
+            await self.reply(ctx, "❌ You cannot assign this role.")
             return
 
-        await member.add_roles(role, reason=f"Added by {ctx.author}")
-        await ctx.send(
+        await self.bot.rest.submit(
+            Priority.MODERATION,
+            lambda: member.add_roles(role, reason=f"Added by {ctx.author}"),
+            route=f"guild:{ctx.guild.id}"
+        )
+        await self.reply(
+            ctx,
             embed=discord.Embed(
                 description=f"✅ Added {role.mention} to {member.mention}",
                 color=discord.Color.green()
@@ -111,11 +134,16 @@ class Utility(commands.Cog):
     @commands.command(name="remove_role")
     async def remove_role(self, ctx: commands.Context, member: discord.Member, role: discord.Role):
         if role >= ctx.author.top_role:
-            await ctx.send("❌ You cannot remove this role.")
+            await self.reply(ctx, "❌ You cannot remove this role.")
             return
 
-        await member.remove_roles(role, reason=f"Removed by {ctx.author}")
-        await ctx.send(
+        await self.bot.rest.submit(
+            Priority.MODERATION,
+            lambda: member.remove_roles(role, reason=f"Removed by {ctx.author}"),
+            route=f"guild:{ctx.guild.id}"
+        )
+        await self.reply(
+            ctx,
             embed=discord.Embed(
                 description=f"🗑 Removed {role.mention} from {member.mention}",
                 color=discord.Color.red()
@@ -138,21 +166,7 @@ class Utility(commands.Cog):
             "`.add_role @user @role` – Add role\n"
             "`.remove_role @user @role` – Remove role"
         )
-        await ctx.send(embed=embed)
-        
-@commands.command(name="say")
-async def say(self, ctx: commands.Context, *, message: str):
-    if not ctx.author.guild_permissions.manage_guild:
-        await ctx.send("❌ Staff only command.")
-        return
-
-    # Prevent mass mentions
-    if "@everyone" in message or "@here" in message:
-        await ctx.send("❌ Mass mentions are not allowed.", delete_after=5)
-        return
-
-    await ctx.message.delete()
-    await ctx.send(message)
+        await self.reply(ctx, embed=embed)
 
 
 # ---------- SETUP ----------
@@ -2,6 +2,8 @@ import discord
 from discord.ext import commands
 from discord import app_commands
 
+from core.rest_scheduler import Priority
+
 # ---------- VIEW (BUTTONS) ----------
 
 class WelcomeView(discord.ui.View):
@@ -117,7 +119,11 @@ class Welcome(commands.Cog):
 
         embed.set_footer(text="Developer Den")
 
-        await interaction.channel.send(embed=embed, view=WelcomeView())
+        await self.bot.rest.submit(
+            Priority.INTERACTION,
+            lambda: interaction.channel.send(embed=embed, view=WelcomeView()),
+            route=f"channel:{interaction.channel.id}"
+        )
         await interaction.response.send_message(
             "✅ Welcome panel created.",
             ephemeral=True
@@ -0,0 +1,258 @@
+from collections import OrderedDict
+
+# Normal chat repeats short or everyday messages all the time ("gg",
+# "lol", three people saying "good morning"). Only text that is long and
+# varied enough is fingerprinted for the duplicate and copypasta rules.
+MIN_DISTINCT_CHARS = 5
+COMMON_MESSAGES = frozenset({
+    "good morning", "good night", "good evening", "good afternoon", "thank you", "thanks all",
+    "thanks everyone", "thank you everyone", "congratulations", "happy birthday", "happy new year",
+    "merry christmas", "welcome back", "see you later", "same here", "let's go", "lets go",
+})
+PUNCTUATION = "!?.,~*_'\"()-:;"
+
+# ---------- RULES ----------
+
+class SpamRules:
+    """Thresholds for one guild, read off its GuildConfig."""
+
+    __slots__ = (
+        "messages", "window", "duplicates", "duplicate_min_length", "mentions",
+        "channel_messages", "raid_joins", "raid_window"
+    )
+
+    def __init__(
+        self,
+        messages: int = 6,
+        window: float = 5.0,
+        duplicates: int = 3,
+        duplicate_min_length: int = 12,
+        mentions: int = 8,
+        channel_messages: int = 40,
+        raid_joins: int = 10,
+        raid_window: float = 10.0
+    ):
+        self.messages = messages
+        self.window = window
+        self.duplicates = duplicates
+        self.duplicate_min_length = duplicate_min_length
+        self.mentions = mentions
+        self.channel_messages = channel_messages
+        self.raid_joins = raid_joins
+        self.raid_window = raid_window
+
+    @classmethod
+    def from_config(cls, config) -> "SpamRules":
+        return cls(
+            messages=config.antispam_messages,
+            window=config.antispam_window_seconds,
+            duplicates=config.antispam_duplicates,
+            duplicate_min_length=config.antispam_duplicate_min_length,
+            mentions=config.antispam_mentions,
+            channel_messages=config.antispam_channel_messages,
+            raid_joins=config.antispam_raid_joins,
+            raid_window=config.antispam_raid_window_seconds
+        )
+
+
+def fingerprint(content: str, min_length: int) -> int | None:
+    """Hash of the normalized text, or None if it is too short, too
+    repetitive or too common to mean anything when repeated."""
+    text = " ".join(content.casefold().split())
+    if len(text) < min_length:
+        return None
+    if len(set(text)) - (" " in text) < MIN_DISTINCT_CHARS:
+        return None
+    if text.strip(PUNCTUATION).strip() in COMMON_MESSAGES:
+        return None
+    return hash(text)
+
+# ---------- BUFFERS ----------
+
+class Ring:
+    """Fixed-size circular buffer; the oldest entry is overwritten."""
+
+    __slots__ = ("items", "pos")
+
+    def __init__(self, size: int):
+        self.items = [None] * max(size, 1)
+        self.pos = 0
+
+    def push(self, item):
+        self.items[self.pos] = item
+        self.pos = (self.pos + 1) % len(self.items)
+
+    def oldest(self):
+        # Once full, the next slot to overwrite holds the oldest entry
+        return self.items[self.pos]
+
+    def clear(self):
+        self.items = [None] * len(self.items)
+        self.pos = 0
+
+    def __iter__(self):
+        return (item for item in self.items if item is not None)
+
+
+class UserActivity:
+    __slots__ = ("rules", "times", "recent", "hashes")
+
+    def __init__(self, rules: SpamRules):
+        self.rules = rules
+        self.times = Ring(rules.messages)
+        # (timestamp, channel_id, message_id) of the last few messages, for purging
+        self.recent = Ring(max(rules.messages, rules.duplicates))
+        self.hashes = Ring(rules.duplicates)
+
+
+class ChannelActivity:
+    __slots__ = ("rules", "times", "hashes")
+
+    def __init__(self, rules: SpamRules):
+        self.rules = rules
+        self.times = Ring(rules.channel_messages)
+        # (hash, timestamp, user_id, message_id): the same text from several accounts
+        self.hashes = Ring(rules.duplicates * 2)
+
+# ---------- DETECTOR ----------
+
+class Hit:
+    """What tripped and who: ``kind`` is one of rate, duplicate, mentions
+    (one user), copypasta (several users posting the same text), flood
+    (the channel as a whole) or raid (joins)."""
+
+    __slots__ = ("kind", "guild_id", "channel_id", "user_ids", "messages")
+
+    def __init__(self, kind: str, guild_id: int, channel_id: int | None = None, user_ids=(), messages=()):
+        self.kind = kind
+        self.guild_id = guild_id
+        self.channel_id = channel_id
+        self.user_ids = list(user_ids)
+        # (channel_id, message_id) pairs to purge
+        self.messages = list(messages)
+
+
+class SpamDetector:
+    """Sliding-window spam and raid detection over the message stream.
+
+    Every check is O(1) (or O(duplicates)) per message over small
+    fixed-size ring buffers. Per-user and per-channel state is kept in
+    LRU maps capped at ``user_capacity``/``channel_capacity``, so memory
+    is bounded no matter how many members are active; an evicted entry
+    only loses a few seconds of history.
+
+    The detector knows nothing about discord.py; the moderation cog feeds
+    it plain IDs and decides what to do with a :class:`Hit`.
+    """
+
+    def __init__(self, user_capacity: int = 50_000, channel_capacity: int = 10_000):
+        self.user_capacity = user_capacity
+        self.channel_capacity = channel_capacity
+
+        self.users: OrderedDict[tuple[int, int], UserActivity] = OrderedDict()
+        self.channels: OrderedDict[int, ChannelActivity] = OrderedDict()
+        self.joins: dict[int, Ring] = {}
+
+    def _user(self, rules: SpamRules, guild_id: int, user_id: int) -> UserActivity:
+        key = (guild_id, user_id)
+        state = self.users.get(key)
+        if state is None or state.rules is not rules:
+            state = self.users[key] = UserActivity(rules)
+            if len(self.users) > self.user_capacity:
+                self.users.popitem(last=False)
+        else:
+            self.users.move_to_end(key)
+        return state
+
+    def _channel(self, rules: SpamRules, channel_id: int) -> ChannelActivity:
+        state = self.channels.get(channel_id)
+        if state is None or state.rules is not rules:
+            state = self.channels[channel_id] = ChannelActivity(rules)
+            if len(self.channels) > self.channel_capacity:
+                self.channels.popitem(last=False)
+        else:
+            self.channels.move_to_end(channel_id)
+        return state
+
+    def message(
+        self,
+        rules: SpamRules,
+        guild_id: int,
+        channel_id: int,
+        user_id: int,
+        message_id: int,
+        content: str,
+        mentions: int,
+        now: float
+    ) -> Hit | None:
+        user = self._user(rules, guild_id, user_id)
+        channel = self._channel(rules, channel_id)
+
+        user.times.push(now)
+        user.recent.push((now, channel_id, message_id))
+        channel.times.push(now)
+
+        digest = fingerprint(content, rules.duplicate_min_length) if content else None
+        if digest is not None:
+            user.hashes.push((digest, now))
+            channel.hashes.push((digest, now, user_id, message_id))
+
+        kind = None
+        if mentions >= rules.mentions:
+            kind = "mentions"
+        elif (oldest := user.times.oldest()) is not None and now - oldest <= rules.window:
+            kind = "rate"
+        elif digest is not None and self._repeated(user.hashes, digest, now, rules.window):
+            kind = "duplicate"
+
+        if kind:
+            recent = [(c, m) for sent, c, m in user.recent if now - sent <= rules.window]
+            hit = Hit(kind, guild_id, channel_id, (user_id,), recent)
+            user.times.clear()
+            user.recent.clear()
+            user.hashes.clear()
+            return hit
+
+        if digest is not None:
+            hit = self._copypasta(channel, guild_id, channel_id, digest, now)
+            if hit:
+                return hit
+
+        oldest = channel.times.oldest()
+        if oldest is not None and now - oldest <= rules.window:
+            channel.times.clear()
+            return Hit("flood", guild_id, channel_id)
+
+        return None
+
+    def _repeated(self, hashes: Ring, digest: int, now: float, window: float) -> bool:
+        # Every slot holds this text, all within the window
+        return all(
+            entry is not None and entry[0] == digest and now - entry[1] <= window
+            for entry in hashes.items
+        )
+
+    def _copypasta(self, channel: ChannelActivity, guild_id: int, channel_id: int, digest: int, now: float) -> Hit | None:
+        rules = channel.rules
+        matches = [
+            (user_id, message_id) for entry_digest, sent, user_id, message_id in channel.hashes
+            if entry_digest == digest and now - sent <= rules.window
+        ]
+        user_ids = {user_id for user_id, _ in matches}
+        if len(matches) < rules.duplicates or len(user_ids) < 2:
+            return None
+
+        channel.hashes.clear()
+        return Hit("copypasta", guild_id, channel_id, user_ids, ((channel_id, m) for _, m in matches))
+
+    def join(self, rules: SpamRules, guild_id: int, now: float) -> Hit | None:
+        ring = self.joins.get(guild_id)
+        if ring is None or len(ring.items) != rules.raid_joins:
+            ring = self.joins[guild_id] = Ring(rules.raid_joins)
+
+        ring.push(now)
+        oldest = ring.oldest()
+        if oldest is not None and now - oldest <= rules.raid_window:
+            ring.clear()
+            return Hit("raid", guild_id)
+        return None
@@ -0,0 +1,185 @@
+import asyncio
+import fnmatch
+import logging
+import re
+import time
+from datetime import timedelta
+from typing import Awaitable, Callable
+
+import discord
+
+from core.rest_scheduler import Priority, RestScheduler
+
+log = logging.getLogger(__name__)
+
+# Snowflakes in free text: plain IDs, mentions, pasted lists
+ID_PATTERN = re.compile(r"\d{15,20}")
+
+QUERY_CHUNK = 100       # user_ids per gateway member query
+BULK_BAN_CHUNK = 200    # users per bulk-ban request
+
+# ---------- TARGETS ----------
+
+def parse_ids(text: str | None) -> list[int]:
+    ids = dict.fromkeys(int(match) for match in ID_PATTERN.findall(text or ""))
+    return list(ids)
+
+
+async def resolve_ids(guild: discord.Guild, ids: list[int]) -> tuple[list[discord.Member], list[int]]:
+    """Members for ``ids`` (cache first, then a gateway query) and the IDs not in the guild."""
+    members = {}
+    missing = []
+    for user_id in ids:
+        member = guild.get_member(user_id)
+        if member is None:
+            missing.append(user_id)
+        else:
+            members[user_id] = member
+
+    for start in range(0, len(missing), QUERY_CHUNK):
+        found = await guild.query_members(user_ids=missing[start:start + QUERY_CHUNK], limit=QUERY_CHUNK, cache=False)
+        members.update((member.id, member) for member in found)
+
+    return list(members.values()), [user_id for user_id in ids if user_id not in members]
+
+
+async def match_members(
+    guild: discord.Guild,
+    joined_within: timedelta | None = None,
+    name_pattern: str | None = None
+) -> list[discord.Member]:
+    """Members who joined within the window and/or whose name matches the glob pattern."""
+    # Without a full member cache the list has to come from the gateway.
+    members = guild.members if guild.chunked else await guild.chunk(cache=False)
+
+    if joined_within is not None:
+        since = discord.utils.utcnow() - joined_within
+        members = [m for m in members if m.joined_at and m.joined_at >= since]
+
+    if name_pattern:
+        pattern = name_pattern.lower()
+        members = [
+            m for m in members
+            if any(fnmatch.fnmatchcase(name.lower(), pattern) for name in {m.name, m.display_name})
+        ]
+
+    return members
+
+# ---------- EXECUTION ----------
+
+class BulkResult:
+    def __init__(self, total: int):
+        self.total = total
+        self.succeeded: list[int] = []
+        self.failed: dict[int, str] = {}
+
+    @property
+    def done(self) -> int:
+        return len(self.succeeded) + len(self.failed)
+
+    def ok(self, user_id: int):
+        self.succeeded.append(user_id)
+
+    def fail(self, user_id: int, reason: str):
+        self.failed[user_id] = reason
+
+
+def failure_reason(error: discord.HTTPException) -> str:
+    if isinstance(error, discord.Forbidden):
+        return "missing permissions"
+    if isinstance(error, discord.NotFound):
+        return "not found"
+    return error.text or f"HTTP {error.status}"
+
+
+async def run_bulk(
+    targets: list[discord.abc.Snowflake],
+    action: Callable[[discord.abc.Snowflake], Awaitable],
+    result: BulkResult,
+    concurrency: int = 5,
+    progress: Callable[[BulkResult], None] | None = None
+):
+    """Run ``action`` for every target, at most ``concurrency`` at a time.
+
+    A failing target is recorded in ``result`` and the rest carry on.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(target):
+        async with semaphore:
+            try:
+                await action(target)
+            except discord.HTTPException as error:
+                result.fail(target.id, failure_reason(error))
+            else:
+                result.ok(target.id)
+        if progress:
+            progress(result)
+
+    await asyncio.gather(*(one(target) for target in targets))
+
+
+class ProgressReporter:
+    """Throttled progress edits of an interaction's response, then a final one.
+
+    Called with anything (the result or job being reported on); at most
+    one edit per ``interval`` is queued. :meth:`finish` stops reporting
+    and waits for progress edits still queued or running before sending
+    the final embed, so a stale progress edit can't land on top of it.
+    """
+
+    def __init__(self, rest: RestScheduler, interaction: discord.Interaction, title: str, describe: Callable[[], str], interval: float = 2.0):
+        self.rest = rest
+        self.interaction = interaction
+        self.title = title
+        self.describe = describe
+        self.interval = interval
+
+        self._last = time.monotonic()
+        self._pending: set[asyncio.Task] = set()
+        self._finished = False
+
+    def _edit(self, embed: discord.Embed) -> Awaitable:
+        # Keyed, so a slow edit is replaced by the next one instead of piling up
+        return self.rest.submit(
+            Priority.INTERACTION,
+            lambda: self.interaction.edit_original_response(embed=embed),
+            key=f"progress:{self.interaction.id}"
+        )
+
+    def __call__(self, *_):
+        now = time.monotonic()
+        # The response can't be edited once the interaction token expires
+        if self._finished or now - self._last < self.interval or self.interaction.is_expired():
+            return
+        self._last = now
+
+        embed = discord.Embed(title=self.title, description=f"⏳ {self.describe()}", color=discord.Color.blurple())
+        task = asyncio.create_task(self._edit(embed))
+        self._pending.add(task)
+        task.add_done_callback(self._done)
+
+    def _done(self, task: asyncio.Task):
+        self._pending.discard(task)
+        if not task.cancelled() and task.exception():
+            log.warning("Progress edit for interaction %s failed", self.interaction.id, exc_info=task.exception())
+
+    async def finish(self, embed: discord.Embed):
+        self._finished = True
+        if self._pending:
+            await asyncio.wait(set(self._pending))
+        if not self.interaction.is_expired():
+            await self._edit(embed)
+
+
+def format_failures(failed: dict[int, str], limit: int = 1024) -> str:
+    """``failed`` as one "`id` - reason" line each, cut to fit an embed field."""
+    lines, size = [], 0
+    for index, (user_id, reason) in enumerate(failed.items()):
+        line = f"`{user_id}` — {reason}"
+        if size + len(line) + 1 > limit - 20:
+            lines.append(f"…and {len(failed) - index} more")
+            break
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
@@ -0,0 +1,177 @@
+import asyncio
+import logging
+import time
+
+from core.database import Database
+
+log = logging.getLogger(__name__)
+
+# Every lookup is "newest first" under one of three prefixes; each index
+# ends in created_at (plus the implicit rowid), so a page is a single
+# index range scan with no sort, however many cases a guild has.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS mod_cases (
+    id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    action TEXT NOT NULL,
+    target_id INTEGER,
+    moderator_id INTEGER NOT NULL,
+    reason TEXT,
+    duration_seconds INTEGER,
+    created_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS mod_cases_target ON mod_cases (guild_id, target_id, created_at);
+CREATE INDEX IF NOT EXISTS mod_cases_moderator ON mod_cases (guild_id, moderator_id, created_at);
+CREATE INDEX IF NOT EXISTS mod_cases_time ON mod_cases (guild_id, created_at);
+"""
+
+COLUMNS = "id, guild_id, action, target_id, moderator_id, reason, duration_seconds, created_at"
+
+# ---------- RECORDS ----------
+
+class Case:
+    __slots__ = ("id", "guild_id", "action", "target_id", "moderator_id", "reason", "duration_seconds", "created_at")
+
+    def __init__(self, id, guild_id, action, target_id, moderator_id, reason, duration_seconds, created_at):
+        self.id = id
+        self.guild_id = guild_id
+        self.action = action
+        self.target_id = target_id
+        self.moderator_id = moderator_id
+        self.reason = reason
+        self.duration_seconds = duration_seconds
+        self.created_at = created_at
+
+# ---------- STORE ----------
+
+class CaseStore:
+    """Moderation cases persisted to SQLite.
+
+    :meth:`record` only queues the case; a background task inserts the
+    queue in one transaction every ``flush_interval`` seconds (or sooner
+    once ``max_batch`` is hit). Reads flush first, so a case shows up in
+    /modlogs as soon as the action that created it returns.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0, max_batch: int = 500):
+        self.db = Database(path)
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self._pending: list[tuple] = []
+        self._wakeup = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+
+    # ---------- LIFECYCLE ----------
+
+    async def open(self):
+        await self.db.open()
+        await self.db.executescript(SCHEMA)
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        await self.flush()
+        await self.db.close()
+
+    # ---------- WRITES ----------
+
+    def record(
+        self,
+        guild_id: int,
+        action: str,
+        target_id: int | None,
+        moderator_id: int,
+        reason: str | None = None,
+        duration_seconds: int | None = None
+    ):
+        self._pending.append((guild_id, action, target_id, moderator_id, reason, duration_seconds, time.time()))
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Failed to flush moderation cases, retrying next cycle")
+
+    async def flush(self):
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+
+        def write(conn):
+            conn.executemany(
+                "INSERT INTO mod_cases "
+                "(guild_id, action, target_id, moderator_id, reason, duration_seconds, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                batch
+            )
+
+        try:
+            await self.db.transaction(write)
+        except Exception:
+            self._pending[:0] = batch
+            raise
+
+    # ---------- READS ----------
+
+    async def page(
+        self,
+        guild_id: int,
+        *,
+        target_id: int | None = None,
+        moderator_id: int | None = None,
+        since: float | None = None,
+        after: tuple[float, int] | None = None,
+        limit: int = 10
+    ) -> list[Case]:
+        """Newest cases first, continuing after the ``(created_at, id)`` cursor ``after``.
+
+        Keyset pagination: page N costs the same as page 1.
+        """
+        await self.flush()
+
+        where, params = ["guild_id = ?"], [guild_id]
+        if target_id is not None:
+            where.append("target_id = ?")
+            params.append(target_id)
+        if moderator_id is not None:
+            where.append("moderator_id = ?")
+            params.append(moderator_id)
+        if since is not None:
+            where.append("created_at >= ?")
+            params.append(since)
+        if after is not None:
+            where.append("(created_at, id) < (?, ?)")
+            params.extend(after)
+
+        rows = await self.db.fetchall(
+            f"SELECT {COLUMNS} FROM mod_cases WHERE {' AND '.join(where)} ORDER BY created_at DESC, id DESC LIMIT ?",
+            (*params, limit)
+        )
+        return [Case(*row) for row in rows]
+
+    async def count(self, guild_id: int, target_id: int) -> int:
+        await self.flush()
+        row = await self.db.fetchone(
+            "SELECT COUNT(*) FROM mod_cases WHERE guild_id = ? AND target_id = ?",
+            (guild_id, target_id)
+        )
+        return row[0]
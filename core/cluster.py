@@ -0,0 +1,148 @@
+import asyncio
+import itertools
+import json
+import logging
+from typing import Callable
+
+log = logging.getLogger(__name__)
+
+# Wire format: one JSON object per line. Every connection starts with
+# {"op": "hello", "cluster": <id>, "secret": <secret>}; requests carry an
+# "id" that the hub echoes back in its reply.
+
+# ---------- SHARD PLANNING ----------
+
+def plan_clusters(shard_count: int, clusters: int) -> list[list[int]]:
+    """Split shard IDs 0..shard_count-1 into contiguous, near-equal ranges."""
+    clusters = max(1, min(clusters, shard_count))
+    size, extra = divmod(shard_count, clusters)
+    ranges, start = [], 0
+    for index in range(clusters):
+        end = start + size + (1 if index < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+# ---------- HUB (LAUNCHER SIDE) ----------
+
+class ClusterHub:
+    """Local IPC server run by the launcher; clusters report and query through it."""
+
+    def __init__(self, secret: str, host: str = "127.0.0.1", port: int = 0):
+        self.secret = secret
+        self.host = host
+        self.port = port
+        self.stats: dict[int, dict] = {}
+        self._server: asyncio.base_events.Server | None = None
+
+    async def start(self) -> tuple[str, int]:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self.host, self.port
+
+    async def close(self):
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def totals(self) -> dict:
+        """Counts summed over every cluster.
+
+        ``users`` is an upper bound: each cluster deduplicates only its
+        own members, so someone in servers on two clusters counts twice.
+        """
+        return {
+            "clusters": len(self.stats),
+            "shards": sum(s.get("shards", 0) for s in self.stats.values()),
+            "guilds": sum(s.get("guilds", 0) for s in self.stats.values()),
+            "users": sum(s.get("users", 0) for s in self.stats.values()),
+        }
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        cluster = None
+        try:
+            hello = json.loads(await reader.readline() or b"{}")
+            if hello.get("op") != "hello" or hello.get("secret") != self.secret:
+                return
+            cluster = hello["cluster"]
+
+            while line := await reader.readline():
+                message = json.loads(line)
+                op = message.get("op")
+
+                if op == "stats":
+                    self.stats[cluster] = message["stats"]
+                elif op == "totals":
+                    reply = {"id": message.get("id"), "data": self.totals()}
+                    writer.write(json.dumps(reply).encode() + b"\n")
+                    await writer.drain()
+        except (ConnectionError, ValueError, KeyError):
+            log.warning("Dropped IPC connection from cluster %s", cluster)
+        finally:
+            if cluster is not None:
+                self.stats.pop(cluster, None)
+            writer.close()
+
+# ---------- CLIENT (CLUSTER SIDE) ----------
+
+class ClusterClient:
+    """Connection from one cluster process to the launcher's hub."""
+
+    def __init__(self, cluster_id: int, host: str, port: int, secret: str, report_interval: float = 15.0):
+        self.cluster_id = cluster_id
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.report_interval = report_interval
+
+        self._writer: asyncio.StreamWriter | None = None
+        self._replies: dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+        self._tasks: list[asyncio.Task] = []
+
+    async def connect(self, stats: Callable[[], dict]):
+        reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        await self._send({"op": "hello", "cluster": self.cluster_id, "secret": self.secret})
+        self._tasks = [
+            asyncio.create_task(self._read(reader)),
+            asyncio.create_task(self._report(stats)),
+        ]
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        if self._writer:
+            self._writer.close()
+
+    async def _send(self, message: dict):
+        self._writer.write(json.dumps(message).encode() + b"\n")
+        await self._writer.drain()
+
+    async def _read(self, reader: asyncio.StreamReader):
+        while line := await reader.readline():
+            message = json.loads(line)
+            future = self._replies.pop(message.get("id"), None)
+            if future and not future.done():
+                future.set_result(message["data"])
+
+    async def _report(self, stats: Callable[[], dict]):
+        while True:
+            try:
+                await self.report(stats())
+            except ConnectionError:
+                log.warning("Cluster %s lost its IPC connection", self.cluster_id)
+                return
+            await asyncio.sleep(self.report_interval)
+
+    async def report(self, stats: dict):
+        await self._send({"op": "stats", "stats": stats})
+
+    async def totals(self, timeout: float = 2.0) -> dict:
+        """Guild/user/shard counts summed over every connected cluster."""
+        request_id = next(self._ids)
+        future = self._replies[request_id] = asyncio.get_running_loop().create_future()
+        try:
+            await self._send({"op": "totals", "id": request_id})
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self._replies.pop(request_id, None)
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import logging
+import os
+import time
+
+import discord
+from discord import app_commands
+
+log = logging.getLogger(__name__)
+
+# ---------- FINGERPRINT ----------
+
+def _checks(command) -> list[str]:
+    names = [getattr(check, "__qualname__", repr(check)) for check in getattr(command, "checks", [])]
+    if isinstance(command, app_commands.Group):
+        for child in command.walk_commands():
+            names += [f"{child.qualified_name}:{name}" for name in _checks(child)]
+    return names
+
+
+def tree_fingerprint(tree: app_commands.CommandTree, guild: discord.abc.Snowflake | None = None) -> str:
+    """SHA-256 over everything that defines the synced command tree.
+
+    Covers the payload Discord receives (names, descriptions, parameters,
+    permissions, localisations) plus the local checks on each command.
+    Commands are sorted so registration order does not matter.
+    """
+    payload = sorted(
+        (
+            {"command": command.to_dict(tree), "checks": _checks(command)}
+            for command in tree.get_commands(guild=guild)
+        ),
+        key=lambda entry: (entry["command"].get("type", 1), entry["command"]["name"])
+    )
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+# ---------- SYNC ----------
+
+class CommandSync:
+    """Syncs the command tree only when its fingerprint changed since the last sync."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _load(self) -> dict[str, str]:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, fingerprints: dict[str, str]):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(fingerprints, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    async def sync(self, tree: app_commands.CommandTree, guild: discord.abc.Snowflake | None = None, force: bool = False) -> bool:
+        """Returns True if a sync request was sent to Discord."""
+        scope = f"guild:{guild.id}" if guild else "global"
+        fingerprint = tree_fingerprint(tree, guild=guild)
+        fingerprints = self._load()
+
+        if not force and fingerprints.get(scope) == fingerprint:
+            log.info("Slash commands unchanged for %s (%s), skipping sync", scope, fingerprint[:12])
+            return False
+
+        started = time.perf_counter()
+        await tree.sync(guild=guild)
+        log.info(
+            "Slash commands synced for %s in %.2fs (%s%s)",
+            scope,
+            time.perf_counter() - started,
+            fingerprint[:12],
+            ", forced" if force else ""
+        )
+
+        fingerprints[scope] = fingerprint
+        self._save(fingerprints)
+        return True
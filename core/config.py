@@ -0,0 +1,201 @@
+import asyncio
+import dataclasses
+import json
+import logging
+import os
+from dataclasses import dataclass
+from typing import Callable
+
+import discord
+from discord import app_commands
+
+log = logging.getLogger(__name__)
+
+# ---------- SCHEMA ----------
+
+@dataclass(frozen=True)
+class GuildConfig:
+    staff_role_id: int | None = None
+    mod_log_channel_id: int | None = None
+    # Post mod-log entries through this webhook instead of as the bot
+    mod_log_webhook_url: str | None = None
+    qa_channel_id: int | None = None
+    # Q&A threads idle this many days are swept ("archive" closes them,
+    # "tag" prefixes the name with 💤 and leaves them open); 0 disables.
+    qa_stale_days: float = 7.0
+    qa_stale_action: str = "archive"
+    suggestion_channel_id: int | None = None
+    # "add" adds each staff member to a suggestion's staff thread,
+    # "mention" pings the staff role once and lets Discord add them.
+    staff_thread_mode: str = "add"
+    staff_fanout_concurrency: int = 5
+    # /bulk commands: parallel actions and the most members one run may hit.
+    # Actions share the guild's REST route, so rest_route_limit caps the first.
+    bulk_action_concurrency: int = 5
+    bulk_action_limit: int = 1000
+    # Anti-spam (core/antispam.py). Windows are in seconds; actions are
+    # comma-separated: "timeout", "purge" for spammers, "lockdown" or
+    # "slowmode" for a flooded channel, "lockdown" for a join raid.
+    # Repeated-text hits (duplicate, copypasta) use their own actions,
+    # purge-only by default, and ignore messages shorter than
+    # antispam_duplicate_min_length characters.
+    antispam_enabled: bool = False
+    antispam_messages: int = 6
+    antispam_window_seconds: float = 5.0
+    antispam_duplicates: int = 3
+    antispam_duplicate_min_length: int = 12
+    antispam_mentions: int = 8
+    antispam_channel_messages: int = 40
+    antispam_raid_joins: int = 10
+    antispam_raid_window_seconds: float = 10.0
+    antispam_actions: str = "timeout,purge"
+    antispam_duplicate_actions: str = "purge"
+    antispam_flood_action: str = "slowmode"
+    antispam_raid_action: str = "lockdown"
+    antispam_timeout_minutes: int = 10
+    antispam_lockdown_minutes: int = 10
+
+
+@dataclass(frozen=True)
+class BotSettings:
+    database_path: str = "data/horizon.db"
+    vote_edit_window_seconds: float = 2.0
+    mod_log_window_seconds: float = 2.0
+    # Most REST writes running at once on one channel or guild route
+    rest_route_limit: int = 2
+    # Stale Q&A thread sweeper: how often it runs and how many threads
+    # it edits at once before pausing
+    qa_sweep_interval_seconds: float = 3600.0
+    qa_sweep_batch_size: int = 10
+    # Prometheus endpoint at http://<host>:<port>/metrics; off when no
+    # port is set. Clusters listen on port + cluster ID.
+    metrics_port: int | None = None
+    metrics_host: str = "127.0.0.1"
+    # Interactions nobody has responded to after this many seconds are
+    # deferred automatically (Discord fails them at 3s); 0 only measures
+    interaction_defer_seconds: float = 2.0
+    reload_interval_seconds: float = 5.0
+    # "full" caches every member; "lean" keeps staff plus the most
+    # recently active members (see core/member_cache.py). Needs a restart.
+    member_cache_policy: str = "full"
+    member_cache_size: int = 10_000
+
+
+def _build(cls, values: dict, where: str):
+    fields = {f.name for f in dataclasses.fields(cls)}
+    unknown = set(values) - fields
+    if unknown:
+        log.warning("Ignoring unknown config keys in %s: %s", where, ", ".join(sorted(unknown)))
+    return cls(**{k: v for k, v in values.items() if k in fields})
+
+# ---------- SERVICE ----------
+
+class ConfigService:
+    """``config.json`` parsed once, shared through ``bot.config``.
+
+    Top-level keys are bot settings and the defaults for every guild;
+    ``"guilds": {"<id>": {...}}`` overrides them per guild. The file is
+    re-read when its mtime changes; a bad edit is logged and the last
+    good config stays active.
+    """
+
+    def __init__(self, path: str = "config.json"):
+        self.path = path
+        self.settings = BotSettings()
+        self.default = GuildConfig()
+        self._guilds: dict[int, GuildConfig] = {}
+        self._mtime = 0.0
+        self._listeners: list[Callable[["ConfigService"], None]] = []
+        self._watcher: asyncio.Task | None = None
+
+        self.load()
+
+    # ---------- LOADING ----------
+
+    def load(self):
+        mtime = os.stat(self.path).st_mtime
+        with open(self.path, "r", encoding="utf-8") as f:
+            raw = json.load(f)
+
+        overrides = raw.pop("guilds", {})
+        raw.pop("guild_id", None)
+
+        setting_keys = {f.name for f in dataclasses.fields(BotSettings)}
+        settings = _build(BotSettings, {k: v for k, v in raw.items() if k in setting_keys}, self.path)
+        defaults = {k: v for k, v in raw.items() if k not in setting_keys}
+        default = _build(GuildConfig, defaults, self.path)
+
+        guilds = {
+            int(guild_id): _build(GuildConfig, {**defaults, **values}, f"guilds.{guild_id}")
+            for guild_id, values in overrides.items()
+        }
+
+        self.settings, self.default, self._guilds, self._mtime = settings, default, guilds, mtime
+
+    def maybe_reload(self) -> bool:
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            log.warning("Config file %s is missing, keeping the previous config", self.path)
+            return False
+
+        if mtime == self._mtime:
+            return False
+
+        try:
+            self.load()
+        except (OSError, ValueError, TypeError):
+            log.exception("Could not reload %s, keeping the previous config", self.path)
+            # Don't retry (and re-log) until the file changes again
+            self._mtime = mtime
+            return False
+
+        log.info("Reloaded %s (%s guild overrides)", self.path, len(self._guilds))
+        for listener in self._listeners:
+            listener(self)
+        return True
+
+    def on_reload(self, listener: Callable[["ConfigService"], None]):
+        self._listeners.append(listener)
+
+    # ---------- WATCHER ----------
+
+    def start(self):
+        if self._watcher is None:
+            self._watcher = asyncio.create_task(self._watch())
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(self.settings.reload_interval_seconds)
+            self.maybe_reload()
+
+    def close(self):
+        if self._watcher:
+            self._watcher.cancel()
+            self._watcher = None
+
+    # ---------- LOOKUP ----------
+
+    def guild(self, guild_id: int | None) -> GuildConfig:
+        return self._guilds.get(guild_id, self.default)
+
+# ---------- CHECKS ----------
+
+def is_staff(member: discord.abc.User, config: GuildConfig) -> bool:
+    return (
+        isinstance(member, discord.Member)
+        and config.staff_role_id is not None
+        and member.get_role(config.staff_role_id) is not None
+    )
+
+
+def has_staff_role():
+    """``app_commands.checks.has_role`` with the role looked up per guild at call time."""
+
+    async def predicate(interaction: discord.Interaction) -> bool:
+        config = interaction.client.config.guild(interaction.guild_id)
+        if is_staff(interaction.user, config):
+            return True
+        raise app_commands.MissingRole(config.staff_role_id)
+
+    return app_commands.check(predicate)
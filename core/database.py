@@ -0,0 +1,73 @@
+import asyncio
+import os
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+
+# ---------- DATABASE ----------
+
+class Database:
+    """SQLite connection in WAL mode, driven from a single worker thread.
+
+    Every call is shipped to one dedicated thread so the event loop never
+    blocks on disk I/O and the connection is never shared across threads.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite")
+        self._conn: sqlite3.Connection | None = None
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    # ---------- LIFECYCLE ----------
+
+    def _open(self):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        self._conn = conn
+
+    async def open(self):
+        if self._conn is None:
+            await self._run(self._open)
+
+    async def close(self):
+        if self._conn is not None:
+            await self._run(self._conn.close)
+            self._conn = None
+        self._executor.shutdown(wait=True)
+
+    # ---------- QUERIES ----------
+
+    async def execute(self, sql: str, params=()):
+        return await self._run(lambda: self._conn.execute(sql, params).rowcount)
+
+    async def executescript(self, script: str):
+        await self._run(self._conn.executescript, script)
+
+    async def fetchall(self, sql: str, params=()) -> list[tuple]:
+        return await self._run(lambda: self._conn.execute(sql, params).fetchall())
+
+    async def fetchone(self, sql: str, params=()) -> tuple | None:
+        return await self._run(lambda: self._conn.execute(sql, params).fetchone())
+
+    async def transaction(self, fn):
+        """Run ``fn(conn)`` inside a single BEGIN/COMMIT on the worker thread."""
+
+        def run():
+            self._conn.execute("BEGIN")
+            try:
+                result = fn(self._conn)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+            return result
+
+        return await self._run(run)
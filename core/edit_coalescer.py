@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from typing import Callable
+
+import discord
+
+from core.rest_scheduler import RestScheduler, Priority
+
+log = logging.getLogger(__name__)
+
+# ---------- EDIT COALESCER ----------
+
+class EditCoalescer:
+    """Collapses bursts of message edits into at most one per window.
+
+    The first update for an idle message is sent right away; anything that
+    arrives while the message is cooling down only marks it dirty, and one
+    edit with the latest rendered state is sent when the window ends.
+    """
+
+    def __init__(self, rest: RestScheduler, window: float = 2.0):
+        self.rest = rest
+        self.window = window
+
+        self._dirty: dict[int, tuple[discord.Message, Callable[[], dict]]] = {}
+        self._tasks: dict[int, asyncio.Task] = {}
+        # message ID -> set once the edit being sent to it has finished
+        self._sending: dict[int, asyncio.Event] = {}
+
+        self.votes_received = 0
+        self.edits_sent = 0
+
+    @property
+    def edits_saved(self) -> int:
+        return self.votes_received - self.edits_sent - len(self._dirty)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "votes_received": self.votes_received,
+            "edits_sent": self.edits_sent,
+            "edits_saved": self.edits_saved,
+            "pending": len(self._dirty),
+        }
+
+    def submit(self, message: discord.Message, render: Callable[[], dict]):
+        """Queue an edit; ``render`` is called at flush time for edit kwargs."""
+        self.votes_received += 1
+        self._dirty[message.id] = (message, render)
+
+        if message.id not in self._tasks:
+            self._tasks[message.id] = asyncio.create_task(self._run(message.id))
+
+    async def discard(self, message_id: int):
+        """Drop a pending edit, e.g. when the message is about to be replaced.
+
+        An edit that is already being sent cannot be recalled, so this
+        waits for it to land; a replacement written afterwards is then
+        never overwritten by a stale vote edit.
+        """
+        self._dirty.pop(message_id, None)
+        self.rest.cancel(f"edit:{message_id}")
+        sending = self._sending.get(message_id)
+        if sending is not None:
+            await sending.wait()
+
+    async def _edit(self, message: discord.Message, render: Callable[[], dict]):
+        kwargs = render()
+
+        async def edit():
+            sending = self._sending[message.id] = asyncio.Event()
+            try:
+                # Counted here rather than after submit(): a write that was
+                # merged, dropped or cancelled in the queue never runs.
+                result = await message.edit(**kwargs)
+                self.edits_sent += 1
+                return result
+            finally:
+                sending.set()
+                if self._sending.get(message.id) is sending:
+                    del self._sending[message.id]
+
+        try:
+            # Keyed per message, so a queued edit is replaced by a newer one.
+            await self.rest.submit(
+                Priority.COSMETIC,
+                edit,
+                route=f"channel:{message.channel.id}",
+                key=f"edit:{message.id}"
+            )
+        except discord.HTTPException:
+            log.exception("Coalesced edit of message %s failed", message.id)
+
+    async def _run(self, message_id: int):
+        try:
+            while message_id in self._dirty:
+                await self._edit(*self._dirty.pop(message_id))
+                await asyncio.sleep(self.window)
+        finally:
+            self._tasks.pop(message_id, None)
+
+    async def close(self):
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+        pending, self._dirty = self._dirty, {}
+        for message, render in pending.values():
+            await self._edit(message, render)
@@ -0,0 +1,122 @@
+import asyncio
+import contextvars
+import logging
+import time
+from contextlib import contextmanager
+
+from discord.ext import commands
+
+log = logging.getLogger(__name__)
+
+# Extension whose load is running in the current task, for timing attribution.
+current_extension: contextvars.ContextVar[str | None] = contextvars.ContextVar("current_extension", default=None)
+
+# ---------- TIMINGS ----------
+
+class ExtensionTiming:
+    __slots__ = ("name", "total", "setup", "views", "lazy")
+
+    def __init__(self, name: str, lazy: bool = False):
+        self.name = name
+        self.total = 0.0
+        self.setup = 0.0
+        self.views = 0.0
+        self.lazy = lazy
+
+    @property
+    def imports(self) -> float:
+        # load_extension = module import + setup(); setup() is what add_cog measured.
+        return max(self.total - self.setup, 0.0)
+
+# ---------- LOADER ----------
+
+class ExtensionLoader:
+    """Loads extensions concurrently in dependency order and times each one.
+
+    ``extensions`` maps an extension to the extensions it needs loaded
+    first; everything whose dependencies are met loads in the same wave.
+    ``lazy`` extensions are skipped at startup and loaded the first time
+    an unknown prefix command is invoked, so they must not define app
+    commands (those have to exist before the tree is synced).
+    """
+
+    def __init__(self, bot: commands.Bot, extensions: dict[str, tuple[str, ...]], lazy: tuple[str, ...] = ()):
+        self.bot = bot
+        self.extensions = extensions
+        self.pending_lazy = [name for name in lazy if name in extensions]
+        self.timings: dict[str, ExtensionTiming] = {}
+        self._lazy_lock = asyncio.Lock()
+
+    # ---------- MEASUREMENT ----------
+
+    @contextmanager
+    def measure(self, phase: str):
+        """Attribute the time spent in the block to the extension being loaded."""
+        name = current_extension.get()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if name in self.timings:
+                timing = self.timings[name]
+                setattr(timing, phase, getattr(timing, phase) + time.perf_counter() - started)
+
+    async def _load(self, name: str, lazy: bool = False):
+        current_extension.set(name)
+        timing = self.timings[name] = ExtensionTiming(name, lazy)
+
+        started = time.perf_counter()
+        await self.bot.load_extension(name)
+        timing.total = time.perf_counter() - started
+
+        metrics = getattr(self.bot, "metrics", None)
+        if metrics:
+            metrics.observe(f"startup.extension.{name}", timing.total)
+
+    # ---------- LOADING ----------
+
+    async def load_all(self):
+        remaining = {
+            name: set(deps)
+            for name, deps in self.extensions.items()
+            if name not in self.pending_lazy
+        }
+        loaded: set[str] = set()
+
+        while remaining:
+            wave = [name for name, deps in remaining.items() if deps <= loaded]
+            if not wave:
+                raise RuntimeError(f"Unresolvable extension dependencies: {sorted(remaining)}")
+
+            # Each load runs in its own task, so current_extension stays per-extension.
+            await asyncio.gather(*(self._load(name) for name in wave))
+
+            loaded.update(wave)
+            for name in wave:
+                del remaining[name]
+
+    async def load_lazy(self) -> bool:
+        """Load every pending lazy extension; returns True if any were loaded."""
+        async with self._lazy_lock:
+            if not self.pending_lazy:
+                return False
+
+            pending, self.pending_lazy = self.pending_lazy, []
+            await asyncio.gather(*(self._load(name, lazy=True) for name in pending))
+            log.info("Lazily loaded %s\n%s", ", ".join(pending), self.table(pending))
+            return True
+
+    # ---------- REPORT ----------
+
+    def table(self, names=None) -> str:
+        rows = [self.timings[name] for name in (names or self.timings) if name in self.timings]
+        lines = [f"{'extension':<22}{'import':>10}{'setup':>10}{'views':>10}{'total':>10}"]
+        for t in sorted(rows, key=lambda t: t.total, reverse=True):
+            lines.append(
+                f"{t.name + (' (lazy)' if t.lazy else ''):<22}"
+                f"{t.imports * 1000:>8.1f}ms"
+                f"{(t.setup - t.views) * 1000:>8.1f}ms"
+                f"{t.views * 1000:>8.1f}ms"
+                f"{t.total * 1000:>8.1f}ms"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import time
+
+import discord
+
+from core.metrics import Metrics, interaction_label
+
+log = logging.getLogger(__name__)
+
+# Discord drops an interaction that is not acknowledged within 3 seconds
+# of being created; an acknowledgement later than this counts as a close call.
+CLOSE_CALL = 1.5
+
+# "Unknown interaction": the acknowledgement window had already closed
+UNKNOWN_INTERACTION = 10062
+
+TRACKED = (
+    discord.InteractionType.application_command,
+    discord.InteractionType.component,
+    discord.InteractionType.modal_submit,
+)
+
+# Private discord.py state this module relies on, checked against 2.4-2.7:
+# the lazily built interaction.response slot and the ViewStore's lookup
+# tables. If an upgrade renames them, interactions are measured only.
+RESPONSE_SLOT = "_cs_response"
+VIEW_STORE_TABLES = ("_views", "_modals", "_dynamic_items")
+
+# Slash commands whose replies are public set extras={"public": True}
+# so an automatic defer does not turn them ephemeral
+PUBLIC = "public"
+
+# ---------- RESPONSE ----------
+
+class DeadlineResponse(discord.InteractionResponse):
+    """``interaction.response`` that defers by itself when the handler is slow.
+
+    If nothing has started responding ``budget`` seconds after receipt,
+    the interaction is deferred: "thinking" for commands, a silent
+    update for components and modals. Whatever the handler sends
+    afterwards is turned into the matching follow-up call, so handlers
+    need no changes: ``send_message`` becomes a follow-up,
+    ``edit_message`` edits the original response and ``defer`` does
+    nothing.
+
+    A command's deferred "thinking" message is what its first follow-up
+    replaces, so its visibility is fixed by the defer: ephemeral unless
+    the command sets ``extras={"public": True}``. A public reply from a
+    command without it arrives ephemeral once deferred. Components and
+    modals keep whatever visibility each follow-up asks for.
+    """
+
+    __slots__ = ("_tracker", "_timer", "_claimed", "_auto_deferred", "_deferring")
+
+    def __init__(self, parent: discord.Interaction, tracker: "DeadlineTracker"):
+        super().__init__(parent)
+        self._tracker = tracker
+        self._timer: asyncio.TimerHandle | None = None
+        self._claimed = False
+        self._auto_deferred = False
+        self._deferring: asyncio.Task | None = None
+
+    # ---------- DEADLINE ----------
+
+    def _expire(self):
+        self._timer = None
+        if self._claimed or self.is_done():
+            return
+        self._claimed = True
+        self._deferring = asyncio.create_task(self._auto_defer())
+
+    async def _auto_defer(self):
+        parent = self._parent
+        try:
+            if parent.type is discord.InteractionType.application_command:
+                public = parent.command is not None and parent.command.extras.get(PUBLIC, False)
+                await super().defer(ephemeral=not public, thinking=True)
+            else:
+                await super().defer(thinking=False)
+        except discord.NotFound as error:
+            if error.code == UNKNOWN_INTERACTION:
+                self._tracker.missed(parent)
+            return
+        except discord.HTTPException:
+            log.exception("Automatic defer of %s failed", interaction_label(parent))
+            return
+
+        self._auto_deferred = True
+        self._tracker.deferred(parent)
+
+    async def _claim(self) -> bool:
+        """True if the handler's call should be sent as is, False if it must become a follow-up."""
+        if self._deferring is not None:
+            await self._deferring
+        if self._auto_deferred:
+            return False
+
+        if not self._claimed:
+            self._claimed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._tracker.acknowledged(self._parent)
+        return True
+
+    async def _respond(self, call):
+        try:
+            return await call
+        except discord.NotFound as error:
+            if error.code == UNKNOWN_INTERACTION:
+                self._tracker.missed(self._parent)
+            raise
+
+    # ---------- RESPONSES ----------
+
+    async def send_message(self, content=None, *, delete_after: float | None = None, **kwargs):
+        if await self._claim():
+            return await self._respond(super().send_message(content, delete_after=delete_after, **kwargs))
+
+        message = await self._parent.followup.send(content, wait=True, **kwargs)
+        if delete_after is not None:
+            await message.delete(delay=delete_after)
+        return message
+
+    async def defer(self, **kwargs):
+        if await self._claim():
+            return await self._respond(super().defer(**kwargs))
+        return None
+
+    async def edit_message(self, *, delete_after: float | None = None, suppress_embeds: bool = False, **kwargs):
+        if await self._claim():
+            return await self._respond(
+                super().edit_message(delete_after=delete_after, suppress_embeds=suppress_embeds, **kwargs)
+            )
+
+        message = await self._parent.edit_original_response(**kwargs)
+        if delete_after is not None:
+            await message.delete(delay=delete_after)
+        return message
+
+    async def send_modal(self, modal):
+        if not await self._claim():
+            # A modal has to be the first response; too late once deferred
+            self._tracker.missed(self._parent)
+            raise discord.InteractionResponded(self._parent)
+        return await self._respond(super().send_modal(modal))
+
+# ---------- TRACKER ----------
+
+class DeadlineTracker:
+    """Installs a :class:`DeadlineResponse` on every incoming interaction.
+
+    :meth:`track` runs as the gateway event is parsed, before any
+    command or view callback, so the budget counts from receipt.
+    Interactions nothing is registered for (a removed command, a button
+    whose view has timed out) are left alone, so Discord still tells the
+    user the interaction failed instead of it being silently deferred. Per
+    command or component family it records the time to acknowledge
+    (``interaction.ack``), acknowledgements later than ``CLOSE_CALL``,
+    automatic defers and interactions that missed the window entirely.
+    """
+
+    def __init__(self, metrics: Metrics):
+        self.metrics = metrics
+        self.supported = RESPONSE_SLOT in getattr(discord.Interaction, "__slots__", ())
+        if not self.supported:
+            log.warning("discord.py %s has no Interaction.%s; interaction deadlines are not tracked",
+                        discord.__version__, RESPONSE_SLOT)
+        self._warned = False
+
+        metrics.describe("interaction.ack", "Time from receipt until the handler acknowledged")
+        metrics.describe("interaction.close_calls", f"Acknowledged by the handler more than {CLOSE_CALL:g}s after receipt")
+        metrics.describe("interaction.deferred", "Deferred automatically because the handler was too slow")
+        metrics.describe("interaction.missed", "Acknowledged too late: Discord had already failed the interaction")
+
+    def track(self, interaction: discord.Interaction, budget: float):
+        if not self.supported or interaction.type not in TRACKED:
+            return
+
+        handled = has_handler(interaction)
+        if handled is False:
+            return
+        if handled is None and not self._warned:
+            self._warned = True
+            log.warning("discord.py %s changed its ViewStore; interactions are measured but not auto-deferred",
+                        discord.__version__)
+
+        response = DeadlineResponse(interaction, self)
+        # discord.py builds interaction.response lazily into this slot
+        setattr(interaction, RESPONSE_SLOT, response)
+        if budget > 0 and handled:
+            response._timer = asyncio.get_running_loop().call_later(budget, response._expire)
+
+    def elapsed(self, interaction: discord.Interaction) -> float:
+        received = interaction.extras.get("received")
+        return time.perf_counter() - received if received is not None else 0.0
+
+    def acknowledged(self, interaction: discord.Interaction):
+        seconds = self.elapsed(interaction)
+        label = interaction_label(interaction)
+        self.metrics.histogram("interaction.ack", seconds, label)
+        if seconds >= CLOSE_CALL:
+            self.metrics.count("interaction.close_calls", label)
+
+    def deferred(self, interaction: discord.Interaction):
+        label = interaction_label(interaction)
+        self.metrics.histogram("interaction.ack", self.elapsed(interaction), label)
+        self.metrics.count("interaction.deferred", label)
+
+    def missed(self, interaction: discord.Interaction):
+        label = interaction_label(interaction)
+        self.metrics.count("interaction.missed", label)
+        log.warning("Interaction %s (%s) missed its acknowledgement window", interaction.id, label)
+
+
+def has_handler(interaction: discord.Interaction) -> bool | None:
+    """Whether discord.py has a command, view item or modal to run for this interaction.
+
+    None if this discord.py's ViewStore does not look the way it is
+    expected to, so the answer is unknown.
+    """
+    if interaction.type is discord.InteractionType.application_command:
+        return interaction.command is not None
+
+    data = interaction.data or {}
+    custom_id = data.get("custom_id", "")
+    store = getattr(getattr(interaction, "_state", None), "_view_store", None)
+    if store is None or not all(hasattr(store, table) for table in VIEW_STORE_TABLES):
+        return None
+    if interaction.type is discord.InteractionType.modal_submit:
+        return custom_id in store._modals
+
+    # Same lookups as ViewStore.dispatch_view
+    key = (data.get("component_type"), custom_id)
+    message = interaction.message
+    if message is not None and key in store._views.get(message.id, {}):
+        return True
+    if key in store._views.get(None, {}):
+        return True
+    return any(pattern.fullmatch(custom_id) for pattern in store._dynamic_items)
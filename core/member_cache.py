@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+import discord
+
+log = logging.getLogger(__name__)
+
+FULL = "full"
+LEAN = "lean"
+
+# ---------- POLICY ----------
+
+def cache_options(policy: str) -> dict:
+    """Client kwargs for a policy; "lean" turns off the library's own member caching."""
+    if policy == LEAN:
+        return {
+            "member_cache_flags": discord.MemberCacheFlags.none(),
+            "chunk_guilds_at_startup": False,
+        }
+    return {}
+
+
+class MemberCache:
+    """Decides which members stay in each guild's member cache.
+
+    In "full" mode this does nothing and discord.py caches everyone. In
+    "lean" mode the library caches nobody and this class fills the cache
+    itself with:
+
+    * staff -- members holding the guild's configured staff role, found
+      by one uncached chunk per guild the first time they are needed
+      (and again after ``staff_ttl``) or whenever they show up in events;
+    * recent -- the ``capacity`` most recently active members across all
+      guilds (message authors, interaction users), evicted LRU-first.
+
+    Everyone else is resolved on demand; the Member converters fall back
+    to a gateway query by ID when a member is not cached.
+    """
+
+    def __init__(self, bot, policy: str = FULL, capacity: int = 10_000, staff_ttl: float = 3600.0):
+        self.bot = bot
+        self.policy = policy
+        self.capacity = capacity
+        self.staff_ttl = staff_ttl
+
+        self.staff: dict[int, set[int]] = {}
+        self.recent: OrderedDict[tuple[int, int], None] = OrderedDict()
+        self._scanned: dict[int, float] = {}
+        self._locks: dict[int, asyncio.Lock] = {}
+
+    @property
+    def lean(self) -> bool:
+        return self.policy == LEAN
+
+    def install(self):
+        if not self.lean:
+            return
+        self.bot.add_listener(self.on_message)
+        self.bot.add_listener(self.on_interaction)
+        self.bot.add_listener(self.on_member_remove)
+        self.bot.config.on_reload(lambda config: self._scanned.clear())
+
+    # ---------- RETENTION ----------
+
+    def _is_staff(self, member: discord.Member) -> bool:
+        role_id = self.bot.config.guild(member.guild.id).staff_role_id
+        return role_id is not None and member.get_role(role_id) is not None
+
+    def _pinned(self, guild_id: int, user_id: int) -> bool:
+        return user_id in self.staff.get(guild_id, ()) or user_id == self.bot.user.id
+
+    def touch(self, member: discord.Member):
+        """Record activity for a member and keep it cached."""
+        if not self.lean or not isinstance(member, discord.Member) or not isinstance(member.guild, discord.Guild):
+            return
+
+        guild = member.guild
+        guild._add_member(member)
+
+        if self._is_staff(member):
+            self.staff.setdefault(guild.id, set()).add(member.id)
+            return
+        self.staff.get(guild.id, set()).discard(member.id)
+
+        key = (guild.id, member.id)
+        self.recent[key] = None
+        self.recent.move_to_end(key)
+
+        while len(self.recent) > self.capacity:
+            (guild_id, user_id), _ = self.recent.popitem(last=False)
+            self._evict(guild_id, user_id)
+
+    def _evict(self, guild_id: int, user_id: int):
+        if self._pinned(guild_id, user_id):
+            return
+        guild = self.bot.get_guild(guild_id)
+        if guild is not None:
+            guild._remove_member(discord.Object(id=user_id))
+
+    # ---------- LOOKUPS ----------
+
+    async def ensure_staff(self, guild: discord.Guild):
+        """Make sure the guild's staff are cached (so ``role.members`` is complete)."""
+        if not self.lean:
+            return
+
+        lock = self._locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            scanned = self._scanned.get(guild.id)
+            if scanned is not None and time.monotonic() - scanned < self.staff_ttl:
+                return
+
+            started = time.perf_counter()
+            members = await guild.chunk(cache=False)
+            staff = {member for member in members if self._is_staff(member)}
+            del members
+
+            for user_id in self.staff.get(guild.id, set()) - {m.id for m in staff}:
+                if (guild.id, user_id) not in self.recent:
+                    self._evict(guild.id, user_id)
+
+            self.staff[guild.id] = {member.id for member in staff}
+            for member in staff:
+                guild._add_member(member)
+
+            self._scanned[guild.id] = time.monotonic()
+            log.info(
+                "Cached %s staff in guild %s in %.2fs",
+                len(staff), guild.id, time.perf_counter() - started
+            )
+
+    # ---------- EVENTS ----------
+
+    async def on_message(self, message: discord.Message):
+        if message.guild and not message.author.bot:
+            self.touch(message.author)
+
+    async def on_interaction(self, interaction: discord.Interaction):
+        if interaction.guild:
+            self.touch(interaction.user)
+
+    async def on_member_remove(self, member: discord.Member):
+        self.staff.get(member.guild.id, set()).discard(member.id)
+        self.recent.pop((member.guild.id, member.id), None)
@@ -0,0 +1,284 @@
+import asyncio
+import logging
+import re
+import time
+from bisect import bisect_left
+from typing import Callable
+from urllib.parse import urlsplit
+
+import discord
+from aiohttp import web
+
+log = logging.getLogger(__name__)
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implied
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PREFIX = "horizon_"
+NAME_PATTERN = re.compile(r"[^a-zA-Z0-9_]")
+
+# ---------- METRICS ----------
+
+class Timing:
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+
+class Histogram:
+    __slots__ = ("counts", "total")
+
+    def __init__(self):
+        # One slot per bucket plus +Inf; cumulated only when rendered
+        self.counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.total += seconds
+
+
+class Metrics:
+    """In-process counters and timings shared by every cog via ``bot.metrics``.
+
+    Everything runs on the event loop thread, so recording is a dict
+    lookup and an integer add: no locks, no allocation once a series
+    exists. Labelled series (:meth:`count`, :meth:`histogram`) carry one
+    label whose key is set with :meth:`describe`. Values that already
+    live elsewhere (REST stats, gateway latency) are read at scrape time
+    through :meth:`register`.
+    """
+
+    def __init__(self):
+        self.counters: dict[str, int] = {}
+        self.timings: dict[str, Timing] = {}
+        self.labelled: dict[tuple[str, str], int] = {}
+        self.histograms: dict[tuple[str, str | None], Histogram] = {}
+        self.collectors: dict[str, tuple[str, Callable[[], float | dict[str, float]]]] = {}
+        self.descriptions: dict[str, tuple[str, str]] = {}
+
+    def incr(self, name: str, value: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float):
+        timing = self.timings.get(name)
+        if timing is None:
+            timing = self.timings[name] = Timing()
+        timing.observe(seconds)
+
+    def count(self, name: str, label: str, value: int = 1):
+        key = (name, label)
+        self.labelled[key] = self.labelled.get(key, 0) + value
+
+    def histogram(self, name: str, seconds: float, label: str | None = None):
+        histogram = self.histograms.get((name, label))
+        if histogram is None:
+            histogram = self.histograms[(name, label)] = Histogram()
+        histogram.observe(seconds)
+
+    def register(self, name: str, collect: Callable[[], float | dict[str, float]], kind: str = "gauge"):
+        """Read ``collect()`` at scrape time; a dict gives one series per label."""
+        self.collectors[name] = (kind, collect)
+
+    def describe(self, name: str, text: str, label: str = "name"):
+        self.descriptions[name] = (text, label)
+
+    # ---------- EXPORT ----------
+
+    def render(self) -> str:
+        """Every series in the Prometheus text exposition format."""
+        lines: list[str] = []
+
+        def header(name: str, metric: str, kind: str):
+            text = self.descriptions.get(name, (None,))[0]
+            if text:
+                lines.append(f"# HELP {metric} {text}")
+            lines.append(f"# TYPE {metric} {kind}")
+
+        for name, value in sorted(self.counters.items()):
+            metric = metric_name(name, "_total")
+            header(name, metric, "counter")
+            lines.append(f"{metric} {value}")
+
+        for name, timing in sorted(self.timings.items()):
+            metric = metric_name(name, "_seconds")
+            header(name, metric, "summary")
+            lines.append(f"{metric}_count {timing.count}")
+            lines.append(f"{metric}_sum {timing.total:.6f}")
+            lines.append(f"{metric_name(name, '_max_seconds')} {timing.max:.6f}")
+
+        for name, series in group(self.labelled).items():
+            metric = metric_name(name, "_total")
+            header(name, metric, "counter")
+            key = self.label_key(name)
+            for label, value in series:
+                lines.append(f"{metric}{{{key}=\"{escape(label)}\"}} {value}")
+
+        for name, series in group(self.histograms).items():
+            metric = metric_name(name, "_seconds")
+            header(name, metric, "histogram")
+            key = self.label_key(name)
+            for label, histogram in series:
+                labels = f"{key}=\"{escape(label)}\"," if label is not None else ""
+                cumulative = 0
+                for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{metric}_bucket{{{labels}le=\"{bound}\"}} {cumulative}")
+                suffix = f"{{{labels.rstrip(',')}}}" if labels else ""
+                lines.append(f"{metric}_sum{suffix} {histogram.total:.6f}")
+                lines.append(f"{metric}_count{suffix} {cumulative}")
+
+        for name, (kind, collect) in sorted(self.collectors.items()):
+            try:
+                value = collect()
+            except Exception:
+                log.exception("Metrics collector %s failed", name)
+                continue
+            metric = metric_name(name, "_total" if kind == "counter" else "")
+            header(name, metric, kind)
+            if isinstance(value, dict):
+                key = self.label_key(name)
+                for label, item in sorted(value.items()):
+                    lines.append(f"{metric}{{{key}=\"{escape(label)}\"}} {item}")
+            else:
+                lines.append(f"{metric} {value}")
+
+        return "\n".join(lines) + "\n"
+
+    def label_key(self, name: str) -> str:
+        return self.descriptions.get(name, (None, "name"))[1]
+
+
+def metric_name(name: str, suffix: str = "") -> str:
+    return PREFIX + NAME_PATTERN.sub("_", name) + suffix
+
+
+def escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def group(series: dict) -> dict[str, list]:
+    grouped: dict[str, list] = {}
+    for (name, label), value in series.items():
+        grouped.setdefault(name, []).append((label, value))
+    for values in grouped.values():
+        values.sort(key=lambda item: "" if item[0] is None else item[0])
+    return dict(sorted(grouped.items()))
+
+
+def interaction_label(interaction: discord.Interaction) -> str:
+    """Stable series label: the command's full name or the component's custom_id family."""
+    if interaction.type in (discord.InteractionType.application_command, discord.InteractionType.autocomplete):
+        command = interaction.command
+        name = command.qualified_name if command else (interaction.data or {}).get("name", "unknown")
+        return f"autocomplete:{name}" if interaction.type is discord.InteractionType.autocomplete else name
+
+    custom_id = (interaction.data or {}).get("custom_id", "")
+    if ":" not in custom_id:
+        # discord.py's random IDs for non-persistent views
+        family = "view"
+    else:
+        # Drop IDs encoded in persistent custom_ids (horizon:qa:solved:<id>)
+        family = ":".join(part for part in custom_id.split(":") if not part.isdigit())
+    return f"modal:{family}" if interaction.type is discord.InteractionType.modal_submit else family
+
+
+class RateLimitCounter(logging.Handler):
+    """Counts 429s as discord.py's HTTP client logs them, by route.
+
+    discord.py retries a 429 inside ``HTTPClient.request`` and never
+    raises it to the caller, so the only place every one of them shows
+    up is the warning it logs on ``discord.http``. Attach with
+    :meth:`install` and detach with :meth:`uninstall`.
+    """
+
+    LOGGER = "discord.http"
+    MESSAGE = "We are being rate limited."
+
+    def __init__(self, metrics: Metrics):
+        super().__init__(logging.WARNING)
+        self.metrics = metrics
+        metrics.describe("rest.rate_limited", "REST requests that got a 429 from Discord", label="route")
+
+    def install(self):
+        logging.getLogger(self.LOGGER).addHandler(self)
+
+    def uninstall(self):
+        logging.getLogger(self.LOGGER).removeHandler(self)
+
+    def emit(self, record: logging.LogRecord):
+        if not isinstance(record.msg, str) or not record.msg.startswith(self.MESSAGE):
+            return
+        method, url = record.args[:2] if isinstance(record.args, tuple) and len(record.args) >= 2 else ("?", "")
+        self.metrics.count("rest.rate_limited", route_label(method, url))
+
+
+def route_label(method: str, url: str) -> str:
+    """``PATCH /channels/{id}/messages/{id}`` for a request URL."""
+    path = urlsplit(str(url)).path
+    _, _, path = path.partition("/api/")
+    parts = path.split("/")[1:]  # drop the API version
+    for i, part in enumerate(parts):
+        if part.isdigit():
+            parts[i] = "{id}"
+        elif i >= 2 and parts[i - 2] in ("webhooks", "interactions") and parts[i - 1] == "{id}":
+            # Webhook and interaction tokens are secrets, and unique
+            parts[i] = "{token}"
+    return f"{method} /" + "/".join(parts)
+
+# ---------- EXPORTER ----------
+
+class MetricsServer:
+    """Serves ``/metrics`` for Prometheus and samples event-loop lag.
+
+    Binds to ``host`` (loopback by default) so nothing is exposed unless
+    the operator forwards it. The lag sampler sleeps ``lag_interval``
+    seconds and records how late it woke up.
+    """
+
+    def __init__(self, metrics: Metrics, host: str, port: int, lag_interval: float = 0.5):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+        self.lag_interval = lag_interval
+
+        self._runner: web.AppRunner | None = None
+        self._sampler: asyncio.Task | None = None
+
+    async def start(self):
+        app = web.Application()
+        app.router.add_get("/metrics", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+        self.metrics.describe("event_loop.lag", "How late the event loop ran a timer")
+        self._sampler = asyncio.create_task(self._sample_lag())
+        log.info("Serving metrics on http://%s:%s/metrics", self.host, self.port)
+
+    async def close(self):
+        if self._sampler:
+            self._sampler.cancel()
+            self._sampler = None
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        return web.Response(text=self.metrics.render(), content_type="text/plain", charset="utf-8")
+
+    async def _sample_lag(self):
+        histogram = self.metrics.histogram
+        while True:
+            expected = time.perf_counter() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            histogram("event_loop.lag", max(time.perf_counter() - expected, 0.0))
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+
+import discord
+
+from core.rest_scheduler import Priority
+
+log = logging.getLogger(__name__)
+
+# Discord's per-message limits
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+
+# ---------- MOD LOG ----------
+
+class ModLog:
+    """Per-guild queue of mod-log embeds, posted up to ten per message.
+
+    :meth:`log` only queues, so commands never wait on the log channel.
+    A guild's queue is flushed when it holds a full message worth of
+    embeds or ``window`` seconds after its first queued entry, whichever
+    comes first. Messages go to the guild's ``mod_log_webhook_url`` when
+    set (a separate rate-limit bucket from the bot), otherwise to
+    ``mod_log_channel_id``.
+    """
+
+    def __init__(self, bot, window: float = 2.0):
+        self.bot = bot
+        self.window = window
+
+        self._queues: dict[int, list[discord.Embed]] = {}
+        self._timers: dict[int, asyncio.Task] = {}
+        self._webhooks: dict[str, discord.Webhook] = {}
+        self._flushing: set[asyncio.Task] = set()
+
+        self.embeds_logged = 0
+        self.messages_sent = 0
+
+    def log(self, guild: discord.Guild, embed: discord.Embed):
+        queue = self._queues.setdefault(guild.id, [])
+        queue.append(embed)
+        self.embeds_logged += 1
+
+        if len(queue) >= MAX_EMBEDS:
+            self._cancel_timer(guild.id)
+            self._spawn(self.flush(guild.id))
+        elif guild.id not in self._timers:
+            self._timers[guild.id] = asyncio.create_task(self._flush_later(guild.id))
+
+    # ---------- FLUSHING ----------
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._flushing.add(task)
+        task.add_done_callback(self._flushing.discard)
+
+    def _cancel_timer(self, guild_id: int):
+        timer = self._timers.pop(guild_id, None)
+        if timer and timer is not asyncio.current_task():
+            timer.cancel()
+
+    async def _flush_later(self, guild_id: int):
+        await asyncio.sleep(self.window)
+        self._timers.pop(guild_id, None)
+        await self.flush(guild_id)
+
+    def _batches(self, embeds: list[discord.Embed]):
+        batch, size = [], 0
+        for embed in embeds:
+            length = len(embed)
+            if batch and (len(batch) == MAX_EMBEDS or size + length > MAX_EMBED_CHARS):
+                yield batch
+                batch, size = [], 0
+            batch.append(embed)
+            size += length
+        if batch:
+            yield batch
+
+    def _destination(self, guild_id: int):
+        config = self.bot.config.guild(guild_id)
+
+        if config.mod_log_webhook_url:
+            webhook = self._webhooks.get(config.mod_log_webhook_url)
+            if webhook is None:
+                webhook = discord.Webhook.from_url(config.mod_log_webhook_url, client=self.bot)
+                self._webhooks[config.mod_log_webhook_url] = webhook
+            return webhook, f"webhook:{webhook.id}"
+
+        channel = self.bot.get_channel(config.mod_log_channel_id) if config.mod_log_channel_id else None
+        return channel, f"channel:{config.mod_log_channel_id}"
+
+    async def flush(self, guild_id: int):
+        embeds = self._queues.pop(guild_id, None)
+        if not embeds:
+            return
+
+        destination, route = self._destination(guild_id)
+        if destination is None:
+            return
+
+        for batch in self._batches(embeds):
+            try:
+                await self.bot.rest.submit(
+                    Priority.LOG,
+                    lambda batch=batch: destination.send(embeds=batch),
+                    route=route
+                )
+                self.messages_sent += 1
+            except discord.HTTPException:
+                log.exception("Failed to post %s mod-log entries for guild %s", len(batch), guild_id)
+
+    async def close(self):
+        """Flush every queued entry; called when the moderation cog unloads."""
+        for guild_id in list(self._timers):
+            self._cancel_timer(guild_id)
+
+        if self._flushing:
+            await asyncio.gather(*self._flushing, return_exceptions=True)
+        await asyncio.gather(*(self.flush(guild_id) for guild_id in list(self._queues)))
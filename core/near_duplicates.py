@@ -0,0 +1,276 @@
+import asyncio
+import hashlib
+import logging
+import re
+import zlib
+from array import array
+
+from core.database import Database
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS minhash_signatures (
+    namespace TEXT NOT NULL,
+    doc_id INTEGER NOT NULL,
+    guild_id INTEGER NOT NULL,
+    signature BLOB NOT NULL,
+    PRIMARY KEY (namespace, doc_id)
+) WITHOUT ROWID;
+
+-- Band keys are salted with the guild, so a lookup only ever meets
+-- bands from its own guild.
+CREATE TABLE IF NOT EXISTS minhash_buckets (
+    namespace TEXT NOT NULL,
+    band_key INTEGER NOT NULL,
+    doc_id INTEGER NOT NULL,
+    PRIMARY KEY (namespace, band_key, doc_id)
+) WITHOUT ROWID;
+"""
+
+# Most candidates scored per lookup. Short texts on a shared vocabulary
+# can put tens of thousands of documents in a popular band; only the
+# ones matching the most bands (the likeliest to be similar) are fetched.
+CANDIDATES = 100
+
+MASK64 = (1 << 64) - 1
+MIX = 0x9E3779B97F4A7C15
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+# ---------- SIGNATURES ----------
+
+def shingles(text: str, k: int = 3) -> set[int]:
+    """Character k-grams of the normalised text, hashed to 32 bits.
+
+    crc32 rather than hash() so signatures stay the same across processes.
+    """
+    normalised = " ".join(WORD_PATTERN.findall(text.casefold()))
+    if len(normalised) <= k:
+        return {zlib.crc32(normalised.encode())} if normalised else set()
+    return {zlib.crc32(normalised[i:i + k].encode()) for i in range(len(normalised) - k + 1)}
+
+
+class MinHasher:
+    """One-permutation MinHash: each shingle is hashed once and lands in
+    one of ``num_perm`` bins, each bin keeps its minimum. Empty bins
+    borrow from a filled one so short texts still get a full signature.
+    Hashing costs O(shingles) rather than O(shingles * num_perm).
+    """
+
+    def __init__(self, num_perm: int = 128):
+        assert num_perm & (num_perm - 1) == 0, "num_perm must be a power of two"
+        self.num_perm = num_perm
+        self.bin_shift = 64 - (num_perm.bit_length() - 1)
+        self.value_mask = (1 << self.bin_shift) - 1
+
+    def signature(self, text: str) -> array | None:
+        hashes = shingles(text)
+        if not hashes:
+            return None
+
+        empty = self.value_mask + 1
+        bins = [empty] * self.num_perm
+        for h in hashes:
+            # Multiplicative mixing spreads the 32-bit crc over 64 bits
+            mixed = (h * MIX) & MASK64
+            slot = mixed >> self.bin_shift
+            value = mixed & self.value_mask
+            if value < bins[slot]:
+                bins[slot] = value
+
+        # Densify: an empty bin borrows from a filled one picked by a fixed
+        # probe sequence per bin (the same for every text), mixed with the
+        # attempt number so the copies stay distinct. Probing rather than
+        # taking the next bin keeps neighbouring empty bins, and so the
+        # rows of one band, from all copying the same value.
+        size = self.num_perm
+        mask = size - 1
+        filled = list(bins)
+        for slot in range(size):
+            if filled[slot] != empty:
+                continue
+            for attempt in range(1, 4 * size):
+                donor = ((slot * size + attempt) * MIX >> 32) & mask
+                if filled[donor] != empty:
+                    break
+            else:
+                # Almost every bin is empty (a very short text): next filled one
+                attempt = next(step for step in range(1, size) if filled[(slot + step) & mask] != empty)
+                donor = (slot + attempt) & mask
+            bins[slot] = (filled[donor] + attempt * MIX) & MASK64
+
+        return array("Q", bins)
+
+
+def similarity(left: array, right: array) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return sum(x == y for x, y in zip(left, right)) / len(left)
+
+# ---------- INDEX ----------
+
+class NearDuplicateIndex:
+    """MinHash signatures with an LSH band index, persisted in SQLite.
+
+    Each signature is cut into ``bands`` bands; two texts become
+    candidates when any band matches exactly, which for 32 bands of 4
+    rows is near certain above 60% similarity and unlikely below 25%. Band
+    keys live in an indexed table, so a lookup is ``bands`` index probes
+    plus a check of at most ``CANDIDATES`` documents, however large the
+    corpus. ``namespace`` lets several features share the tables.
+
+    :meth:`add` and :meth:`remove` are queued and written in the
+    background; lookups flush first.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str,
+        num_perm: int = 128,
+        bands: int = 32,
+        threshold: float = 0.45,
+        flush_interval: float = 2.0
+    ):
+        assert num_perm % bands == 0
+        self.db = Database(path)
+        self.namespace = namespace
+        self.hasher = MinHasher(num_perm)
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.flush_interval = flush_interval
+
+        self._added: dict[int, tuple[int, array]] = {}
+        self._removed: set[int] = set()
+        self._flusher: asyncio.Task | None = None
+
+    # ---------- LIFECYCLE ----------
+
+    async def open(self):
+        await self.db.open()
+        await self.db.executescript(SCHEMA)
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        await self.flush()
+        await self.db.close()
+
+    # ---------- HASHING ----------
+
+    def band_keys(self, guild_id: int, signature: array) -> list[int]:
+        salt = guild_id.to_bytes(8, "little")
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows]
+            digest = hashlib.blake2b(band.to_bytes(2, "little") + chunk.tobytes(), digest_size=8, salt=salt).digest()
+            keys.append(int.from_bytes(digest, "little", signed=True))
+        return keys
+
+    # ---------- WRITES ----------
+
+    def add(self, doc_id: int, guild_id: int, text: str):
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return
+        self._removed.discard(doc_id)
+        self._added[doc_id] = (guild_id, signature)
+
+    def remove(self, doc_id: int):
+        self._added.pop(doc_id, None)
+        self._removed.add(doc_id)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Failed to write %s signatures, retrying next cycle", self.namespace)
+
+    async def flush(self):
+        if not (self._added or self._removed):
+            return
+
+        added, self._added = self._added, {}
+        removed, self._removed = self._removed, set()
+        namespace = self.namespace
+        bands = [
+            (namespace, key, doc_id)
+            for doc_id, (guild_id, signature) in added.items()
+            for key in self.band_keys(guild_id, signature)
+        ]
+
+        def write(conn):
+            # Replacing or removing a document: drop its old bands first
+            for doc_id in (*added, *removed):
+                row = conn.execute(
+                    "SELECT guild_id, signature FROM minhash_signatures WHERE namespace = ? AND doc_id = ?",
+                    (namespace, doc_id)
+                ).fetchone()
+                if row is None:
+                    continue
+                conn.executemany(
+                    "DELETE FROM minhash_buckets WHERE namespace = ? AND band_key = ? AND doc_id = ?",
+                    [(namespace, key, doc_id) for key in self.band_keys(row[0], array("Q", row[1]))]
+                )
+                conn.execute("DELETE FROM minhash_signatures WHERE namespace = ? AND doc_id = ?", (namespace, doc_id))
+
+            conn.executemany(
+                "INSERT INTO minhash_signatures (namespace, doc_id, guild_id, signature) VALUES (?, ?, ?, ?)",
+                [(namespace, doc_id, guild_id, signature.tobytes()) for doc_id, (guild_id, signature) in added.items()]
+            )
+            conn.executemany("INSERT OR IGNORE INTO minhash_buckets (namespace, band_key, doc_id) VALUES (?, ?, ?)", bands)
+
+        try:
+            await self.db.transaction(write)
+        except Exception:
+            for doc_id, entry in added.items():
+                self._added.setdefault(doc_id, entry)
+            self._removed |= removed
+            raise
+
+    # ---------- READS ----------
+
+    async def indexed(self) -> set[int]:
+        """Every doc_id in this namespace, for backfilling what is missing."""
+        await self.flush()
+        rows = await self.db.fetchall(
+            "SELECT doc_id FROM minhash_signatures WHERE namespace = ?",
+            (self.namespace,)
+        )
+        return {doc_id for (doc_id,) in rows}
+
+    async def similar(self, guild_id: int, text: str, limit: int = 3, exclude: int | None = None) -> list[tuple[int, float]]:
+        """Up to ``limit`` (doc_id, similarity) pairs at or above the threshold, best first."""
+        signature = self.hasher.signature(text)
+        if signature is None:
+            return []
+
+        await self.flush()
+
+        keys = self.band_keys(guild_id, signature)
+        marks = ", ".join("?" * len(keys))
+        rows = await self.db.fetchall(
+            "SELECT s.doc_id, s.signature FROM ("
+            f"SELECT doc_id, COUNT(*) AS hits FROM minhash_buckets WHERE namespace = ? AND band_key IN ({marks}) "
+            "GROUP BY doc_id ORDER BY hits DESC LIMIT ?"
+            ") c JOIN minhash_signatures s ON s.namespace = ? AND s.doc_id = c.doc_id",
+            (self.namespace, *keys, CANDIDATES, self.namespace)
+        )
+
+        scored = [
+            (doc_id, similarity(signature, array("Q", blob)))
+            for doc_id, blob in rows
+            if doc_id != exclude
+        ]
+        scored = [entry for entry in scored if entry[1] >= self.threshold]
+        scored.sort(key=lambda entry: entry[1], reverse=True)
+        return scored[:limit]
@@ -0,0 +1,250 @@
+import asyncio
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Callable
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+import discord
+
+from core.rest_scheduler import Priority
+
+log = logging.getLogger(__name__)
+
+BULK_DELETE_MAX = 100
+# Discord only bulk-deletes messages younger than 14 days; keep a margin
+# so a message doesn't age out between the check and the request.
+BULK_DELETE_AGE = timedelta(days=14) - timedelta(minutes=5)
+LINK_PATTERN = re.compile(r"https?://\S+", re.IGNORECASE)
+
+# /deep_purge patterns run on the event loop against every scanned
+# message, so anything that can backtrack catastrophically is refused.
+MAX_PATTERN_LENGTH = 100
+REPEATS = {"MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"}
+
+# ---------- PATTERNS ----------
+
+def compile_pattern(text: str) -> re.Pattern:
+    """Compile a moderator's regex, refusing ones that can stall the bot.
+
+    Nested quantifiers like ``(a+)+`` and backreferences can take
+    exponential time on a crafted message, so both are rejected along
+    with patterns longer than ``MAX_PATTERN_LENGTH``.
+    """
+    if len(text) > MAX_PATTERN_LENGTH:
+        raise ValueError(f"Patterns are limited to {MAX_PATTERN_LENGTH} characters.")
+    try:
+        parsed = sre_parse.parse(text, re.IGNORECASE)
+    except re.error:
+        raise ValueError("That pattern is not a valid regex.") from None
+    if _backtracks(parsed, False):
+        raise ValueError("Nested quantifiers such as (a+)+ and backreferences are not allowed.")
+    return re.compile(text, re.IGNORECASE)
+
+
+def _backtracks(subpattern, repeated: bool) -> bool:
+    for op, av in subpattern:
+        name = str(op)
+        if name in ("GROUPREF", "GROUPREF_EXISTS"):
+            return True
+        repeat = name in REPEATS and av[1] > 1
+        if repeat and repeated:
+            return True
+        for child in _children(av):
+            if _backtracks(child, repeated or repeat):
+                return True
+    return False
+
+
+def _children(av):
+    if isinstance(av, sre_parse.SubPattern):
+        yield av
+    elif isinstance(av, (tuple, list)):
+        for item in av:
+            yield from _children(item)
+
+# ---------- FILTER ----------
+
+class PurgeFilter:
+    def __init__(
+        self,
+        author_id: int | None = None,
+        pattern: re.Pattern | None = None,
+        attachments: bool = False,
+        links: bool = False,
+        bots: bool = False,
+        after: datetime | None = None,
+        before: datetime | None = None
+    ):
+        self.author_id = author_id
+        self.pattern = pattern
+        self.attachments = attachments
+        self.links = links
+        self.bots = bots
+        # Bounds of the history walk rather than per-message checks
+        self.after = after
+        self.before = before
+
+    def matches(self, message: discord.Message) -> bool:
+        if message.pinned:
+            return False
+        if self.author_id is not None and message.author.id != self.author_id:
+            return False
+        if self.bots and not message.author.bot:
+            return False
+        if self.attachments and not message.attachments:
+            return False
+        if self.links and not LINK_PATTERN.search(message.content):
+            return False
+        if self.pattern is not None and not self.pattern.search(message.content):
+            return False
+        return True
+
+    def describe(self) -> str:
+        parts = []
+        if self.author_id is not None:
+            parts.append(f"from <@{self.author_id}>")
+        if self.bots:
+            parts.append("from bots")
+        if self.attachments:
+            parts.append("with attachments")
+        if self.links:
+            parts.append("with links")
+        if self.pattern is not None:
+            parts.append(f"matching `{self.pattern.pattern}`")
+        if self.after:
+            parts.append(f"after {discord.utils.format_dt(self.after)}")
+        if self.before:
+            parts.append(f"before {discord.utils.format_dt(self.before)}")
+        return ", ".join(parts) or "all messages"
+
+# ---------- JOB ----------
+
+class PurgeJob:
+    """Deletes matching messages from a channel's history in the background.
+
+    History is walked newest-first, one page at a time, and at most one
+    bulk-delete chunk is held in memory, so memory use doesn't grow with
+    ``scan_limit``. Messages inside the 14-day window go out in chunks
+    of 100; older ones (everything after the first one found, since the
+    walk is newest-first) are deleted one by one. With ``rules.after``
+    the walk stops at the first message older than it.
+    """
+
+    def __init__(
+        self,
+        channel: discord.abc.Messageable,
+        rules: PurgeFilter,
+        rest,
+        scan_limit: int,
+        progress: Callable[["PurgeJob"], None] | None = None
+    ):
+        self.channel = channel
+        self.rules = rules
+        self.rest = rest
+        self.scan_limit = scan_limit
+        self.progress = progress
+
+        self.scanned = 0
+        self.deleted = 0
+        self.failed = 0
+        self.task: asyncio.Task | None = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self.task is not None and self.task.cancelled()
+
+    def start(self) -> asyncio.Task:
+        self.task = asyncio.create_task(self.run())
+        return self.task
+
+    def cancel(self):
+        if self.task:
+            self.task.cancel()
+
+    async def wait(self):
+        # Unlike awaiting the task, doesn't raise if the job was cancelled
+        await asyncio.wait({self.task})
+
+    # ---------- DELETION ----------
+
+    async def _delete_chunk(self, chunk: list[discord.Message]):
+        try:
+            await self.rest.submit(
+                Priority.MODERATION,
+                lambda: self.channel.delete_messages(chunk),
+                route=f"channel:{self.channel.id}"
+            )
+            self.deleted += len(chunk)
+        except discord.NotFound:
+            # Someone else deleted part of the chunk first; go through it
+            # one by one so only what this job removed is counted.
+            for message in chunk:
+                await self._delete_one(message)
+        except discord.HTTPException:
+            log.exception("Bulk delete of %s messages in %s failed", len(chunk), self.channel.id)
+            self.failed += len(chunk)
+
+    async def _delete_one(self, message: discord.Message):
+        try:
+            await self.rest.submit(
+                Priority.MODERATION,
+                lambda: message.delete(),
+                route=f"channel:{self.channel.id}"
+            )
+            self.deleted += 1
+        except discord.NotFound:
+            # Already gone
+            pass
+        except discord.HTTPException:
+            self.failed += 1
+
+    def _report(self):
+        if self.progress:
+            self.progress(self)
+
+    async def run(self):
+        cutoff = discord.utils.utcnow() - BULK_DELETE_AGE
+        chunk: list[discord.Message] = []
+
+        after = self.rules.after
+        # Not passed as after=: discord.py would still page newest-first
+        # down to scan_limit and only filter out the older messages.
+        history = self.channel.history(
+            limit=self.scan_limit,
+            before=self.rules.before,
+            oldest_first=False
+        )
+
+        try:
+            async for message in history:
+                if after is not None and message.created_at <= after:
+                    break
+
+                self.scanned += 1
+                # Throttled by the reporter; keeps a long scan with no
+                # matches from looking stuck
+                self._report()
+                if not self.rules.matches(message):
+                    continue
+
+                if message.created_at > cutoff:
+                    chunk.append(message)
+                    if len(chunk) == BULK_DELETE_MAX:
+                        await self._delete_chunk(chunk)
+                        chunk = []
+                    continue
+
+                if chunk:
+                    await self._delete_chunk(chunk)
+                    chunk = []
+                await self._delete_one(message)
+
+            if chunk:
+                await self._delete_chunk(chunk)
+        finally:
+            self._report()
@@ -0,0 +1,401 @@
+import asyncio
+import logging
+import math
+import time
+from array import array
+
+from core.database import Database
+
+log = logging.getLogger(__name__)
+
+# qa_events is the raw, append-only log. A background rollup folds new
+# events (id > qa_rollup_cursor) into the aggregate tables and moves the
+# cursor in the same transaction, so no event is counted twice and none
+# is ever read again. qa_open_threads is the little per-thread state the
+# rollup needs to turn a reply or solve into a time since the question.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS qa_events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    guild_id INTEGER NOT NULL,
+    thread_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    language TEXT,
+    at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS qa_rollup_cursor (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    last_event_id INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS qa_open_threads (
+    thread_id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    author_id INTEGER NOT NULL,
+    asked_at REAL NOT NULL,
+    first_reply_at REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_qa_open_threads_asked ON qa_open_threads (asked_at);
+
+CREATE TABLE IF NOT EXISTS qa_rollups (
+    guild_id INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    asked INTEGER NOT NULL DEFAULT 0,
+    replied INTEGER NOT NULL DEFAULT 0,
+    solved INTEGER NOT NULL DEFAULT 0,
+    reply_sketch BLOB,
+    solve_sketch BLOB,
+    PRIMARY KEY (guild_id, day, language)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS qa_answerers (
+    guild_id INTEGER NOT NULL,
+    day INTEGER NOT NULL,
+    language TEXT NOT NULL,
+    user_id INTEGER NOT NULL,
+    replies INTEGER NOT NULL DEFAULT 0,
+    first_replies INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (guild_id, day, language, user_id)
+) WITHOUT ROWID;
+"""
+
+ASK = "ask"
+REPLY = "reply"
+SOLVE = "solve"
+
+# Threads still unanswered/unsolved after this long stop being tracked
+OPEN_THREAD_TTL = 90 * 86400
+
+# ---------- SKETCH ----------
+
+class LatencySketch:
+    """Streaming quantiles over durations, DDSketch style.
+
+    Values fall into logarithmic buckets, so any quantile comes back
+    within ``ACCURACY`` (relative) of the true value. Sketches merge by
+    adding bucket counts, which is what lets per-day rollups be combined
+    into any date range. Anything from a second to a year fits in a few
+    hundred buckets.
+    """
+
+    ACCURACY = 0.02
+    GAMMA = (1 + ACCURACY) / (1 - ACCURACY)
+    LOG_GAMMA = math.log(GAMMA)
+
+    __slots__ = ("buckets", "count")
+
+    def __init__(self):
+        self.buckets: dict[int, int] = {}
+        self.count = 0
+
+    def add(self, seconds: float):
+        index = math.ceil(math.log(max(seconds, 1.0)) / self.LOG_GAMMA)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+
+    def merge(self, other: "LatencySketch"):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+
+    def quantile(self, q: float) -> float | None:
+        if not self.count:
+            return None
+
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Midpoint of the bucket, in the relative-error sense
+                return 2 * self.GAMMA ** index / (self.GAMMA + 1)
+        return None
+
+    def to_bytes(self) -> bytes:
+        flat = array("q")
+        for index, count in self.buckets.items():
+            flat.append(index)
+            flat.append(count)
+        return flat.tobytes()
+
+    @classmethod
+    def from_bytes(cls, blob: bytes | None) -> "LatencySketch":
+        sketch = cls()
+        if blob:
+            flat = array("q", blob)
+            for index, count in zip(flat[::2], flat[1::2]):
+                sketch.buckets[index] = count
+                sketch.count += count
+        return sketch
+
+# ---------- RECORDS ----------
+
+class Rollup:
+    """Counters and sketches for one guild, day and language (or a merge of several)."""
+
+    __slots__ = ("language", "asked", "replied", "solved", "reply", "solve")
+
+    def __init__(self, language: str, asked=0, replied=0, solved=0, reply_sketch=None, solve_sketch=None):
+        self.language = language
+        self.asked = asked
+        self.replied = replied
+        self.solved = solved
+        self.reply = LatencySketch.from_bytes(reply_sketch)
+        self.solve = LatencySketch.from_bytes(solve_sketch)
+
+    @property
+    def unanswered(self) -> int:
+        return self.asked - self.replied
+
+    def merge(self, other: "Rollup"):
+        self.asked += other.asked
+        self.replied += other.replied
+        self.solved += other.solved
+        self.reply.merge(other.reply)
+        self.solve.merge(other.solve)
+
+
+class QAStats:
+    __slots__ = ("total", "languages", "answerers")
+
+    def __init__(self, total: Rollup, languages: list[Rollup], answerers: list[tuple[int, int, int]]):
+        self.total = total
+        # Busiest first
+        self.languages = languages
+        # (user_id, replies, first_replies), most replies first
+        self.answerers = answerers
+
+
+def language_key(language: str) -> str:
+    return " ".join(language.split()).casefold()[:50] or "unknown"
+
+
+def day_of(timestamp: float) -> int:
+    return int(timestamp // 86400)
+
+# ---------- ANALYTICS ----------
+
+class QAAnalytics:
+    """Ask/reply/solve events for Q&A threads and their rollups.
+
+    :meth:`record` only queues the event. A background task appends the
+    queue to ``qa_events`` every ``flush_interval`` seconds and then
+    rolls new events up, ``batch`` at a time, into per-guild, per-day,
+    per-language counters and latency sketches. :meth:`stats` reads only
+    the rollups: at most one row per language per day in the range, no
+    matter how many events produced them.
+
+    Numbers are attributed to the day the question was asked, so a row
+    answers "of the questions asked that day, how many were answered and
+    how fast". Replies by the asker themselves are not counted.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 2.0, rollup_interval: float = 30.0, batch: int = 5000):
+        self.db = Database(path)
+        self.flush_interval = flush_interval
+        self.rollup_interval = rollup_interval
+        self.batch = batch
+
+        self._pending: list[tuple] = []
+        self._flusher: asyncio.Task | None = None
+
+    # ---------- LIFECYCLE ----------
+
+    async def open(self):
+        await self.db.open()
+        await self.db.executescript(SCHEMA)
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        await self.flush()
+        await self.db.close()
+
+    # ---------- WRITES ----------
+
+    def record(self, kind: str, guild_id: int, thread_id: int, user_id: int, language: str | None = None):
+        self._pending.append((kind, guild_id, thread_id, user_id, language, time.time()))
+
+    async def _flush_loop(self):
+        last_rollup = 0.0
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+                if time.monotonic() - last_rollup >= self.rollup_interval:
+                    last_rollup = time.monotonic()
+                    await self.rollup()
+            except Exception:
+                log.exception("Failed to update Q&A analytics, retrying next cycle")
+
+    async def flush(self):
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+
+        def write(conn):
+            conn.executemany(
+                "INSERT INTO qa_events (kind, guild_id, thread_id, user_id, language, at) VALUES (?, ?, ?, ?, ?, ?)",
+                pending
+            )
+
+        try:
+            await self.db.transaction(write)
+        except Exception:
+            self._pending[:0] = pending
+            raise
+
+    async def rollup(self) -> int:
+        """Fold every event past the cursor into the aggregates; returns how many were read."""
+        total = 0
+        while True:
+            done = await self.db.transaction(self._rollup_batch)
+            total += done
+            if done < self.batch:
+                return total
+
+    def _rollup_batch(self, conn) -> int:
+        row = conn.execute("SELECT last_event_id FROM qa_rollup_cursor WHERE id = 0").fetchone()
+        cursor = row[0] if row else 0
+
+        events = conn.execute(
+            "SELECT id, kind, guild_id, thread_id, user_id, language, at FROM qa_events "
+            "WHERE id > ? ORDER BY id LIMIT ?",
+            (cursor, self.batch)
+        ).fetchall()
+        if not events:
+            return 0
+
+        # Everything touched by this batch is loaded once, changed in
+        # memory and written back once.
+        threads: dict[int, list | None] = {}
+        rollups: dict[tuple[int, int, str], Rollup] = {}
+        answerers: dict[tuple[int, int, str, int], list[int]] = {}
+        finished: set[int] = set()
+
+        def thread_state(thread_id):
+            if thread_id not in threads:
+                found = conn.execute(
+                    "SELECT guild_id, language, author_id, asked_at, first_reply_at FROM qa_open_threads WHERE thread_id = ?",
+                    (thread_id,)
+                ).fetchone()
+                threads[thread_id] = list(found) if found else None
+            return threads[thread_id]
+
+        def rollup_for(guild_id, asked_at, language):
+            key = (guild_id, day_of(asked_at), language)
+            if key not in rollups:
+                found = conn.execute(
+                    "SELECT asked, replied, solved, reply_sketch, solve_sketch FROM qa_rollups "
+                    "WHERE guild_id = ? AND day = ? AND language = ?",
+                    key
+                ).fetchone()
+                rollups[key] = Rollup(language, *found) if found else Rollup(language)
+            return rollups[key]
+
+        for _, kind, guild_id, thread_id, user_id, language, at in events:
+            if kind == ASK:
+                language = language_key(language or "")
+                threads[thread_id] = [guild_id, language, user_id, at, None]
+                finished.discard(thread_id)
+                rollup_for(guild_id, at, language).asked += 1
+                continue
+
+            state = thread_state(thread_id)
+            if state is None:
+                # Asked before analytics existed, or already solved
+                continue
+            _, language, author_id, asked_at, first_reply_at = state
+
+            if kind == REPLY:
+                if user_id == author_id:
+                    continue
+                # Keyed like the rollups, so a date range sums the same days
+                counts = answerers.setdefault((guild_id, day_of(asked_at), language, user_id), [0, 0])
+                counts[0] += 1
+                if first_reply_at is None:
+                    state[4] = at
+                    counts[1] += 1
+                    rollup = rollup_for(guild_id, asked_at, language)
+                    rollup.replied += 1
+                    rollup.reply.add(at - asked_at)
+
+            elif kind == SOLVE:
+                rollup = rollup_for(guild_id, asked_at, language)
+                rollup.solved += 1
+                rollup.solve.add(at - asked_at)
+                threads[thread_id] = None
+                finished.add(thread_id)
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO qa_open_threads (thread_id, guild_id, language, author_id, asked_at, first_reply_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(thread_id, *state) for thread_id, state in threads.items() if state is not None]
+        )
+        conn.executemany("DELETE FROM qa_open_threads WHERE thread_id = ?", [(i,) for i in finished])
+        conn.execute("DELETE FROM qa_open_threads WHERE asked_at < ?", (time.time() - OPEN_THREAD_TTL,))
+
+        conn.executemany(
+            "INSERT OR REPLACE INTO qa_rollups "
+            "(guild_id, day, language, asked, replied, solved, reply_sketch, solve_sketch) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (*key, r.asked, r.replied, r.solved, r.reply.to_bytes(), r.solve.to_bytes())
+                for key, r in rollups.items()
+            ]
+        )
+        conn.executemany(
+            "INSERT INTO qa_answerers (guild_id, day, language, user_id, replies, first_replies) VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (guild_id, day, language, user_id) DO UPDATE SET "
+            "replies = replies + excluded.replies, first_replies = first_replies + excluded.first_replies",
+            [(*key, replies, first) for key, (replies, first) in answerers.items()]
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO qa_rollup_cursor (id, last_event_id) VALUES (0, ?)",
+            (events[-1][0],)
+        )
+        return len(events)
+
+    # ---------- READS ----------
+
+    async def stats(self, guild_id: int, days: int, language: str | None = None, answerers: int = 5) -> QAStats:
+        since = day_of(time.time()) - days + 1
+        where, params = "guild_id = ? AND day >= ?", [guild_id, since]
+        if language:
+            where += " AND language = ?"
+            params.append(language_key(language))
+
+        rows = await self.db.fetchall(
+            f"SELECT language, asked, replied, solved, reply_sketch, solve_sketch FROM qa_rollups WHERE {where}",
+            tuple(params)
+        )
+        top = await self.db.fetchall(
+            "SELECT user_id, SUM(replies) AS total, SUM(first_replies) FROM qa_answerers "
+            f"WHERE {where} GROUP BY user_id ORDER BY total DESC, user_id LIMIT ?",
+            (*params, answerers)
+        )
+
+        total = Rollup("all")
+        languages: dict[str, Rollup] = {}
+        for row in rows:
+            rollup = Rollup(*row)
+            total.merge(rollup)
+            if rollup.language in languages:
+                languages[rollup.language].merge(rollup)
+            else:
+                languages[rollup.language] = rollup
+
+        ranked = sorted(languages.values(), key=lambda r: r.asked, reverse=True)
+        return QAStats(total, ranked, top)
@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import re
+import time
+
+from core.database import Database
+
+log = logging.getLogger(__name__)
+
+# qa_search is an external-content FTS5 table over qa_threads, kept in
+# sync by triggers, so the text is stored once and the index is updated
+# row by row as questions come in.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS qa_threads (
+    thread_id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    author_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    language TEXT NOT NULL,
+    description TEXT NOT NULL,
+    code TEXT NOT NULL DEFAULT '',
+    solved INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS qa_search USING fts5(
+    title, language, description, code,
+    content='qa_threads', content_rowid='thread_id',
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS qa_threads_ai AFTER INSERT ON qa_threads BEGIN
+    INSERT INTO qa_search (rowid, title, language, description, code)
+    VALUES (new.thread_id, new.title, new.language, new.description, new.code);
+END;
+
+CREATE TRIGGER IF NOT EXISTS qa_threads_ad AFTER DELETE ON qa_threads BEGIN
+    INSERT INTO qa_search (qa_search, rowid, title, language, description, code)
+    VALUES ('delete', old.thread_id, old.title, old.language, old.description, old.code);
+END;
+
+CREATE TRIGGER IF NOT EXISTS qa_threads_au AFTER UPDATE OF title, language, description, code ON qa_threads BEGIN
+    INSERT INTO qa_search (qa_search, rowid, title, language, description, code)
+    VALUES ('delete', old.thread_id, old.title, old.language, old.description, old.code);
+    INSERT INTO qa_search (rowid, title, language, description, code)
+    VALUES (new.thread_id, new.title, new.language, new.description, new.code);
+END;
+"""
+
+# bm25 column weights: a hit in the title counts most, code least
+RANK = "bm25(qa_search, 10.0, 4.0, 2.0, 1.0)"
+
+# bm25 scores every match before sorting, and a common word can match
+# most of the index; only the guild's newest this many matches are ranked.
+CANDIDATES = 2000
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def match_query(text: str) -> str | None:
+    """Free text -> an FTS5 query: every word must appear, the last one as a prefix."""
+    tokens = TOKEN_PATTERN.findall(text)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+# ---------- RECORDS ----------
+
+class QAResult:
+    __slots__ = ("thread_id", "title", "language", "solved", "snippet")
+
+    def __init__(self, thread_id, title, language, solved, snippet):
+        self.thread_id = thread_id
+        self.title = title
+        self.language = language
+        self.solved = bool(solved)
+        self.snippet = snippet
+
+# ---------- INDEX ----------
+
+class QAIndex:
+    """Full-text index of Q&A threads in SQLite FTS5.
+
+    :meth:`add`, :meth:`mark_solved` and :meth:`remove` only queue the
+    change; a background task applies the queue in one transaction every
+    ``flush_interval`` seconds, so /ask never waits on the index.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 2.0):
+        self.db = Database(path)
+        self.flush_interval = flush_interval
+
+        self._added: dict[int, tuple] = {}
+        self._solved: set[int] = set()
+        self._removed: set[int] = set()
+        self._flusher: asyncio.Task | None = None
+
+    # ---------- LIFECYCLE ----------
+
+    async def open(self):
+        await self.db.open()
+        await self.db.executescript(SCHEMA)
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def close(self):
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        await self.flush()
+        await self.db.close()
+
+    # ---------- WRITES ----------
+
+    def add(self, thread_id: int, guild_id: int, author_id: int, title: str, language: str, description: str, code: str | None):
+        self._removed.discard(thread_id)
+        self._added[thread_id] = (thread_id, guild_id, author_id, title, language, description, code or "", time.time())
+
+    def mark_solved(self, thread_id: int):
+        self._solved.add(thread_id)
+
+    def remove(self, thread_id: int):
+        self._added.pop(thread_id, None)
+        self._solved.discard(thread_id)
+        self._removed.add(thread_id)
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Failed to update the Q&A index, retrying next cycle")
+
+    async def flush(self):
+        if not (self._added or self._solved or self._removed):
+            return
+
+        added, self._added = self._added, {}
+        solved, self._solved = self._solved, set()
+        removed, self._removed = self._removed, set()
+
+        def write(conn):
+            conn.executemany(
+                "INSERT INTO qa_threads "
+                "(thread_id, guild_id, author_id, title, language, description, code, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (thread_id) DO UPDATE SET "
+                "title = excluded.title, language = excluded.language, "
+                "description = excluded.description, code = excluded.code",
+                list(added.values())
+            )
+            conn.executemany("UPDATE qa_threads SET solved = 1 WHERE thread_id = ?", [(i,) for i in solved])
+            conn.executemany("DELETE FROM qa_threads WHERE thread_id = ?", [(i,) for i in removed])
+
+        try:
+            await self.db.transaction(write)
+        except Exception:
+            # Put the batch back without clobbering anything queued since
+            for thread_id, row in added.items():
+                self._added.setdefault(thread_id, row)
+            self._solved |= solved
+            self._removed |= removed
+            raise
+
+    # ---------- READS ----------
+
+    async def threads(self, thread_ids: list[int]) -> dict[int, tuple[str, str, bool]]:
+        """thread_id -> (title, language, solved) for the IDs that are indexed."""
+        if not thread_ids:
+            return {}
+
+        await self.flush()
+
+        marks = ", ".join("?" * len(thread_ids))
+        rows = await self.db.fetchall(
+            f"SELECT thread_id, title, language, solved FROM qa_threads WHERE thread_id IN ({marks})",
+            tuple(thread_ids)
+        )
+        return {thread_id: (title, language, bool(solved)) for thread_id, title, language, solved in rows}
+
+    async def search(self, guild_id: int, text: str, solved: bool | None = None, limit: int = 8) -> list[QAResult]:
+        query = match_query(text)
+        if query is None:
+            return []
+
+        await self.flush()
+
+        where = ["qa_search MATCH ?", "t.guild_id = ?"]
+        params = [query, guild_id]
+        if solved is not None:
+            where.append("t.solved = ?")
+            params.append(int(solved))
+
+        # Thread IDs are snowflakes, so walking rowids down is newest-first.
+        # The floor filters the same rows as the search below: other
+        # guilds' matches, or ones with the wrong status, must not use up
+        # the candidates.
+        floor = await self.db.fetchone(
+            "SELECT qa_search.rowid FROM qa_search JOIN qa_threads t ON t.thread_id = qa_search.rowid "
+            f"WHERE {' AND '.join(where)} ORDER BY qa_search.rowid DESC LIMIT 1 OFFSET ?",
+            (*params, CANDIDATES - 1)
+        )
+        where.append("qa_search.rowid >= ?")
+        params.append(floor[0] if floor else 0)
+
+        rows = await self.db.fetchall(
+            "SELECT t.thread_id, t.title, t.language, t.solved, "
+            "snippet(qa_search, 2, '**', '**', '…', 16) "
+            "FROM qa_search JOIN qa_threads t ON t.thread_id = qa_search.rowid "
+            f"WHERE {' AND '.join(where)} ORDER BY {RANK} LIMIT ?",
+            (*params, limit)
+        )
+        return [QAResult(*row) for row in rows]
@@ -0,0 +1,329 @@
+import asyncio
+import logging
+from collections import deque
+from enum import IntEnum
+from typing import Any, Awaitable, Callable
+
+log = logging.getLogger(__name__)
+
+# ---------- PRIORITIES ----------
+
+class Priority(IntEnum):
+    MODERATION = 0
+    INTERACTION = 1
+    LOG = 2
+    COSMETIC = 3
+
+
+# Queue limits per lane (0 = unbounded). Full lanes apply back-pressure
+# to the caller, except cosmetics which drop their oldest queued write.
+LANE_LIMITS = {
+    Priority.MODERATION: 0,
+    Priority.INTERACTION: 1000,
+    Priority.LOG: 1000,
+    Priority.COSMETIC: 200,
+}
+
+# ---------- JOB ----------
+
+class Job:
+    __slots__ = ("priority", "factory", "route", "key", "future")
+
+    def __init__(self, priority: Priority, factory: Callable[[], Awaitable[Any]], route: str | None, key: str | None):
+        self.priority = priority
+        self.factory = factory
+        self.route = route
+        self.key = key
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    def resolve(self, result=None, error: BaseException | None = None):
+        if self.future.done():
+            return
+        if error is not None:
+            self.future.set_exception(error)
+        else:
+            self.future.set_result(result)
+
+# ---------- LANE ----------
+
+class Lane:
+    """One priority's queue, indexed by whether a job can start.
+
+    ``ready`` holds jobs in submission order. A job popped while its
+    route is at ``route_limit`` is parked under that route instead of
+    being skipped over on every later pick, and one parked job goes back
+    to the front of ``ready`` each time a write on the route finishes.
+    Picking a job is therefore O(1) amortized rather than a scan of the
+    whole queue.
+    """
+
+    __slots__ = ("ready", "parked", "size")
+
+    def __init__(self):
+        self.ready: deque[Job] = deque()
+        self.parked: dict[str, deque[Job]] = {}
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, job: Job):
+        self.ready.append(job)
+        self.size += 1
+
+    def pop(self, route_full: Callable[[str], bool]) -> Job | None:
+        ready = self.ready
+        while ready:
+            job = ready.popleft()
+            if job.route is not None and route_full(job.route):
+                self.parked.setdefault(job.route, deque()).append(job)
+                continue
+            self.size -= 1
+            return job
+        return None
+
+    def popleft(self) -> Job:
+        """The oldest job, parked ones first; for dropping and draining."""
+        for route, jobs in self.parked.items():
+            job = jobs.popleft()
+            if not jobs:
+                del self.parked[route]
+            break
+        else:
+            job = self.ready.popleft()
+        self.size -= 1
+        return job
+
+    def remove(self, job: Job):
+        jobs = self.parked.get(job.route) if job.route is not None else None
+        if jobs is not None and job in jobs:
+            jobs.remove(job)
+            if not jobs:
+                del self.parked[job.route]
+        else:
+            self.ready.remove(job)
+        self.size -= 1
+
+    def unpark(self, route: str):
+        jobs = self.parked.get(route)
+        if jobs:
+            self.ready.appendleft(jobs.popleft())
+            if not jobs:
+                del self.parked[route]
+
+# ---------- SCHEDULER ----------
+
+class RestScheduler:
+    """Bot-wide queue for outbound REST writes.
+
+    Jobs are zero-argument factories returning the coroutine to run, so a
+    rate-limited job can be retried and a superseded one never starts.
+
+    * Lanes are served strictly by priority; one worker is always kept
+      free of LOG/COSMETIC work so moderation never waits behind them.
+    * ``route`` names the Discord bucket a write hits (``channel:<id>``,
+      ``guild:<id>``...). At most ``route_limit`` writes per route run at
+      once. Every moderation action in a guild shares ``guild:<id>``, so
+      this also caps how many /bulk actions run in parallel
+      (``bulk_action_concurrency`` above it only queues here).
+    * Writes sharing a ``key`` merge: only the newest factory runs and
+      every caller receives its result.
+
+    Rate limits are left to discord.py, which sleeps through 429s and
+    bucket resets inside the request. Waits longer than the client's
+    ``max_ratelimit_timeout`` raise ``discord.RateLimited``, which is
+    passed to the caller like any other error.
+    """
+
+    def __init__(self, workers: int = 4, route_limit: int = 2):
+        self.workers = workers
+        self.route_limit = route_limit
+
+        self._lanes: dict[Priority, Lane] = {p: Lane() for p in Priority}
+        self._keyed: dict[str, Job] = {}
+        self._in_flight: dict[str, int] = {}
+        self._low_running = 0
+
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._tasks: list[asyncio.Task] = []
+        self._closing = False
+
+        self.submitted = 0
+        self.completed = 0
+        self.merged = 0
+        self.dropped = 0
+
+    # ---------- LIFECYCLE ----------
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def close(self, timeout: float = 10.0):
+        """Stop accepting writes and drain what is queued."""
+        self._closing = True
+        try:
+            await asyncio.wait_for(self._drained(), timeout)
+        except asyncio.TimeoutError:
+            log.warning("REST scheduler closed with %s writes still queued", self.queued())
+
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+        for lane in self._lanes.values():
+            while lane:
+                lane.popleft().resolve(error=RuntimeError("REST scheduler closed"))
+        self._keyed.clear()
+
+    async def _drained(self):
+        while self.queued() or any(self._in_flight.values()):
+            await asyncio.sleep(0.05)
+
+    def queued(self) -> int:
+        return sum(len(lane) for lane in self._lanes.values())
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "queued": self.queued(),
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "merged": self.merged,
+            "dropped": self.dropped,
+        }
+
+    # ---------- SUBMIT ----------
+
+    async def _enqueue(self, priority: Priority, factory, route: str | None, key: str | None) -> asyncio.Future:
+        if self._closing:
+            raise RuntimeError("REST scheduler is closed")
+
+        self.submitted += 1
+
+        if key is not None and key in self._keyed:
+            job = self._keyed[key]
+            job.factory = factory
+            self.merged += 1
+            return job.future
+
+        lane = self._lanes[priority]
+        limit = LANE_LIMITS[priority]
+
+        while limit and len(lane) >= limit:
+            if priority is Priority.COSMETIC:
+                self._discard(lane.popleft())
+                self.dropped += 1
+                break
+            self._space.clear()
+            await self._space.wait()
+
+        job = Job(priority, factory, route, key)
+        lane.append(job)
+        if key is not None:
+            self._keyed[key] = job
+
+        self._wakeup.set()
+        return job.future
+
+    async def submit(
+        self,
+        priority: Priority,
+        factory: Callable[[], Awaitable[Any]],
+        *,
+        route: str | None = None,
+        key: str | None = None
+    ):
+        """Queue a write and wait for its result (None if it was dropped)."""
+        future = await self._enqueue(priority, factory, route, key)
+        # Shielded so a cancelled caller does not cancel a write others share.
+        return await asyncio.shield(future)
+
+    def post(
+        self,
+        priority: Priority,
+        factory: Callable[[], Awaitable[Any]],
+        *,
+        route: str | None = None,
+        key: str | None = None
+    ):
+        """Fire-and-forget variant of :meth:`submit`; failures are logged."""
+        task = asyncio.create_task(self.submit(priority, factory, route=route, key=key))
+        task.add_done_callback(_log_failure)
+
+    def cancel(self, key: str) -> bool:
+        """Drop a queued keyed write before it starts; its callers get None."""
+        job = self._keyed.get(key)
+        if job is None:
+            return False
+        self._lanes[job.priority].remove(job)
+        self._discard(job)
+        self._space.set()
+        return True
+
+    def _discard(self, job: Job):
+        if job.key is not None and self._keyed.get(job.key) is job:
+            del self._keyed[job.key]
+        job.resolve(None)
+
+    # ---------- WORKERS ----------
+
+    def _route_full(self, route: str) -> bool:
+        return self._in_flight.get(route, 0) >= self.route_limit
+
+    def _next_job(self) -> Job | None:
+        for priority in Priority:
+            if priority >= Priority.LOG and self._low_running >= max(1, self.workers - 1):
+                # Keep a worker free for moderation and interactions
+                return None
+
+            job = self._lanes[priority].pop(self._route_full)
+            if job is not None:
+                if job.key is not None and self._keyed.get(job.key) is job:
+                    del self._keyed[job.key]
+                self._space.set()
+                return job
+        return None
+
+    async def _worker(self):
+        while True:
+            job = self._next_job()
+
+            if job is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            await self._run(job)
+            # Whatever blocked other jobs (route slot, low-priority slot) may be free now.
+            self._wakeup.set()
+
+    async def _run(self, job: Job):
+        low = job.priority >= Priority.LOG
+        if low:
+            self._low_running += 1
+        if job.route is not None:
+            self._in_flight[job.route] = self._in_flight.get(job.route, 0) + 1
+
+        try:
+            result = await job.factory()
+        except Exception as error:
+            job.resolve(error=error)
+        else:
+            self.completed += 1
+            job.resolve(result)
+        finally:
+            if low:
+                self._low_running -= 1
+            if job.route is not None:
+                self._in_flight[job.route] -= 1
+                if not self._in_flight[job.route]:
+                    del self._in_flight[job.route]
+                for lane in self._lanes.values():
+                    lane.unpark(job.route)
+
+# ---------- HELPERS ----------
+
+def _log_failure(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        log.error("Background REST write failed", exc_info=task.exception())
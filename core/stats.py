@@ -0,0 +1,138 @@
+import discord
+
+# ---------- STATS ----------
+
+class BotStats:
+    """Guild, member and unique-user counts kept current from gateway events.
+
+    Each guild's members are counted into a reference-counted user map
+    once, when the guild becomes available; after that only joins and
+    leaves touch it, so every read is O(1).
+
+    Guilds whose member list was not chunked (lean member cache) cannot
+    be deduplicated; their ``member_count`` is added on top, which makes
+    ``users`` an upper bound rather than exact for them.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+
+        self.guild_members: dict[int, int] = {}
+        self.total_members = 0
+        self.user_refs: dict[int, int] = {}
+        self._undeduplicated: dict[int, int] = {}
+        self._undeduplicated_total = 0
+
+    def install(self):
+        for listener in (
+            self.on_guild_available,
+            self.on_guild_join,
+            self.on_guild_remove,
+            self.on_guild_unavailable,
+            self.on_member_join,
+            self.on_raw_member_remove,
+        ):
+            self.bot.add_listener(listener)
+
+    # ---------- READS ----------
+
+    @property
+    def guilds(self) -> int:
+        return len(self.guild_members)
+
+    @property
+    def users(self) -> int:
+        return len(self.user_refs) + self._undeduplicated_total
+
+    @property
+    def exact(self) -> bool:
+        return not self._undeduplicated
+
+    def members(self, guild_id: int) -> int:
+        return self.guild_members.get(guild_id, 0)
+
+    def snapshot(self) -> dict[str, int]:
+        return {"guilds": self.guilds, "members": self.total_members, "users": self.users}
+
+    # ---------- BOOKKEEPING ----------
+
+    def _ref(self, user_id: int):
+        self.user_refs[user_id] = self.user_refs.get(user_id, 0) + 1
+
+    def _unref(self, user_id: int):
+        count = self.user_refs.get(user_id)
+        if count is None:
+            return
+        if count <= 1:
+            del self.user_refs[user_id]
+        else:
+            self.user_refs[user_id] = count - 1
+
+    def add_guild(self, guild: discord.Guild):
+        if guild.id in self.guild_members:
+            self.remove_guild(guild)
+
+        count = guild.member_count or len(guild.members)
+        self.guild_members[guild.id] = count
+        self.total_members += count
+
+        if guild.chunked:
+            for member in guild.members:
+                self._ref(member.id)
+        else:
+            self._undeduplicated[guild.id] = count
+            self._undeduplicated_total += count
+
+    def remove_guild(self, guild: discord.Guild):
+        count = self.guild_members.pop(guild.id, None)
+        if count is None:
+            return
+        self.total_members -= count
+
+        if guild.id in self._undeduplicated:
+            self._undeduplicated_total -= self._undeduplicated.pop(guild.id)
+        else:
+            for member in guild.members:
+                self._unref(member.id)
+
+    # ---------- EVENTS ----------
+
+    async def on_guild_available(self, guild: discord.Guild):
+        self.add_guild(guild)
+
+    async def on_guild_join(self, guild: discord.Guild):
+        self.add_guild(guild)
+
+    async def on_guild_remove(self, guild: discord.Guild):
+        self.remove_guild(guild)
+
+    async def on_guild_unavailable(self, guild: discord.Guild):
+        self.remove_guild(guild)
+
+    async def on_member_join(self, member: discord.Member):
+        guild_id = member.guild.id
+        if guild_id not in self.guild_members:
+            return
+
+        self.guild_members[guild_id] += 1
+        self.total_members += 1
+
+        if guild_id in self._undeduplicated:
+            self._undeduplicated[guild_id] += 1
+            self._undeduplicated_total += 1
+        else:
+            self._ref(member.id)
+
+    async def on_raw_member_remove(self, payload: discord.RawMemberRemoveEvent):
+        guild_id = payload.guild_id
+        if guild_id not in self.guild_members:
+            return
+
+        self.guild_members[guild_id] -= 1
+        self.total_members -= 1
+
+        if guild_id in self._undeduplicated:
+            self._undeduplicated[guild_id] -= 1
+            self._undeduplicated_total -= 1
+        else:
+            self._unref(payload.user.id)
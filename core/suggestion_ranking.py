@@ -0,0 +1,108 @@
+import math
+
+from sortedcontainers import SortedList
+
+# z for a 95% confidence interval
+Z = 1.96
+
+# ---------- SCORE ----------
+
+def wilson_lower_bound(upvotes: int, downvotes: int, z: float = Z) -> float:
+    """Lower bound of the Wilson score interval for the share of upvotes.
+
+    Unlike the raw ratio or the difference, it rewards a suggestion for
+    having many votes: 40 up / 5 down outranks 3 up / 0 down.
+    """
+    n = upvotes + downvotes
+    if n == 0:
+        return 0.0
+
+    p = upvotes / n
+    z2 = z * z
+    return (p + z2 / (2 * n) - z * math.sqrt((p * (1 - p) + z2 / (4 * n)) / n)) / (1 + z2 / n)
+
+# ---------- RANKING ----------
+
+class RankedSuggestion:
+    __slots__ = ("message_id", "guild_id", "status", "upvotes", "downvotes", "score")
+
+    def __init__(self, message_id: int, guild_id: int, status: str, upvotes: int, downvotes: int):
+        self.message_id = message_id
+        self.guild_id = guild_id
+        self.status = status
+        self.upvotes = upvotes
+        self.downvotes = downvotes
+        self.score = wilson_lower_bound(upvotes, downvotes)
+
+    @property
+    def key(self) -> tuple[float, int]:
+        # Best first; among equal scores the newest suggestion first
+        return (-self.score, -self.message_id)
+
+
+class SuggestionRanking:
+    """Every suggestion's vote counts, kept ordered by Wilson score.
+
+    One ``SortedList`` of keys per (guild, status). A vote or a status
+    change removes the old key and inserts the new one, each O(log n);
+    a page is a slice, O(log n + page size).
+    """
+
+    def __init__(self):
+        self.entries: dict[int, RankedSuggestion] = {}
+        self.lists: dict[tuple[int, str], SortedList] = {}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _remove(self, entry: RankedSuggestion):
+        self.lists[(entry.guild_id, entry.status)].discard(entry.key)
+
+    def _insert(self, entry: RankedSuggestion):
+        keys = self.lists.get((entry.guild_id, entry.status))
+        if keys is None:
+            keys = self.lists[(entry.guild_id, entry.status)] = SortedList()
+        keys.add(entry.key)
+
+    # ---------- WRITES ----------
+
+    def add(self, message_id: int, guild_id: int, status: str, upvotes: int = 0, downvotes: int = 0):
+        old = self.entries.get(message_id)
+        if old is not None:
+            self._remove(old)
+        entry = self.entries[message_id] = RankedSuggestion(message_id, guild_id, status, upvotes, downvotes)
+        self._insert(entry)
+
+    def update(self, message_id: int, upvotes: int, downvotes: int):
+        entry = self.entries.get(message_id)
+        if entry is None:
+            return
+        self._remove(entry)
+        entry.upvotes = upvotes
+        entry.downvotes = downvotes
+        entry.score = wilson_lower_bound(upvotes, downvotes)
+        self._insert(entry)
+
+    def set_status(self, message_id: int, status: str):
+        entry = self.entries.get(message_id)
+        if entry is None or entry.status == status:
+            return
+        self._remove(entry)
+        entry.status = status
+        self._insert(entry)
+
+    def remove(self, message_id: int):
+        entry = self.entries.pop(message_id, None)
+        if entry is not None:
+            self._remove(entry)
+
+    # ---------- READS ----------
+
+    def count(self, guild_id: int, status: str) -> int:
+        return len(self.lists.get((guild_id, status), ()))
+
+    def page(self, guild_id: int, status: str, offset: int, limit: int) -> list[RankedSuggestion]:
+        keys = self.lists.get((guild_id, status))
+        if keys is None:
+            return []
+        return [self.entries[-message_id] for _, message_id in keys.islice(offset, offset + limit)]
@@ -0,0 +1,287 @@
+import asyncio
+import heapq
+import json
+import logging
+import math
+import re
+import time
+from datetime import timedelta
+from typing import Awaitable, Callable, Iterable
+
+from core.database import Database
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS timers (
+    id INTEGER PRIMARY KEY,
+    due_at REAL NOT NULL,
+    kind TEXT NOT NULL,
+    guild_id INTEGER NOT NULL,
+    target_id INTEGER,
+    payload TEXT
+);
+
+CREATE INDEX IF NOT EXISTS timers_due ON timers (due_at);
+CREATE INDEX IF NOT EXISTS timers_target ON timers (guild_id, target_id, kind);
+"""
+
+DURATION_PATTERN = re.compile(r"(\d+)\s*([smhdw])", re.IGNORECASE)
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+# Longest temp ban or mute; timeouts past Discord's 28-day cap are
+# renewed by a timer, so this is a sanity limit, not Discord's.
+MAX_DURATION = timedelta(days=365)
+
+
+def parse_duration(text: str, maximum: timedelta = MAX_DURATION) -> timedelta:
+    """ "1d12h", "90m", "2w" -> timedelta.
+
+    Raises ValueError if the text doesn't parse or adds up to more than
+    ``maximum`` (which also keeps huge inputs from overflowing timedelta).
+    """
+    text = text.strip()
+    matches = DURATION_PATTERN.findall(text)
+    if not matches or DURATION_PATTERN.sub("", text).strip():
+        raise ValueError(f"not a duration: {text!r}")
+
+    seconds = sum(int(amount) * DURATION_UNITS[unit.lower()] for amount, unit in matches)
+    if seconds > maximum.total_seconds():
+        raise ValueError(f"duration over {maximum.days} days: {text!r}")
+    return timedelta(seconds=seconds)
+
+# ---------- RECORDS ----------
+
+class Timer:
+    __slots__ = ("id", "due_at", "kind", "guild_id", "target_id", "payload")
+
+    def __init__(self, id, due_at, kind, guild_id, target_id, payload):
+        self.id = id
+        self.due_at = due_at
+        self.kind = kind
+        self.guild_id = guild_id
+        self.target_id = target_id
+        self.payload = payload
+
+    def __lt__(self, other: "Timer") -> bool:
+        return (self.due_at, self.id) < (other.due_at, other.id)
+
+# ---------- SCHEDULER ----------
+
+# Fires a batch of one kind; returns the timers to retry later (or None)
+Handler = Callable[[list[Timer]], Awaitable[Iterable[Timer] | None]]
+
+
+class TimerScheduler:
+    """Persistent timers (temp-ban lifts, mute renewals) driven by one task.
+
+    Every timer lives in SQLite; only those due within ``horizon`` seconds
+    are also held in an in-memory heap, refilled from the ``due_at``
+    index every ``horizon / 2`` seconds. A single loop sleeps until the
+    earliest of them and hands due timers to the handler registered for
+    their kind, up to ``batch`` at a time. Memory and task count don't
+    grow with the number of pending timers, and a restart just reloads
+    the due-soon window (anything overdue fires right away).
+
+    When running as one cluster of many, ``shard_ids``/``shard_count``
+    limit it to the guilds on this cluster's shards.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        horizon: float = 3600.0,
+        batch: int = 100,
+        retry_delay: float = 60.0,
+        shard_ids: list[int] | None = None,
+        shard_count: int | None = None
+    ):
+        self.db = Database(path)
+        self.horizon = horizon
+        self.batch = batch
+        self.retry_delay = retry_delay
+        self.shard_ids = shard_ids
+        self.shard_count = shard_count
+
+        self._handlers: dict[str, Handler] = {}
+        self._heap: list[Timer] = []
+        self._queued: set[int] = set()
+        self._cancelled: set[int] = set()
+        self._loaded_until = 0.0
+        self._refill_at = 0.0
+        self._wakeup = asyncio.Event()
+        self._runner: asyncio.Task | None = None
+
+        self.fired = 0
+
+    def register(self, kind: str, handler: Handler):
+        self._handlers[kind] = handler
+
+    def unregister(self, kind: str):
+        self._handlers.pop(kind, None)
+
+    # ---------- LIFECYCLE ----------
+
+    async def open(self):
+        await self.db.open()
+        await self.db.executescript(SCHEMA)
+
+    def start(self):
+        if self._runner is None:
+            self._runner = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._runner:
+            self._runner.cancel()
+            try:
+                await self._runner
+            except asyncio.CancelledError:
+                pass
+            self._runner = None
+        await self.db.close()
+
+    def pending(self) -> int:
+        """Timers currently held in memory (the due-soon window)."""
+        return len(self._queued) - len(self._cancelled)
+
+    # ---------- SCHEDULING ----------
+
+    async def schedule(
+        self,
+        kind: str,
+        due_at: float,
+        guild_id: int,
+        target_id: int | None = None,
+        payload: dict | None = None
+    ) -> Timer:
+        encoded = json.dumps(payload) if payload is not None else None
+
+        def insert(conn):
+            return conn.execute(
+                "INSERT INTO timers (due_at, kind, guild_id, target_id, payload) VALUES (?, ?, ?, ?, ?)",
+                (due_at, kind, guild_id, target_id, encoded)
+            ).lastrowid
+
+        timer = Timer(await self.db.transaction(insert), due_at, kind, guild_id, target_id, payload)
+
+        # Later timers are picked up by a refill once they come into range
+        if due_at < self._loaded_until:
+            self._push(timer)
+            self._wakeup.set()
+        return timer
+
+    async def cancel(self, kind: str, guild_id: int, target_id: int) -> int:
+        """Drop every pending ``kind`` timer for a target; returns how many."""
+
+        def delete(conn):
+            ids = [row[0] for row in conn.execute(
+                "SELECT id FROM timers WHERE guild_id = ? AND target_id = ? AND kind = ?",
+                (guild_id, target_id, kind)
+            )]
+            conn.executemany("DELETE FROM timers WHERE id = ?", [(i,) for i in ids])
+            return ids
+
+        ids = await self.db.transaction(delete)
+        # Heap entries are skipped lazily when they come up
+        self._cancelled.update(i for i in ids if i in self._queued)
+        return len(ids)
+
+    # ---------- LOOP ----------
+
+    def _push(self, timer: Timer):
+        # A refill can race schedule() for the same row; keep one copy
+        if timer.id not in self._queued:
+            self._queued.add(timer.id)
+            heapq.heappush(self._heap, timer)
+
+    def _shard_clause(self) -> tuple[str, tuple]:
+        if self.shard_ids is None or not self.shard_count:
+            return "", ()
+        marks = ", ".join("?" * len(self.shard_ids))
+        return f" AND (guild_id >> 22) % ? IN ({marks})", (self.shard_count, *self.shard_ids)
+
+    async def _refill(self, now: float):
+        until = now + self.horizon
+        clause, params = self._shard_clause()
+        rows = await self.db.fetchall(
+            "SELECT id, due_at, kind, guild_id, target_id, payload FROM timers "
+            f"WHERE due_at >= ? AND due_at < ?{clause}",
+            (self._loaded_until, until, *params)
+        )
+        for id, due_at, kind, guild_id, target_id, payload in rows:
+            self._push(Timer(id, due_at, kind, guild_id, target_id, json.loads(payload) if payload else None))
+
+        self._loaded_until = until
+        self._refill_at = now + self.horizon / 2
+
+    def _pop_due(self, now: float) -> list[Timer]:
+        due = []
+        while self._heap and self._heap[0].due_at <= now and len(due) < self.batch:
+            timer = heapq.heappop(self._heap)
+            self._queued.discard(timer.id)
+            if timer.id in self._cancelled:
+                self._cancelled.discard(timer.id)
+            else:
+                due.append(timer)
+        return due
+
+    async def _fire(self, due: list[Timer]):
+        by_kind: dict[str, list[Timer]] = {}
+        for timer in due:
+            by_kind.setdefault(timer.kind, []).append(timer)
+
+        retry: list[Timer] = []
+        for kind, timers in by_kind.items():
+            handler = self._handlers.get(kind)
+            if handler is None:
+                log.warning("No handler for %s %s timers, retrying later", len(timers), kind)
+                retry += timers
+                continue
+            try:
+                retry += list(await handler(timers) or ())
+            except Exception:
+                log.exception("Handler for %s %s timers failed, retrying later", len(timers), kind)
+                retry += timers
+
+        retry_ids = {timer.id for timer in retry}
+        done = [(timer.id,) for timer in due if timer.id not in retry_ids]
+        due_at = time.time() + self.retry_delay
+        for timer in retry:
+            timer.due_at = due_at
+            self._push(timer)
+
+        def write(conn):
+            conn.executemany("DELETE FROM timers WHERE id = ?", done)
+            conn.executemany("UPDATE timers SET due_at = ? WHERE id = ?", [(due_at, t.id) for t in retry])
+
+        await self.db.transaction(write)
+        self.fired += len(done)
+
+    async def _run(self):
+        while True:
+            now = time.time()
+            try:
+                if now >= self._refill_at:
+                    await self._refill(now)
+
+                due = self._pop_due(now)
+                if due:
+                    await self._fire(due)
+                    continue
+            except Exception:
+                log.exception("Timer loop failed, reloading from the database")
+                # The database is the source of truth; rebuild the window from it
+                self._heap.clear()
+                self._queued.clear()
+                self._cancelled.clear()
+                self._loaded_until = self._refill_at = 0.0
+                await asyncio.sleep(self.retry_delay)
+                continue
+
+            next_due = self._heap[0].due_at if self._heap else math.inf
+            delay = min(next_due, self._refill_at) - now
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(delay, 0))
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
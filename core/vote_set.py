@@ -0,0 +1,45 @@
+from array import array
+from bisect import bisect_left
+
+# ---------- VOTE SET ----------
+
+class VoteSet:
+    """Set of user IDs stored as a sorted ``array('Q')``.
+
+    Costs 8 bytes per member instead of the hash slot plus boxed int a
+    ``set[int]`` pays (see benchmarks/vote_memory.py). Membership is a binary
+    search; inserts and removals shift the tail, which is cheap at the
+    vote counts a single suggestion sees.
+    """
+
+    __slots__ = ("_ids",)
+
+    def __init__(self, ids=()):
+        self._ids = array("Q", sorted(set(ids)))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self):
+        return iter(self._ids)
+
+    def __contains__(self, user_id: int) -> bool:
+        ids = self._ids
+        i = bisect_left(ids, user_id)
+        return i < len(ids) and ids[i] == user_id
+
+    def add(self, user_id: int) -> bool:
+        ids = self._ids
+        i = bisect_left(ids, user_id)
+        if i < len(ids) and ids[i] == user_id:
+            return False
+        ids.insert(i, user_id)
+        return True
+
+    def discard(self, user_id: int) -> bool:
+        ids = self._ids
+        i = bisect_left(ids, user_id)
+        if i < len(ids) and ids[i] == user_id:
+            del ids[i]
+            return True
+        return False
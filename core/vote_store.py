@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import time
+
+from core.database import Database
+from core.suggestion_ranking import SuggestionRanking
+from core.vote_set import VoteSet
+
+UPVOTE = 1
+DOWNVOTE = -1
+
+log = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS suggestions (
+    message_id INTEGER PRIMARY KEY,
+    guild_id INTEGER NOT NULL,
+    channel_id INTEGER NOT NULL,
+    author_id INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    created_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS suggestion_votes (
+    message_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (message_id, user_id)
+) WITHOUT ROWID;
+"""
+
+# ---------- RECORDS ----------
+
+class SuggestionVotes:
+    __slots__ = ("message_id", "channel_id", "content", "upvotes", "downvotes")
+
+    def __init__(self, message_id: int, channel_id: int, content: str, upvotes=(), downvotes=()):
+        self.message_id = message_id
+        self.channel_id = channel_id
+        self.content = content
+        self.upvotes = VoteSet(upvotes)
+        self.downvotes = VoteSet(downvotes)
+
+    def results(self) -> str:
+        return f"✅ {len(self.upvotes)} ❌ {len(self.downvotes)}"
+
+# ---------- STORE ----------
+
+class VoteStore:
+    """Suggestion votes cached in memory and persisted to SQLite.
+
+    Votes are applied to the in-memory record immediately and queued for
+    the database; a background task writes the queue in one transaction
+    every ``flush_interval`` seconds (or sooner once ``max_batch`` is hit).
+
+    ``ranking`` orders every suggestion, open or closed, by score and is
+    updated in step with each vote and status change.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.5, max_batch: int = 500):
+        self.db = Database(path)
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+
+        self.open_suggestions: dict[int, SuggestionVotes] = {}
+        self.ranking = SuggestionRanking()
+        self._pending: dict[tuple[int, int], int] = {}
+        self._wakeup = asyncio.Event()
+        self._flusher: asyncio.Task | None = None
+
+    # ---------- LIFECYCLE ----------
+
+    async def open(self):
+        await self.db.open()
+        await self.db.executescript(SCHEMA)
+        await self.load()
+        self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def load(self):
+        # One query per table; votes are grouped first so each VoteSet is
+        # built with a single sort instead of one insert per row.
+        rows = await self.db.fetchall(
+            "SELECT message_id, channel_id, content FROM suggestions WHERE status = 'pending'"
+        )
+        votes = await self.db.fetchall(
+            "SELECT v.message_id, v.user_id, v.value FROM suggestion_votes v "
+            "JOIN suggestions s ON s.message_id = v.message_id WHERE s.status = 'pending'"
+        )
+
+        grouped: dict[int, tuple[list[int], list[int]]] = {}
+        for message_id, user_id, value in votes:
+            up, down = grouped.setdefault(message_id, ([], []))
+            (up if value == UPVOTE else down).append(user_id)
+
+        self.open_suggestions = {
+            message_id: SuggestionVotes(message_id, channel_id, content, *grouped.get(message_id, ((), ())))
+            for message_id, channel_id, content in rows
+        }
+
+        # Closed suggestions only need their final counts
+        counts = await self.db.fetchall(
+            "SELECT s.message_id, s.guild_id, s.status, "
+            "COALESCE(SUM(v.value = 1), 0), COALESCE(SUM(v.value = -1), 0) "
+            "FROM suggestions s LEFT JOIN suggestion_votes v ON v.message_id = s.message_id "
+            "GROUP BY s.message_id"
+        )
+        self.ranking = SuggestionRanking()
+        for message_id, guild_id, status, upvotes, downvotes in counts:
+            self.ranking.add(message_id, guild_id, status, upvotes, downvotes)
+
+    async def close(self):
+        if self._flusher:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+
+        await self.flush()
+        await self.db.close()
+
+    # ---------- SUGGESTIONS ----------
+
+    def get(self, message_id: int) -> SuggestionVotes | None:
+        return self.open_suggestions.get(message_id)
+
+    async def create(self, message_id: int, guild_id: int, channel_id: int, author_id: int, content: str) -> SuggestionVotes:
+        await self.db.execute(
+            "INSERT OR IGNORE INTO suggestions "
+            "(message_id, guild_id, channel_id, author_id, content, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (message_id, guild_id, channel_id, author_id, content, time.time())
+        )
+        record = SuggestionVotes(message_id, channel_id, content)
+        self.open_suggestions[message_id] = record
+        self.ranking.add(message_id, guild_id, "pending")
+        return record
+
+    async def close_suggestion(self, message_id: int, status: str) -> SuggestionVotes | None:
+        """Close an open suggestion; None if it was already closed.
+
+        The record is taken before the first await, so of two staff
+        members closing the same suggestion at once only one gets it.
+        """
+        record = self.open_suggestions.pop(message_id, None)
+        if record is None:
+            return None
+
+        self.ranking.set_status(message_id, status)
+        await self.flush()
+        await self.db.execute(
+            "UPDATE suggestions SET status = ? WHERE message_id = ?",
+            (status, message_id)
+        )
+        return record
+
+    async def merge(self, source_id: int, target_id: int) -> int | None:
+        """Fold the source suggestion's voters into the target and close the source as merged.
+
+        Set union: every source voter who has not voted on the target
+        gets the same vote there; a vote already on the target wins.
+        Returns how many votes moved, or None if either side is closed.
+        """
+        source = self.open_suggestions.get(source_id)
+        target = self.open_suggestions.get(target_id)
+        if source is None or target is None or source is target:
+            return None
+
+        moved = 0
+        for votes, value in ((source.upvotes, UPVOTE), (source.downvotes, DOWNVOTE)):
+            new = [u for u in votes if u not in target.upvotes and u not in target.downvotes]
+            if not new:
+                continue
+            # One rebuild per side instead of an insert per voter
+            if value == UPVOTE:
+                target.upvotes = VoteSet((*target.upvotes, *new))
+            else:
+                target.downvotes = VoteSet((*target.downvotes, *new))
+            for user_id in new:
+                self._pending[(target_id, user_id)] = value
+            moved += len(new)
+
+        self.ranking.update(target_id, len(target.upvotes), len(target.downvotes))
+        await self.close_suggestion(source_id, "merged")
+        return moved
+
+    async def texts(self) -> list[tuple[int, int, str]]:
+        """(message_id, guild_id, content) of every suggestion ever made."""
+        return await self.db.fetchall("SELECT message_id, guild_id, content FROM suggestions")
+
+    async def contents(self, message_ids: list[int]) -> dict[int, tuple[int, str]]:
+        """message_id -> (channel_id, content), from memory for open suggestions."""
+        found = {
+            message_id: (record.channel_id, record.content)
+            for message_id in message_ids
+            if (record := self.open_suggestions.get(message_id))
+        }
+        missing = [message_id for message_id in message_ids if message_id not in found]
+        if missing:
+            marks = ", ".join("?" * len(missing))
+            rows = await self.db.fetchall(
+                f"SELECT message_id, channel_id, content FROM suggestions WHERE message_id IN ({marks})",
+                tuple(missing)
+            )
+            found.update((message_id, (channel_id, content)) for message_id, channel_id, content in rows)
+        return found
+
+    # ---------- VOTES ----------
+
+    def vote(self, message_id: int, user_id: int, value: int) -> bool:
+        """Record a vote; returns False if the user already cast this vote."""
+        record = self.open_suggestions[message_id]
+        same, other = (
+            (record.upvotes, record.downvotes) if value == UPVOTE
+            else (record.downvotes, record.upvotes)
+        )
+
+        if user_id in same:
+            return False
+
+        other.discard(user_id)
+        same.add(user_id)
+
+        self.ranking.update(message_id, len(record.upvotes), len(record.downvotes))
+
+        self._pending[(message_id, user_id)] = value
+        if len(self._pending) >= self.max_batch:
+            self._wakeup.set()
+        return True
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.flush()
+            except Exception:
+                log.exception("Failed to flush suggestion votes, retrying next cycle")
+
+    async def flush(self):
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        rows = [(message_id, user_id, value) for (message_id, user_id), value in batch.items()]
+
+        def write(conn):
+            conn.executemany(
+                "INSERT INTO suggestion_votes (message_id, user_id, value) VALUES (?, ?, ?) "
+                "ON CONFLICT (message_id, user_id) DO UPDATE SET value = excluded.value",
+                rows
+            )
+
+        try:
+            await self.db.transaction(write)
+        except Exception:
+            # Keep the batch for the next attempt, without clobbering newer votes.
+            for key, value in batch.items():
+                self._pending.setdefault(key, value)
+            raise
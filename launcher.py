@@ -0,0 +1,149 @@
+"""Cluster launcher: runs HorizonBot across several worker processes.
+
+    python launcher.py --clusters 4 [--shards 16]
+
+Without --shards the launcher asks Discord for the recommended shard
+count. Shards are split into contiguous ranges, one worker process per
+range, and every worker connects back to a local IPC hub so commands
+like .bot_info can report totals for the whole bot. Crashed workers are
+restarted with backoff.
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import secrets
+import signal
+
+import aiohttp
+import discord
+from dotenv import load_dotenv
+
+from core.cluster import ClusterClient, ClusterHub, plan_clusters
+
+log = logging.getLogger("horizon.launcher")
+
+GATEWAY_URL = "https://discord.com/api/v10/gateway/bot"
+
+# ---------- WORKER ----------
+
+def run_cluster(cluster_id: int, shard_ids: list[int], shard_count: int, host: str, port: int, secret: str):
+    """Process entry point for one cluster."""
+    from main import HorizonBot, TOKEN
+
+    async def runner():
+        discord.utils.setup_logging()
+        cluster = ClusterClient(cluster_id, host, port, secret)
+        bot = HorizonBot(shard_ids=shard_ids, shard_count=shard_count, cluster=cluster)
+
+        # The launcher stops workers with SIGTERM; close cleanly so stores flush.
+        try:
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, lambda: asyncio.create_task(bot.close()))
+        except NotImplementedError:
+            pass
+
+        async with bot:
+            await bot.start(TOKEN)
+
+    asyncio.run(runner())
+
+# ---------- LAUNCHER ----------
+
+async def recommended_shards(token: str) -> int:
+    async with aiohttp.ClientSession() as session:
+        async with session.get(GATEWAY_URL, headers={"Authorization": f"Bot {token}"}) as response:
+            response.raise_for_status()
+            return (await response.json())["shards"]
+
+
+class Launcher:
+    def __init__(self, shard_count: int, clusters: int, worker=run_cluster, max_backoff: float = 60.0):
+        # ``worker`` is the per-process target; swap it to run the launcher
+        # against a stub bot without touching the gateway.
+        self.plan = plan_clusters(shard_count, clusters)
+        self.shard_count = shard_count
+        self.worker = worker
+        self.max_backoff = max_backoff
+
+        self.hub = ClusterHub(secret=secrets.token_hex(16))
+        self.processes: dict[int, multiprocessing.Process] = {}
+        self._context = multiprocessing.get_context("spawn")
+        self._stopping = asyncio.Event()
+
+    def _spawn(self, cluster_id: int) -> multiprocessing.Process:
+        process = self._context.Process(
+            target=self.worker,
+            args=(cluster_id, self.plan[cluster_id], self.shard_count, self.hub.host, self.hub.port, self.hub.secret),
+            name=f"horizon-cluster-{cluster_id}",
+            daemon=True
+        )
+        process.start()
+        self.processes[cluster_id] = process
+        log.info("Cluster %s started (pid %s, shards %s)", cluster_id, process.pid, self.plan[cluster_id])
+        return process
+
+    async def _supervise(self, cluster_id: int):
+        backoff = 1.0
+        loop = asyncio.get_running_loop()
+
+        while not self._stopping.is_set():
+            process = self._spawn(cluster_id)
+            await loop.run_in_executor(None, process.join)
+
+            if self._stopping.is_set() or process.exitcode == 0:
+                return
+
+            log.warning("Cluster %s exited with %s, restarting in %.0fs", cluster_id, process.exitcode, backoff)
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=backoff)
+            except asyncio.TimeoutError:
+                pass
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def stop(self):
+        self._stopping.set()
+        for process in self.processes.values():
+            if process.is_alive():
+                process.terminate()
+
+    async def run(self):
+        await self.hub.start()
+        log.info(
+            "Launching %s shards in %s clusters (IPC on %s:%s)",
+            self.shard_count, len(self.plan), self.hub.host, self.hub.port
+        )
+
+        try:
+            await asyncio.gather(*(self._supervise(cluster_id) for cluster_id in range(len(self.plan))))
+        finally:
+            self.stop()
+            await self.hub.close()
+
+# ---------- ENTRY ----------
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run Horizon as multiple sharded clusters.")
+    parser.add_argument("--clusters", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shards", type=int, help="total shard count (default: Discord's recommendation)")
+    args = parser.parse_args()
+
+    load_dotenv()
+    discord.utils.setup_logging()
+
+    shard_count = args.shards or await recommended_shards(os.getenv("DISCORD_TOKEN"))
+    launcher = Launcher(shard_count, args.clusters)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, launcher.stop)
+        except NotImplementedError:
+            pass
+
+    await launcher.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,14 +1,51 @@
 import discord
+from discord import app_commands
 from discord.ext import commands, tasks
 import os
+import sys
 import asyncio
+import logging
+import time
 from dotenv import load_dotenv
 
+from core.cluster import ClusterClient
+from core.command_sync import CommandSync
+from core.config import ConfigService
+from core.extension_loader import ExtensionLoader
+from core.interactions import DeadlineTracker
+from core.member_cache import MemberCache, cache_options
+from core.metrics import Metrics, MetricsServer, RateLimitCounter, interaction_label
+from core.rest_scheduler import RestScheduler, Priority
+from core.stats import BotStats
+from core.timers import TimerScheduler
+
 load_dotenv()
 
 TOKEN = os.getenv("DISCORD_TOKEN")
 GUILD_ID = int(os.getenv("GUILD_ID", 0))
 
+# Re-sync slash commands even if the command tree looks unchanged
+FORCE_SYNC = "--force-sync" in sys.argv
+
+STARTED_AT = time.perf_counter()
+
+log = logging.getLogger("horizon")
+
+# ---------- EXTENSIONS ----------
+
+# extension -> extensions it needs loaded first
+EXTENSIONS = {
+    "cogs.suggestions": (),
+    "cogs.utility": (),
+    "cogs.welcome": (),
+    "cogs.moderation": (),
+    "cogs.qa": (),
+    "cogs.help_panel": (),
+}
+
+# Prefix-only, staff-only: loaded on the first unknown prefix command
+LAZY_EXTENSIONS = ("cogs.utility",)
+
 # ---------- INTENTS ----------
 
 intents = discord.Intents.default()
@@ -17,14 +54,63 @@ intents.members = True
 
 # ---------- BOT ----------
 
-class HorizonBot(commands.Bot):
-    def __init__(self):
+class HorizonBot(commands.AutoShardedBot):
+    # Runs every shard in this process by default; launcher.py passes a
+    # shard range and an IPC client to run it as one cluster of many.
+
+    def __init__(
+        self,
+        *,
+        shard_ids: list[int] | None = None,
+        shard_count: int | None = None,
+        cluster: ClusterClient | None = None
+    ):
+        # config.json, parsed once and watched for changes
+        config = ConfigService("config.json")
+
         super().__init__(
             command_prefix=".",
             intents=intents,
-            help_command=None
+            help_command=None,
+            shard_ids=shard_ids,
+            shard_count=shard_count,
+            # Fail writes facing a long rate-limit wait instead of
+            # parking a REST scheduler worker inside discord.py.
+            max_ratelimit_timeout=30.0,
+            **cache_options(config.settings.member_cache_policy)
+        )
+
+        self.config = config
+        self.member_cache = MemberCache(
+            self,
+            config.settings.member_cache_policy,
+            config.settings.member_cache_size
         )
 
+        # Shared counters/timings for every cog
+        self.metrics = Metrics()
+        self.deadlines = DeadlineTracker(self.metrics)
+        self.rate_limits = RateLimitCounter(self.metrics)
+        self.metrics_server: MetricsServer | None = None
+
+        # Guild/member/user counts, kept current from gateway events
+        self.stats = BotStats(self)
+
+        # Every outbound write goes through here, by priority
+        self.rest = RestScheduler(route_limit=config.settings.rest_route_limit)
+
+        # Persistent timers (temp-ban lifts, ...); cogs register handlers.
+        # Clustered, each process only fires timers for its own shards.
+        self.timers = TimerScheduler(
+            config.settings.database_path,
+            shard_ids=shard_ids if cluster else None,
+            shard_count=shard_count if cluster else None
+        )
+
+        self.loader = ExtensionLoader(self, EXTENSIONS, lazy=LAZY_EXTENSIONS)
+        self.cluster = cluster
+        self.ready_logged = False
+
         # Status messages
         self.status_messages = [
             discord.Game("Managing Suggestions"),
@@ -35,24 +121,132 @@ class HorizonBot(commands.Bot):
         ]
 
     async def setup_hook(self):
+        self.rest.start()
+        self.config.start()
+        self.member_cache.install()
+        self.stats.install()
+        await self.start_metrics()
+
+        if self.cluster:
+            await self.cluster.connect(self.cluster_stats)
+
         # Load cogs
-        await self.load_extension("cogs.suggestions")
-        await self.load_extension("cogs.utility")
-        await self.load_extension("cogs.welcome")
-        await self.load_extension("cogs.moderation")
-        await self.load_extension("cogs.qa")
-        await self.load_extension("cogs.help_panel")
+        await self.timers.open()
+        await self.loader.load_all()
+        log.info("Extensions loaded\n%s", self.loader.table())
+        self.timers.start()
 
         # Start rotating status AFTER setup
         self.rotate_status.start()
 
         # -------- SLASH SYNC --------
+        # Commands are application-wide, so only the first cluster syncs
+        if self.cluster and self.cluster.cluster_id != 0:
+            return
+
+        # Only hits Discord when the tree's fingerprint changed since the last sync
+        command_sync = CommandSync("data/command_tree.json")
         if GUILD_ID:
             guild = discord.Object(id=GUILD_ID)
             self.tree.copy_global_to(guild=guild)
-            await self.tree.sync(guild=guild)
+            await command_sync.sync(self.tree, guild=guild, force=FORCE_SYNC)
         else:
-            await self.tree.sync()
+            await command_sync.sync(self.tree, force=FORCE_SYNC)
+
+    # ---------- METRICS ----------
+
+    async def start_metrics(self):
+        metrics = self.metrics
+        metrics.describe("interactions", "Interactions received, by command or component")
+        metrics.describe("command", "Slash command time from receipt to completion or failure", label="command")
+        metrics.describe("command.errors", "Slash commands that raised", label="command")
+        metrics.describe("gateway.latency", "Heartbeat round trip per shard, seconds", label="shard")
+
+        self.tree.error(self.tree_error)
+
+        metrics.register("gateway.latency", lambda: {str(shard): latency for shard, latency in self.latencies})
+        metrics.register("rest.dropped", lambda: self.rest.dropped, kind="counter")
+        metrics.register("rest.queued", self.rest.queued)
+        # discord.py retries 429s itself; its log line is the only trace
+        self.rate_limits.install()
+
+        settings = self.config.settings
+        if settings.metrics_port is None:
+            return
+
+        port = settings.metrics_port + (self.cluster.cluster_id if self.cluster else 0)
+        self.metrics_server = MetricsServer(metrics, settings.metrics_host, port)
+        try:
+            await self.metrics_server.start()
+        except OSError:
+            log.exception("Could not serve metrics on %s:%s", settings.metrics_host, port)
+            self.metrics_server = None
+
+    def dispatch(self, event_name: str, /, *args, **kwargs):
+        # Runs synchronously as the gateway event is parsed, before any
+        # command or view callback gets a chance to run.
+        if event_name == "interaction":
+            interaction = args[0]
+            interaction.extras["received"] = time.perf_counter()
+            self.metrics.count("interactions", interaction_label(interaction))
+            self.deadlines.track(interaction, self.config.settings.interaction_defer_seconds)
+        super().dispatch(event_name, *args, **kwargs)
+
+    async def on_app_command_completion(self, interaction: discord.Interaction, command):
+        self.observe_command(interaction, command.qualified_name)
+
+    async def tree_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
+        # Failures take time too; leaving them out would hide a slow tail
+        command = interaction.command
+        self.observe_command(interaction, command.qualified_name if command else "unknown")
+        await app_commands.CommandTree.on_error(self.tree, interaction, error)
+
+    def observe_command(self, interaction: discord.Interaction, name: str):
+        received = interaction.extras.get("received")
+        if received is not None:
+            self.metrics.histogram("command", time.perf_counter() - received, name)
+
+    # ---------- CLUSTER ----------
+
+    def cluster_stats(self) -> dict:
+        return {
+            "shards": len(self.shards),
+            "guilds": self.stats.guilds,
+            "users": self.stats.users,
+        }
+
+    async def global_stats(self) -> dict:
+        """Shard/guild/user counts across every cluster (just this one if unclustered)."""
+        if not self.cluster:
+            return self.cluster_stats()
+
+        await self.cluster.report(self.cluster_stats())
+        return await self.cluster.totals()
+
+    # ---------- EXTENSION TIMING ----------
+
+    async def add_cog(self, cog, **kwargs):
+        with self.loader.measure("setup"):
+            await super().add_cog(cog, **kwargs)
+
+    def add_view(self, view, **kwargs):
+        with self.loader.measure("views"):
+            super().add_view(view, **kwargs)
+
+    async def get_context(self, origin, *, cls=commands.Context):
+        ctx = await super().get_context(origin, cls=cls)
+
+        # Unknown prefix command: it may live in a lazy extension
+        if ctx.command is None and ctx.invoked_with and await self.loader.load_lazy():
+            ctx = await super().get_context(origin, cls=cls)
+        return ctx
+
+    async def on_ready(self):
+        if not self.ready_logged:
+            self.ready_logged = True
+            elapsed = time.perf_counter() - STARTED_AT
+            self.metrics.observe("startup.ready", elapsed)
+            log.info("Ready as %s in %.2fs", self.user, elapsed)
 
     # ---------- ROTATING STATUS ----------
 
@@ -61,9 +255,13 @@ class HorizonBot(commands.Bot):
         activity = self.status_messages.pop(0)
         self.status_messages.append(activity)
 
-        await self.change_presence(
-            status=discord.Status.online,
-            activity=activity
+        self.rest.post(
+            Priority.COSMETIC,
+            lambda: self.change_presence(
+                status=discord.Status.online,
+                activity=activity
+            ),
+            key="presence"
         )
 
     @rotate_status.before_loop
@@ -71,10 +269,33 @@ class HorizonBot(commands.Bot):
         # Ensure bot is fully ready
         await self.wait_until_ready()
 
+    # ---------- SHUTDOWN ----------
+
+    async def close(self):
+        # Unload cogs first so their final writes (logs, vote edits) are
+        # queued, then drain the scheduler while the HTTP session is open.
+        for extension in tuple(self.extensions):
+            try:
+                await self.unload_extension(extension)
+            except Exception:
+                pass
+
+        self.config.close()
+        await self.timers.close()
+        await self.rest.close()
+        self.rate_limits.uninstall()
+        if self.metrics_server:
+            await self.metrics_server.close()
+        if self.cluster:
+            await self.cluster.close()
+        await super().close()
+
 # ---------- RUN ----------
 
 async def main():
+    discord.utils.setup_logging()
     bot = HorizonBot()
     await bot.start(TOKEN)
 
-asyncio.run(main())
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Tests import the bot's packages the same way main.py does
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
@@ -0,0 +1,97 @@
+import pytest
+
+from core.antispam import SpamDetector, SpamRules, fingerprint
+
+GUILD_ID = 1
+CHANNEL_ID = 10
+SCAM = "FREE NITRO claim it at https://example.invalid/gift"
+
+
+class Feed:
+    def __init__(self, rules: SpamRules | None = None):
+        self.rules = rules or SpamRules()
+        self.detector = SpamDetector()
+        self.next_id = 0
+
+    def send(self, user_id: int, content: str, now: float, mentions: int = 0, channel_id: int = CHANNEL_ID):
+        self.next_id += 1
+        return self.detector.message(
+            self.rules, GUILD_ID, channel_id, user_id, self.next_id, content, mentions, now
+        )
+
+
+@pytest.mark.parametrize("text", ["gg", "lol", "LOL!!", "hahahahahahahaha", "good morning!", "Thank you"])
+def test_short_repetitive_and_common_messages_have_no_fingerprint(text):
+    assert fingerprint(text, 12) is None
+
+
+def test_fingerprint_ignores_case_and_spacing():
+    assert fingerprint(SCAM, 12) == fingerprint("  free   nitro CLAIM it at https://example.invalid/gift ", 12)
+
+
+def test_everyday_chat_does_not_trip_the_repeated_text_rules():
+    feed = Feed()
+    hits = [feed.send(user_id, "gg", 0.1 * user_id) for user_id in (1, 2, 3)]
+    hits += [feed.send(4, "lol", 1.0 + i) for i in range(3)]
+    hits += [feed.send(user_id, "good morning", 4.0 + 0.1 * user_id) for user_id in (5, 6, 7)]
+    assert hits == [None] * 9
+
+
+def test_same_long_text_from_one_user_is_a_duplicate():
+    feed = Feed()
+    hits = [feed.send(1, SCAM, float(i)) for i in range(3)]
+    assert hits[:2] == [None, None]
+    assert hits[2].kind == "duplicate"
+    assert hits[2].user_ids == [1]
+    assert len(hits[2].messages) == 3
+
+
+def test_same_long_text_from_several_users_is_copypasta():
+    feed = Feed()
+    hits = [feed.send(user_id, SCAM, 0.5 * user_id) for user_id in (1, 2, 3)]
+    assert hits[2].kind == "copypasta"
+    assert sorted(hits[2].user_ids) == [1, 2, 3]
+
+
+def test_repeats_outside_the_window_are_fine():
+    feed = Feed()
+    assert [feed.send(1, SCAM, 10.0 * i) for i in range(5)] == [None] * 5
+
+
+def test_message_rate():
+    feed = Feed(SpamRules(messages=4, window=2.0))
+    hits = [feed.send(1, f"message number {i}", 0.3 * i) for i in range(4)]
+    assert hits[:3] == [None] * 3
+    assert hits[3].kind == "rate"
+    # The user's history starts over after a hit
+    assert feed.send(1, "one more message", 1.0) is None
+
+
+def test_mass_mentions():
+    feed = Feed()
+    assert feed.send(1, "hey", 0.0, mentions=7) is None
+    assert feed.send(1, "hey", 1.0, mentions=8).kind == "mentions"
+
+
+def test_channel_flood_from_many_users():
+    feed = Feed(SpamRules(channel_messages=10, window=5.0))
+    hits = [feed.send(user_id, f"hello from {user_id}", 0.1 * user_id) for user_id in range(10)]
+    assert hits[:9] == [None] * 9
+    assert hits[9].kind == "flood"
+
+
+def test_join_raid():
+    rules = SpamRules(raid_joins=5, raid_window=10.0)
+    detector = SpamDetector()
+    assert [detector.join(rules, GUILD_ID, 3.0 * i) for i in range(5)] == [None] * 5
+    hits = [detector.join(rules, GUILD_ID, 100.0 + i) for i in range(5)]
+    assert hits[:4] == [None] * 4
+    assert hits[4].kind == "raid"
+
+
+def test_per_user_state_is_capped():
+    detector = SpamDetector(user_capacity=100)
+    rules = SpamRules()
+    for user_id in range(1000):
+        detector.message(rules, GUILD_ID, CHANNEL_ID, user_id, user_id, "hello there", 0, float(user_id))
+    assert len(detector.users) == 100
@@ -0,0 +1,77 @@
+import asyncio
+
+import discord
+
+from core.bulk import BulkResult, ProgressReporter, format_failures, parse_ids, run_bulk
+from core.rest_scheduler import RestScheduler
+
+
+class FakeInteraction:
+    id = 1
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.shown: list[str] = []
+
+    def is_expired(self) -> bool:
+        return False
+
+    async def edit_original_response(self, *, embed: discord.Embed):
+        await asyncio.sleep(self.delay)
+        self.shown.append(embed.description)
+
+
+class FakeResponse:
+    status = 403
+    reason = "Forbidden"
+
+
+def test_parse_ids_reads_mentions_and_drops_duplicates():
+    text = "<@123456789012345678> 223456789012345678, 123456789012345678 and 42"
+    assert parse_ids(text) == [123456789012345678, 223456789012345678]
+    assert parse_ids(None) == []
+
+
+def test_run_bulk_records_failures_and_carries_on():
+    targets = [discord.Object(id=i) for i in range(1, 7)]
+
+    async def action(target):
+        if target.id % 3 == 0:
+            raise discord.Forbidden(FakeResponse(), "Missing Permissions")
+
+    async def scenario():
+        result = BulkResult(len(targets))
+        reports = []
+        await run_bulk(targets, action, result, concurrency=2, progress=lambda r: reports.append(r.done))
+        return result, reports
+
+    result, reports = asyncio.run(scenario())
+    assert sorted(result.succeeded) == [1, 2, 4, 5]
+    assert result.failed == {3: "missing permissions", 6: "missing permissions"}
+    assert reports == [1, 2, 3, 4, 5, 6]
+
+
+def test_format_failures_fits_the_limit():
+    failed = {user_id: "missing permissions" for user_id in range(10 ** 17, 10 ** 17 + 100)}
+    text = format_failures(failed, limit=200)
+    assert len(text) <= 200
+    assert text.endswith("more")
+
+
+def test_final_edit_is_not_overwritten_by_slow_progress():
+    async def scenario():
+        rest = RestScheduler()
+        rest.start()
+        interaction = FakeInteraction(delay=0.05)
+        progress = ProgressReporter(rest, interaction, "Bulk", lambda: "1/2 done", interval=0)
+
+        progress(None)
+        await asyncio.sleep(0.01)
+        # The progress edit is in flight while the run completes
+        await progress.finish(discord.Embed(description="done"))
+        progress(None)
+        await asyncio.sleep(0.1)
+        await rest.close()
+        return interaction.shown
+
+    assert asyncio.run(scenario()) == ["⏳ 1/2 done", "done"]
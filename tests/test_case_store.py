@@ -0,0 +1,76 @@
+import asyncio
+import itertools
+
+from core import case_store
+from core.case_store import CaseStore
+
+GUILD_ID = 1
+
+
+async def open_store(path) -> CaseStore:
+    store = CaseStore(str(path), flush_interval=3600)
+    await store.open()
+    return store
+
+
+async def walk(store: CaseStore, **filters) -> list[int]:
+    seen, after = [], None
+    while True:
+        page = await store.page(GUILD_ID, after=after, limit=4, **filters)
+        if not page:
+            return seen
+        seen += [case.id for case in page]
+        after = (page[-1].created_at, page[-1].id)
+
+
+def test_pages_cover_every_case_once_newest_first(tmp_path, monkeypatch):
+    # Pairs of cases share a timestamp, so the id tie-break matters
+    clock = (1000.0 + i // 2 for i in itertools.count())
+    monkeypatch.setattr(case_store.time, "time", lambda: next(clock))
+
+    async def scenario():
+        store = await open_store(tmp_path / "cases.db")
+        for i in range(15):
+            store.record(GUILD_ID, "mute", 100 + i % 3, 7, "spam")
+        store.record(2, "ban", 100, 7)
+        ids = await walk(store)
+        await store.close()
+        return ids
+
+    assert asyncio.run(scenario()) == list(range(15, 0, -1))
+
+
+def test_filters_narrow_the_pages(tmp_path):
+    async def scenario():
+        store = await open_store(tmp_path / "cases.db")
+        for i in range(12):
+            store.record(GUILD_ID, "kick", 100 + i % 3, 7 + i % 2)
+        by_target = await walk(store, target_id=100)
+        by_moderator = await walk(store, moderator_id=8)
+        count = await store.count(GUILD_ID, 100)
+        none_since = await store.page(GUILD_ID, since=4102444800.0)
+        await store.close()
+        return by_target, by_moderator, count, none_since
+
+    by_target, by_moderator, count, none_since = asyncio.run(scenario())
+    assert by_target == [10, 7, 4, 1]
+    assert by_moderator == [12, 10, 8, 6, 4, 2]
+    assert count == 4
+    assert none_since == []
+
+
+def test_recorded_cases_survive_a_restart(tmp_path):
+    path = tmp_path / "cases.db"
+
+    async def scenario():
+        store = await open_store(path)
+        store.record(GUILD_ID, "ban", 100, 7, "raid", 3600)
+        await store.close()
+
+        store = await open_store(path)
+        cases = await store.page(GUILD_ID)
+        await store.close()
+        return cases
+
+    [case] = asyncio.run(scenario())
+    assert (case.action, case.target_id, case.moderator_id, case.reason, case.duration_seconds) == ("ban", 100, 7, "raid", 3600)
@@ -0,0 +1,98 @@
+import asyncio
+import functools
+import json
+import os
+import sys
+from pathlib import Path
+
+from core.cluster import ClusterClient, ClusterHub, plan_clusters
+from launcher import Launcher
+
+SHARDS = 4
+CLUSTERS = 2
+
+# ---------- STUB WORKER ----------
+
+def write_json(path: Path, data: dict):
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(data))
+    os.replace(temporary, path)
+
+
+def stub_worker(directory: str, cluster_id: int, shard_ids: list[int], shard_count: int, host: str, port: int, secret: str):
+    """Stands in for run_cluster: talks to the hub like a bot would, never to Discord."""
+    directory = Path(directory)
+    attempts = directory / f"attempts-{cluster_id}"
+    attempt = int(attempts.read_text()) + 1 if attempts.exists() else 1
+    attempts.write_text(str(attempt))
+
+    if cluster_id == 0 and attempt == 1:
+        # Crash on first start so the launcher has to restart it
+        sys.exit(3)
+
+    async def run():
+        client = ClusterClient(cluster_id, host, port, secret, report_interval=0.05)
+        await client.connect(lambda: {
+            "shards": len(shard_ids),
+            "guilds": 10 * (cluster_id + 1),
+            "users": 100 * (cluster_id + 1),
+        })
+
+        totals = await client.totals()
+        while totals["clusters"] < CLUSTERS:
+            await asyncio.sleep(0.05)
+            totals = await client.totals()
+        write_json(directory / f"totals-{cluster_id}.json", {"shards": shard_ids, "count": shard_count, "totals": totals})
+
+        # Stay connected until every cluster has seen the full totals
+        while not all((directory / f"totals-{i}.json").exists() for i in range(CLUSTERS)):
+            await asyncio.sleep(0.05)
+        await client.close()
+
+    asyncio.run(run())
+
+# ---------- TESTS ----------
+
+def test_plan_clusters_splits_shards_into_contiguous_ranges():
+    assert plan_clusters(10, 3) == [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]]
+    assert plan_clusters(2, 5) == [[0], [1]]
+
+
+def test_launcher_runs_stub_clusters_and_restarts_a_crashed_one(tmp_path):
+    launcher = Launcher(SHARDS, CLUSTERS, worker=functools.partial(stub_worker, str(tmp_path)))
+
+    asyncio.run(asyncio.wait_for(launcher.run(), timeout=60))
+
+    assert (tmp_path / "attempts-0").read_text() == "2"
+    assert (tmp_path / "attempts-1").read_text() == "1"
+
+    expected = {"clusters": 2, "shards": 4, "guilds": 30, "users": 300}
+    for cluster_id, shard_ids in enumerate(plan_clusters(SHARDS, CLUSTERS)):
+        report = json.loads((tmp_path / f"totals-{cluster_id}.json").read_text())
+        assert report == {"shards": shard_ids, "count": SHARDS, "totals": expected}
+    assert all(process.exitcode == 0 for process in launcher.processes.values())
+
+
+def test_hub_ignores_clusters_with_the_wrong_secret():
+    async def scenario():
+        hub = ClusterHub(secret="right")
+        host, port = await hub.start()
+
+        intruder = ClusterClient(0, host, port, "wrong")
+        await intruder.connect(lambda: {"shards": 1, "guilds": 5, "users": 50})
+        member = ClusterClient(1, host, port, "right")
+        await member.connect(lambda: {"shards": 2, "guilds": 7, "users": 70})
+        await asyncio.sleep(0.1)
+
+        totals = await member.totals()
+        await intruder.close()
+        await member.close()
+        await asyncio.sleep(0.05)
+        remaining = dict(hub.stats)
+        await hub.close()
+        return totals, remaining
+
+    totals, remaining = asyncio.run(scenario())
+    assert totals == {"clusters": 1, "shards": 2, "guilds": 7, "users": 70}
+    # A cluster that disconnects stops counting towards the totals
+    assert remaining == {}
@@ -0,0 +1,42 @@
+import asyncio
+
+import discord
+from discord import app_commands
+
+from core.command_sync import CommandSync, tree_fingerprint
+
+
+def make_tree(*names: str, description: str = "Says hi") -> app_commands.CommandTree:
+    tree = app_commands.CommandTree(discord.Client(intents=discord.Intents.none()))
+    for name in names:
+        async def callback(interaction: discord.Interaction):
+            pass
+
+        tree.add_command(app_commands.Command(name=name, description=description, callback=callback))
+    return tree
+
+
+def test_fingerprint_ignores_registration_order_but_not_definitions():
+    assert tree_fingerprint(make_tree("hello", "ping")) == tree_fingerprint(make_tree("ping", "hello"))
+    assert tree_fingerprint(make_tree("hello")) != tree_fingerprint(make_tree("hello", description="Says hello"))
+    assert tree_fingerprint(make_tree("hello")) != tree_fingerprint(make_tree("hello", "ping"))
+
+
+def test_sync_is_skipped_until_the_tree_changes(tmp_path):
+    syncs = []
+
+    async def scenario():
+        path = str(tmp_path / "state" / "commands.json")
+        results = []
+        for tree, force in ((make_tree("hello"), False), (make_tree("hello"), False),
+                            (make_tree("hello"), True), (make_tree("hello", "ping"), False)):
+            async def sync(guild=None):
+                syncs.append(guild)
+
+            tree.sync = sync
+            # A fresh CommandSync each time: the fingerprint survives restarts on disk
+            results.append(await CommandSync(path).sync(tree, force=force))
+        return results
+
+    assert asyncio.run(scenario()) == [True, False, True, True]
+    assert len(syncs) == 3
@@ -0,0 +1,44 @@
+import json
+import os
+
+from core.config import ConfigService
+
+
+def write(path, data: dict, mtime: float):
+    path.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_guild_overrides_fall_back_to_the_top_level_defaults(tmp_path):
+    path = tmp_path / "config.json"
+    write(path, {
+        "staff_role_id": 1,
+        "qa_stale_days": 3,
+        "vote_edit_window_seconds": 5.0,
+        "guilds": {"100": {"staff_role_id": 2}}
+    }, 1000)
+
+    config = ConfigService(str(path))
+    assert config.settings.vote_edit_window_seconds == 5.0
+    assert (config.guild(100).staff_role_id, config.guild(100).qa_stale_days) == (2, 3)
+    assert (config.guild(200).staff_role_id, config.guild(200).qa_stale_days) == (1, 3)
+    assert config.guild(None) is config.default
+
+
+def test_reload_only_on_change_and_a_bad_edit_keeps_the_last_good_config(tmp_path):
+    path = tmp_path / "config.json"
+    write(path, {"staff_role_id": 1}, 1000)
+    config = ConfigService(str(path))
+    reloads = []
+    config.on_reload(lambda service: reloads.append(service.default.staff_role_id))
+
+    unchanged = config.maybe_reload()
+    write(path, {"staff_role_id": 2, "not_a_setting": True}, 2000)
+    changed = config.maybe_reload()
+    path.write_text("{ not json", encoding="utf-8")
+    os.utime(path, (3000, 3000))
+    broken = config.maybe_reload()
+
+    assert (unchanged, changed, broken) == (False, True, False)
+    assert reloads == [2]
+    assert config.default.staff_role_id == 2
@@ -0,0 +1,114 @@
+import asyncio
+
+from core.edit_coalescer import EditCoalescer
+from core.rest_scheduler import RestScheduler
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int):
+        self.id = channel_id
+
+
+class FakeMessage:
+    def __init__(self, message_id: int):
+        self.id = message_id
+        self.channel = FakeChannel(1)
+        self.edits: list[dict] = []
+
+    async def edit(self, **kwargs):
+        self.edits.append(kwargs)
+        return self
+
+
+def test_burst_of_votes_becomes_two_edits():
+    async def scenario():
+        rest = RestScheduler()
+        rest.start()
+        edits = EditCoalescer(rest, window=0.05)
+        message = FakeMessage(100)
+
+        for count in range(1, 11):
+            edits.submit(message, lambda count=count: {"content": str(count)})
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.2)
+
+        await edits.close()
+        await rest.close()
+        return message, edits.stats()
+
+    message, stats = asyncio.run(scenario())
+    # The first vote is shown right away, the rest collapse into the latest state
+    assert [edit["content"] for edit in message.edits] == ["1", "10"]
+    assert stats == {"votes_received": 10, "edits_sent": 2, "edits_saved": 8, "pending": 0}
+
+
+def test_discarded_edit_is_not_counted_as_sent():
+    async def scenario():
+        # No workers: the edit stays queued until it is discarded
+        rest = RestScheduler()
+        edits = EditCoalescer(rest, window=0.05)
+        message = FakeMessage(100)
+
+        edits.submit(message, lambda: {"content": "1"})
+        await asyncio.sleep(0)
+        await edits.discard(message.id)
+        await asyncio.sleep(0)
+
+        await edits.close()
+        return message, edits.stats()
+
+    message, stats = asyncio.run(scenario())
+    assert message.edits == []
+    assert stats["edits_sent"] == 0
+
+
+def test_edits_to_different_messages_are_independent():
+    async def scenario():
+        rest = RestScheduler()
+        rest.start()
+        edits = EditCoalescer(rest, window=0.05)
+        first, second = FakeMessage(100), FakeMessage(200)
+
+        edits.submit(first, lambda: {"content": "a"})
+        edits.submit(second, lambda: {"content": "b"})
+        await asyncio.sleep(0.1)
+
+        await edits.close()
+        await rest.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first.edits == [{"content": "a"}]
+    assert second.edits == [{"content": "b"}]
+
+
+def test_discard_waits_for_an_edit_already_being_sent():
+    async def scenario():
+        rest = RestScheduler()
+        rest.start()
+        edits = EditCoalescer(rest, window=0.05)
+        message = FakeMessage(100)
+        release = asyncio.Event()
+        order = []
+
+        async def slow_edit(**kwargs):
+            await release.wait()
+            order.append("vote edit")
+
+        message.edit = slow_edit
+        edits.submit(message, lambda: {"content": "1"})
+        await asyncio.sleep(0.01)
+
+        discarding = asyncio.create_task(edits.discard(message.id))
+        await asyncio.sleep(0.01)
+        assert not discarding.done()
+
+        release.set()
+        await discarding
+        order.append("final edit")
+
+        await edits.close()
+        await rest.close()
+        return order
+
+    assert asyncio.run(scenario()) == ["vote edit", "final edit"]
@@ -0,0 +1,59 @@
+import asyncio
+
+import pytest
+
+from core.extension_loader import ExtensionLoader
+
+
+class FakeBot:
+    def __init__(self):
+        self.events: list[tuple[str, str]] = []
+        self.loader: ExtensionLoader | None = None
+
+    async def load_extension(self, name: str):
+        self.events.append(("start", name))
+        await asyncio.sleep(0.01)
+        with self.loader.measure("setup"):
+            await asyncio.sleep(0.01)
+        self.events.append(("end", name))
+
+
+def make_loader(extensions, lazy=()):
+    bot = FakeBot()
+    bot.loader = ExtensionLoader(bot, extensions, lazy=lazy)
+    return bot, bot.loader
+
+
+def test_independent_extensions_load_together_and_dependants_wait():
+    bot, loader = make_loader({"cogs.a": (), "cogs.b": (), "cogs.c": ("cogs.a", "cogs.b")})
+    asyncio.run(loader.load_all())
+
+    starts = [name for event, name in bot.events if event == "start"]
+    # a and b start before either has finished; c only after both
+    assert set(starts[:2]) == {"cogs.a", "cogs.b"}
+    assert bot.events.index(("start", "cogs.b")) < bot.events.index(("end", "cogs.a"))
+    assert bot.events.index(("start", "cogs.c")) > max(
+        bot.events.index(("end", "cogs.a")), bot.events.index(("end", "cogs.b"))
+    )
+    # setup() time is attributed to the extension that ran it
+    assert all(0 < loader.timings[name].setup <= loader.timings[name].total for name in ("cogs.a", "cogs.b", "cogs.c"))
+
+
+def test_unresolvable_dependencies_are_reported():
+    _, loader = make_loader({"cogs.a": ("cogs.b",), "cogs.b": ("cogs.a",)})
+    with pytest.raises(RuntimeError, match="cogs.a"):
+        asyncio.run(loader.load_all())
+
+
+def test_lazy_extensions_load_once_on_demand():
+    async def scenario():
+        bot, loader = make_loader({"cogs.a": (), "cogs.help": ()}, lazy=("cogs.help",))
+        await loader.load_all()
+        at_startup = [name for event, name in bot.events if event == "start"]
+        first, second = await asyncio.gather(loader.load_lazy(), loader.load_lazy())
+        return at_startup, (first, second), loader.timings["cogs.help"].lazy
+
+    at_startup, results, lazy = asyncio.run(scenario())
+    assert at_startup == ["cogs.a"]
+    assert sorted(results) == [False, True]
+    assert lazy
@@ -0,0 +1,93 @@
+import asyncio
+import re
+from types import SimpleNamespace
+
+import discord
+
+from core.interactions import DeadlineResponse, DeadlineTracker, has_handler
+from core.metrics import Metrics
+
+BUTTON = discord.ComponentType.button.value
+
+
+def make_interaction(kind, custom_id="", message_id=None, command=None, store=None):
+    store = store or SimpleNamespace(_views={}, _modals={}, _dynamic_items={})
+    return SimpleNamespace(
+        type=kind,
+        data={"custom_id": custom_id, "component_type": BUTTON},
+        message=SimpleNamespace(id=message_id) if message_id else None,
+        command=command,
+        extras={},
+        _state=SimpleNamespace(_view_store=store),
+    )
+
+
+def test_only_interactions_with_a_registered_handler_are_handled():
+    store = SimpleNamespace(
+        _views={None: {(BUTTON, "horizon:vote:up"): object()}, 5: {(BUTTON, "abc"): object()}},
+        _modals={"modal-1": object()},
+        _dynamic_items={re.compile(r"horizon:qa:solved:(?P<id>[0-9]+)"): object},
+    )
+    component = discord.InteractionType.component
+    modal = discord.InteractionType.modal_submit
+    command = discord.InteractionType.application_command
+
+    assert has_handler(make_interaction(component, "horizon:vote:up", message_id=9, store=store))
+    assert has_handler(make_interaction(component, "abc", message_id=5, store=store))
+    assert has_handler(make_interaction(component, "horizon:qa:solved:42", message_id=9, store=store))
+    # A timed-out view's button, or one on another message
+    assert not has_handler(make_interaction(component, "abc", message_id=6, store=store))
+    assert has_handler(make_interaction(modal, "modal-1", store=store))
+    assert not has_handler(make_interaction(modal, "modal-2", store=store))
+    assert has_handler(make_interaction(command, command=SimpleNamespace(extras={})))
+    assert not has_handler(make_interaction(command))
+
+
+def test_tracker_leaves_unhandled_interactions_alone():
+    interaction = make_interaction(discord.InteractionType.component, "expired")
+    DeadlineTracker(Metrics()).track(interaction, 2.0)
+    assert not hasattr(interaction, "_cs_response")
+
+
+def test_unknown_view_store_layout_falls_back_to_measuring_only():
+    async def scenario():
+        interaction = make_interaction(discord.InteractionType.component, "abc", store=SimpleNamespace())
+        handled = has_handler(interaction)
+        DeadlineTracker(Metrics()).track(interaction, 2.0)
+        return handled, interaction._cs_response
+
+    handled, response = asyncio.run(scenario())
+    assert handled is None
+    assert isinstance(response, DeadlineResponse)
+    assert response._timer is None
+
+
+def test_automatic_defer_keeps_the_reply_visibility(monkeypatch):
+    calls = []
+
+    async def defer(self, **kwargs):
+        calls.append(kwargs)
+
+    monkeypatch.setattr(discord.InteractionResponse, "defer", defer)
+    tracker = DeadlineTracker(Metrics())
+
+    async def auto_defer(interaction):
+        response = DeadlineResponse(interaction, tracker)
+        response._expire()
+        await response._deferring
+        return response._auto_deferred
+
+    command = discord.InteractionType.application_command
+    interactions = [
+        make_interaction(discord.InteractionType.component, "abc"),
+        make_interaction(command, command=SimpleNamespace(qualified_name="ping", extras={})),
+        make_interaction(command, command=SimpleNamespace(qualified_name="poll", extras={"public": True})),
+    ]
+    deferred = [asyncio.run(auto_defer(interaction)) for interaction in interactions]
+
+    assert deferred == [True, True, True]
+    assert calls == [
+        {"thinking": False},
+        {"ephemeral": True, "thinking": True},
+        {"ephemeral": False, "thinking": True},
+    ]
@@ -0,0 +1,31 @@
+import asyncio
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+from discord import app_commands
+
+import main
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture(autouse=True)
+def repo_root(monkeypatch):
+    # HorizonBot reads config.json from the working directory
+    monkeypatch.chdir(ROOT)
+
+
+def test_failed_commands_are_in_the_latency_histogram():
+    async def scenario():
+        bot = main.HorizonBot()
+        bot.tree.error(bot.tree_error)
+        command = SimpleNamespace(qualified_name="ban", _has_any_error_handlers=lambda: True)
+        interaction = SimpleNamespace(extras={"received": time.perf_counter() - 0.3}, command=command)
+        await bot.tree.on_error(interaction, app_commands.CheckFailure("not staff"))
+        return bot.metrics.histograms[("command", "ban")]
+
+    histogram = asyncio.run(scenario())
+    assert sum(histogram.counts) == 1
+    assert histogram.total >= 0.3
@@ -0,0 +1,70 @@
+from types import SimpleNamespace
+
+import discord
+
+from core.member_cache import LEAN, MemberCache
+
+STAFF_ROLE = 50
+BOT_ID = 999
+
+
+class FakeGuild(discord.Guild):
+    def __init__(self, guild_id: int):
+        self.id = guild_id
+        self._members = {}
+
+
+class FakeMember(discord.Member):
+    def __init__(self, guild: FakeGuild, user_id: int, roles=()):
+        self.guild = guild
+        self._user = SimpleNamespace(id=user_id)
+        self.role_ids = set(roles)
+
+    def get_role(self, role_id: int):
+        return role_id if role_id in self.role_ids else None
+
+
+def make_cache(guilds, capacity: int) -> MemberCache:
+    config = SimpleNamespace(guild=lambda guild_id: SimpleNamespace(staff_role_id=STAFF_ROLE))
+    bot = SimpleNamespace(
+        config=config,
+        user=SimpleNamespace(id=BOT_ID),
+        get_guild=lambda guild_id: guilds.get(guild_id)
+    )
+    return MemberCache(bot, LEAN, capacity=capacity)
+
+
+def test_least_recently_active_members_are_evicted_first():
+    guild = FakeGuild(1)
+    cache = make_cache({1: guild}, capacity=2)
+    a, b, c = (FakeMember(guild, user_id) for user_id in (10, 11, 12))
+
+    cache.touch(a)
+    cache.touch(b)
+    cache.touch(a)  # a is now more recent than b
+    cache.touch(c)
+
+    assert set(guild._members) == {10, 12}
+    assert list(cache.recent) == [(1, 10), (1, 12)]
+
+
+def test_staff_stay_cached_outside_the_recent_capacity():
+    guild = FakeGuild(1)
+    cache = make_cache({1: guild}, capacity=1)
+    moderator = FakeMember(guild, 20, roles=(STAFF_ROLE,))
+
+    cache.touch(moderator)
+    for user_id in range(30, 40):
+        cache.touch(FakeMember(guild, user_id))
+
+    assert set(guild._members) == {20, 39}
+    assert cache.staff == {1: {20}}
+    assert (1, 20) not in cache.recent
+
+
+def test_full_policy_leaves_the_cache_to_discord_py():
+    guild = FakeGuild(1)
+    cache = make_cache({1: guild}, capacity=1)
+    cache.policy = "full"
+    cache.touch(FakeMember(guild, 10))
+    assert guild._members == {}
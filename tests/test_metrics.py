@@ -0,0 +1,29 @@
+import logging
+
+from core.metrics import Metrics, RateLimitCounter, route_label
+
+
+def test_rate_limit_warnings_are_counted_per_route():
+    metrics = Metrics()
+    counter = RateLimitCounter(metrics)
+    counter.install()
+    http = logging.getLogger("discord.http")
+    try:
+        fmt = "We are being rate limited. %s %s responded with 429. Retrying in %.2f seconds."
+        http.warning(fmt, "PATCH", "https://discord.com/api/v10/channels/1/messages/2", 0.5)
+        http.warning(fmt, "PATCH", "https://discord.com/api/v10/channels/3/messages/4", 0.5)
+        http.warning("Global rate limit has been hit. Retrying in %.2f seconds.", 0.5)
+        http.warning("Unrelated warning")
+    finally:
+        counter.uninstall()
+    http.warning(fmt, "PATCH", "https://discord.com/api/v10/channels/1/messages/2", 0.5)
+
+    assert metrics.labelled == {("rest.rate_limited", "PATCH /channels/{id}/messages/{id}"): 2}
+    assert 'horizon_rest_rate_limited_total{route="PATCH /channels/{id}/messages/{id}"} 2' in metrics.render()
+
+
+def test_route_labels_hide_ids_and_tokens():
+    assert route_label("POST", "https://discord.com/api/v10/webhooks/1/secret/messages/@original") == (
+        "POST /webhooks/{id}/{token}/messages/@original"
+    )
+    assert route_label("DELETE", "https://discord.com/api/v10/guilds/5/bans/6") == "DELETE /guilds/{id}/bans/{id}"
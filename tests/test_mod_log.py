@@ -0,0 +1,75 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from core.mod_log import ModLog
+from core.rest_scheduler import RestScheduler
+
+LOG_CHANNEL = 500
+
+
+class FakeChannel:
+    def __init__(self):
+        self.sent: list[list[discord.Embed]] = []
+
+    async def send(self, embeds):
+        self.sent.append(embeds)
+
+
+def make_log(window: float):
+    channel = FakeChannel()
+    rest = RestScheduler()
+    bot = SimpleNamespace(
+        rest=rest,
+        config=SimpleNamespace(guild=lambda guild_id: SimpleNamespace(
+            mod_log_webhook_url=None, mod_log_channel_id=LOG_CHANNEL
+        )),
+        get_channel=lambda channel_id: channel if channel_id == LOG_CHANNEL else None
+    )
+    return ModLog(bot, window=window), rest, channel
+
+
+def entry(number: int, text: str = "") -> discord.Embed:
+    return discord.Embed(title=f"Case {number}", description=text)
+
+
+def test_entries_within_the_window_share_one_message():
+    async def scenario():
+        mod_log, rest, channel = make_log(window=0.05)
+        rest.start()
+        guild = SimpleNamespace(id=1)
+        for number in range(3):
+            mod_log.log(guild, entry(number))
+        await asyncio.sleep(0.01)
+        before_window = len(channel.sent)
+        await asyncio.sleep(0.1)
+        await rest.close()
+        return before_window, channel.sent
+
+    before_window, sent = asyncio.run(scenario())
+    assert before_window == 0
+    assert [[embed.title for embed in message] for message in sent] == [["Case 0", "Case 1", "Case 2"]]
+
+
+def test_a_full_message_is_sent_at_once_and_batches_respect_the_size_limit():
+    async def scenario():
+        mod_log, rest, channel = make_log(window=3600)
+        rest.start()
+        guild = SimpleNamespace(id=1)
+        for number in range(10):
+            mod_log.log(guild, entry(number))
+        await asyncio.sleep(0.05)
+        full = [len(message) for message in channel.sent]
+
+        # Three 2500-character embeds cannot fit under 6000 in one message
+        for number in range(3):
+            mod_log.log(guild, entry(number, "x" * 2500))
+        await mod_log.close()
+        await rest.close()
+        return full, [len(message) for message in channel.sent[1:]], mod_log.messages_sent
+
+    full, split, messages = asyncio.run(scenario())
+    assert full == [10]
+    assert split == [2, 1]
+    assert messages == 3
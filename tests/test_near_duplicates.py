@@ -0,0 +1,112 @@
+import asyncio
+import random
+
+from core.near_duplicates import MinHasher, NearDuplicateIndex, shingles, similarity
+
+GUILD_ID = 1
+WORDS = (
+    "channel role bot command emoji sticker voice stage event music game leaderboard rank level "
+    "reaction poll giveaway ticket support help python rust javascript web design art meme news"
+).split()
+
+
+def jaccard(left: str, right: str) -> float:
+    a, b = shingles(left), shingles(right)
+    return len(a & b) / len(a | b)
+
+
+def reword(rng: random.Random, text: str) -> str:
+    words = text.split()
+    words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return " ".join(words) + rng.choice(("", "!", " please"))
+
+
+def test_shingles_ignore_case_and_punctuation():
+    assert shingles("Hello, World!") == shingles("hello world")
+    assert shingles("   ") == set()
+
+
+def test_signatures_are_deterministic_and_full_length():
+    hasher = MinHasher(128)
+    first = hasher.signature("add a channel for music recommendations")
+    second = MinHasher(128).signature("add a channel for music recommendations")
+    assert first == second
+    assert len(first) == 128
+    assert len(hasher.signature("hi")) == 128
+    assert hasher.signature("!!!") is None
+
+
+def test_similarity_estimates_jaccard():
+    rng = random.Random(7)
+    hasher = MinHasher(128)
+    errors = []
+    for _ in range(200):
+        text = " ".join(rng.choices(WORDS, k=rng.randint(4, 12)))
+        other = reword(rng, text) if rng.random() < 0.5 else " ".join(rng.choices(WORDS, k=rng.randint(4, 12)))
+        estimate = similarity(hasher.signature(text), hasher.signature(other))
+        errors.append(abs(estimate - jaccard(text, other)))
+
+    assert sum(errors) / len(errors) < 0.05
+    assert max(errors) < 0.25
+
+
+def test_index_finds_reworded_copies(tmp_path):
+    rng = random.Random(3)
+    texts = [" ".join(rng.choices(WORDS, k=rng.randint(5, 12))) for _ in range(2000)]
+
+    async def scenario():
+        index = NearDuplicateIndex(str(tmp_path / "dupes.db"), "suggestions")
+        await index.open()
+        for doc_id, text in enumerate(texts, 1):
+            index.add(doc_id, GUILD_ID, text)
+
+        found = 0
+        queries = rng.sample(range(1, len(texts) + 1), 200)
+        for doc_id in queries:
+            results = await index.similar(GUILD_ID, reword(rng, texts[doc_id - 1]))
+            found += any(result == doc_id for result, _ in results)
+        fresh = await index.similar(GUILD_ID, "completely unrelated words about gardening tomatoes")
+        await index.close()
+        return found / len(queries), fresh
+
+    recall, fresh = asyncio.run(scenario())
+    assert recall >= 0.9
+    assert fresh == []
+
+
+def test_removed_and_excluded_documents_are_not_returned(tmp_path):
+    async def scenario():
+        index = NearDuplicateIndex(str(tmp_path / "dupes.db"), "suggestions")
+        await index.open()
+        index.add(1, GUILD_ID, "add a leaderboard for the weekly coding contest")
+        index.add(2, GUILD_ID, "add a leaderboard for the weekly coding contests")
+        before = await index.similar(GUILD_ID, "add a leaderboard for the weekly coding contest")
+        excluded = await index.similar(GUILD_ID, "add a leaderboard for the weekly coding contest", exclude=1)
+        index.remove(2)
+        after = await index.similar(GUILD_ID, "add a leaderboard for the weekly coding contest")
+        indexed = await index.indexed()
+        await index.close()
+        return before, excluded, after, indexed
+
+    before, excluded, after, indexed = asyncio.run(scenario())
+    assert [doc_id for doc_id, _ in before] == [1, 2]
+    assert before[0][1] == 1.0
+    assert [doc_id for doc_id, _ in excluded] == [2]
+    assert [doc_id for doc_id, _ in after] == [1]
+    assert indexed == {1}
+
+
+def test_lookups_only_return_documents_from_the_same_guild(tmp_path):
+    async def scenario():
+        index = NearDuplicateIndex(str(tmp_path / "dupes.db"), "suggestions")
+        await index.open()
+        index.add(1, GUILD_ID, "add a leaderboard for the weekly coding contest")
+        index.add(2, GUILD_ID + 1, "add a leaderboard for the weekly coding contest")
+        own = await index.similar(GUILD_ID, "add a leaderboard for the weekly coding contest")
+        other = await index.similar(GUILD_ID + 1, "add a leaderboard for the weekly coding contest")
+        await index.close()
+        return own, other
+
+    own, other = asyncio.run(scenario())
+    assert [doc_id for doc_id, _ in own] == [1]
+    assert [doc_id for doc_id, _ in other] == [2]
@@ -0,0 +1,142 @@
+import asyncio
+import re
+from datetime import timedelta
+
+import discord
+import pytest
+
+from core.purge import MAX_PATTERN_LENGTH, PurgeFilter, PurgeJob, compile_pattern
+from core.rest_scheduler import RestScheduler
+
+
+class FakeResponse:
+    status = 404
+    reason = "Not Found"
+
+
+class FakeAuthor:
+    def __init__(self, user_id: int, bot: bool = False):
+        self.id = user_id
+        self.bot = bot
+
+
+class FakeMessage:
+    def __init__(self, channel, message_id: int, age: timedelta, content: str = "", author_id: int = 1):
+        self.channel = channel
+        self.id = message_id
+        self.created_at = discord.utils.utcnow() - age
+        self.content = content
+        self.author = FakeAuthor(author_id)
+        self.attachments = []
+        self.pinned = False
+
+    async def delete(self):
+        self.channel.delete([self])
+
+
+class FakeChannel:
+    id = 10
+
+    def __init__(self):
+        self.messages: list[FakeMessage] = []
+        self.gone: set[int] = set()
+        self.scanned_from_history = 0
+        self.bulk_calls = 0
+
+    def add(self, age: timedelta, **kwargs) -> FakeMessage:
+        message = FakeMessage(self, len(self.messages) + 1, age, **kwargs)
+        self.messages.append(message)
+        return message
+
+    async def history(self, *, limit, before=None, oldest_first=False):
+        for message in sorted(self.messages, key=lambda m: m.created_at, reverse=True)[:limit]:
+            self.scanned_from_history += 1
+            yield message
+
+    def delete(self, messages):
+        if any(message.id in self.gone for message in messages):
+            raise discord.NotFound(FakeResponse(), "Unknown Message")
+        self.gone.update(message.id for message in messages)
+
+    async def delete_messages(self, messages):
+        self.bulk_calls += 1
+        self.delete(messages)
+
+
+def run(job: PurgeJob):
+    async def scenario():
+        job.rest = RestScheduler()
+        job.rest.start()
+        job.start()
+        await job.wait()
+        await job.rest.close()
+
+    asyncio.run(scenario())
+
+
+def test_recent_matches_are_bulk_deleted_and_old_ones_one_by_one():
+    channel = FakeChannel()
+    for minutes in range(150):
+        channel.add(timedelta(minutes=minutes), content="spam" if minutes % 2 else "hello")
+    old = channel.add(timedelta(days=20), content="spam")
+
+    job = PurgeJob(channel, PurgeFilter(pattern=re.compile("spam")), None, scan_limit=1000)
+    run(job)
+
+    assert job.scanned == 151
+    assert job.deleted == 76
+    assert channel.bulk_calls == 1
+    assert old.id in channel.gone
+    assert all(message.id in channel.gone for message in channel.messages if message.content == "spam")
+
+
+def test_walk_stops_at_the_after_bound():
+    channel = FakeChannel()
+    for hours in range(100):
+        channel.add(timedelta(hours=hours))
+
+    rules = PurgeFilter(after=discord.utils.utcnow() - timedelta(hours=9, minutes=30))
+    job = PurgeJob(channel, rules, None, scan_limit=1000)
+    run(job)
+
+    assert job.scanned == 10
+    assert job.deleted == 10
+    # Stopped one message past the bound instead of reading all 100
+    assert channel.scanned_from_history == 11
+
+
+def test_already_deleted_messages_are_not_counted():
+    channel = FakeChannel()
+    messages = [channel.add(timedelta(minutes=minutes)) for minutes in range(5)]
+    channel.gone.update({messages[1].id, messages[3].id})
+
+    job = PurgeJob(channel, PurgeFilter(), None, scan_limit=100)
+    run(job)
+
+    assert job.deleted == 3
+    assert job.failed == 0
+
+
+def test_progress_is_reported_while_nothing_matches():
+    channel = FakeChannel()
+    for minutes in range(50):
+        channel.add(timedelta(minutes=minutes), content="hello")
+
+    reports = []
+    job = PurgeJob(channel, PurgeFilter(author_id=999), None, scan_limit=100, progress=lambda j: reports.append(j.scanned))
+    run(job)
+
+    assert job.deleted == 0
+    assert reports[:3] == [1, 2, 3]
+
+
+@pytest.mark.parametrize("pattern", [r"(a+)+$", r"(\w+\s?)*!", r"(x)\1", "a" * (MAX_PATTERN_LENGTH + 1), "("])
+def test_hostile_or_invalid_patterns_are_rejected(pattern):
+    with pytest.raises(ValueError):
+        compile_pattern(pattern)
+
+
+def test_ordinary_patterns_compile_case_insensitively():
+    compiled = compile_pattern(r"free nitro.*discord\.gg/\w+")
+    assert compiled.search("FREE NITRO at discord.gg/abc")
+    assert compile_pattern("(spam|scam)+").search("SCAMSPAM")
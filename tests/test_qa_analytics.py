@@ -0,0 +1,110 @@
+import asyncio
+import random
+
+from core import qa_analytics
+from core.qa_analytics import ASK, REPLY, SOLVE, LatencySketch, QAAnalytics
+
+GUILD_ID = 1
+DAY = 86400.0
+
+
+def exact_quantile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+def test_quantiles_are_within_the_relative_accuracy():
+    rng = random.Random(5)
+    values = [rng.lognormvariate(6, 2) + 1 for _ in range(20_000)]
+    sketch = LatencySketch()
+    for value in values:
+        sketch.add(value)
+
+    for q in (0.1, 0.5, 0.9, 0.99):
+        exact = exact_quantile(values, q)
+        assert abs(sketch.quantile(q) - exact) <= LatencySketch.ACCURACY * exact * 1.01
+
+
+def test_merged_sketches_match_one_sketch_over_everything():
+    rng = random.Random(6)
+    values = [rng.uniform(1, 10_000) for _ in range(5000)]
+    whole, left, right = LatencySketch(), LatencySketch(), LatencySketch()
+    for i, value in enumerate(values):
+        whole.add(value)
+        (left if i % 2 else right).add(value)
+
+    left.merge(right)
+    assert left.count == whole.count
+    assert left.buckets == whole.buckets
+    assert left.quantile(0.5) == whole.quantile(0.5)
+
+
+def test_sketch_round_trips_through_bytes():
+    sketch = LatencySketch()
+    for value in (1, 30, 30, 600, 86400):
+        sketch.add(value)
+    copy = LatencySketch.from_bytes(sketch.to_bytes())
+    assert copy.buckets == sketch.buckets
+    assert copy.count == 5
+    assert LatencySketch.from_bytes(None).quantile(0.5) is None
+
+
+def test_stats_and_answerers_cover_the_same_days(tmp_path, monkeypatch):
+    clock = [100 * DAY]
+    monkeypatch.setattr(qa_analytics.time, "time", lambda: clock[0])
+
+    async def scenario():
+        analytics = QAAnalytics(str(tmp_path / "qa.db"), flush_interval=3600)
+        await analytics.open()
+
+        # Thirty days ago: user 20 answers three questions
+        clock[0] = 70 * DAY
+        for thread_id in (1, 2, 3):
+            analytics.record(ASK, GUILD_ID, thread_id, 10, "Python")
+            analytics.record(REPLY, GUILD_ID, thread_id, 20)
+
+        # Today: user 30 answers one question, user 20 none
+        clock[0] = 100 * DAY
+        analytics.record(ASK, GUILD_ID, 4, 10, "Rust")
+        clock[0] += 60
+        analytics.record(REPLY, GUILD_ID, 4, 10)
+        analytics.record(REPLY, GUILD_ID, 4, 30)
+        clock[0] += 600
+        analytics.record(SOLVE, GUILD_ID, 4, 10)
+
+        await analytics.flush()
+        await analytics.rollup()
+        week = await analytics.stats(GUILD_ID, 7)
+        quarter = await analytics.stats(GUILD_ID, 90)
+        rust = await analytics.stats(GUILD_ID, 90, language="rust")
+        await analytics.close()
+        return week, quarter, rust
+
+    week, quarter, rust = asyncio.run(scenario())
+
+    assert (week.total.asked, week.total.replied, week.total.solved) == (1, 1, 1)
+    # The asker's own reply doesn't count as the first reply
+    assert abs(week.total.reply.quantile(0.5) - 60) <= 60 * LatencySketch.ACCURACY
+    assert week.answerers == [(30, 1, 1)]
+
+    assert quarter.total.asked == 4
+    assert [r.language for r in quarter.languages] == ["python", "rust"]
+    assert quarter.answerers == [(20, 3, 3), (30, 1, 1)]
+
+    assert rust.answerers == [(30, 1, 1)]
+
+
+def test_rollup_never_counts_an_event_twice(tmp_path):
+    async def scenario():
+        analytics = QAAnalytics(str(tmp_path / "qa.db"), flush_interval=3600, batch=2)
+        await analytics.open()
+        for thread_id in range(5):
+            analytics.record(ASK, GUILD_ID, thread_id, 10, "Go")
+        await analytics.flush()
+        first = await analytics.rollup()
+        second = await analytics.rollup()
+        stats = await analytics.stats(GUILD_ID, 1)
+        await analytics.close()
+        return first, second, stats.total.asked
+
+    assert asyncio.run(scenario()) == (5, 0, 5)
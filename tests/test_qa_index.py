@@ -0,0 +1,87 @@
+import asyncio
+
+from core import qa_index
+from core.qa_index import QAIndex, match_query
+
+
+async def open_index(path) -> QAIndex:
+    index = QAIndex(str(path), flush_interval=3600)
+    await index.open()
+    return index
+
+
+def test_match_query_requires_every_word_and_prefixes_the_last():
+    assert match_query("async loop") == '"async" "loop"*'
+    assert match_query("  ?! ") is None
+
+
+def test_search_is_scoped_to_the_guild(tmp_path):
+    async def scenario():
+        index = await open_index(tmp_path / "qa.db")
+        index.add(1, 100, 7, "Event loop is closed", "Python", "asyncio raises on exit", None)
+        index.add(2, 200, 7, "Event loop in the browser", "JavaScript", "how does it work", None)
+        first = await index.search(100, "event loop")
+        second = await index.search(200, "event loop")
+        await index.close()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert [result.thread_id for result in first] == [1]
+    assert [result.thread_id for result in second] == [2]
+
+
+def test_other_guilds_do_not_use_up_the_candidates(tmp_path, monkeypatch):
+    monkeypatch.setattr(qa_index, "CANDIDATES", 5)
+
+    async def scenario():
+        index = await open_index(tmp_path / "qa.db")
+        index.add(1, 100, 7, "Segfault in my parser", "C", "pointer arithmetic", None)
+        # Newer matching threads in another guild
+        for thread_id in range(2, 50):
+            index.add(thread_id, 200, 8, f"Segfault number {thread_id}", "C", "crash", None)
+        results = await index.search(100, "segfault")
+        await index.close()
+        return results
+
+    assert [result.thread_id for result in asyncio.run(scenario())] == [1]
+
+
+def test_unsolved_threads_do_not_use_up_the_solved_candidates(tmp_path, monkeypatch):
+    monkeypatch.setattr(qa_index, "CANDIDATES", 5)
+
+    async def scenario():
+        index = await open_index(tmp_path / "qa.db")
+        index.add(1, 100, 7, "Segfault in my parser", "C", "pointer arithmetic", None)
+        index.mark_solved(1)
+        # Newer matching threads in the same guild, all unsolved
+        for thread_id in range(2, 50):
+            index.add(thread_id, 100, 8, f"Segfault number {thread_id}", "C", "crash", None)
+        solved = await index.search(100, "segfault", solved=True)
+        unsolved = await index.search(100, "segfault", solved=False, limit=100)
+        await index.close()
+        return solved, unsolved
+
+    solved, unsolved = asyncio.run(scenario())
+    assert [result.thread_id for result in solved] == [1]
+    assert len(unsolved) == 5 and all(not result.solved for result in unsolved)
+
+
+def test_title_hits_rank_first_and_solved_filters(tmp_path):
+    async def scenario():
+        index = await open_index(tmp_path / "qa.db")
+        index.add(1, 100, 7, "Borrow checker error", "Rust", "something about lifetimes", None)
+        index.add(2, 100, 7, "Compile error", "Rust", "the lifetimes don't match", "fn main() {}")
+        index.add(3, 100, 7, "Lifetimes explained", "Rust", "what is 'a", None)
+        index.mark_solved(2)
+        ranked = await index.search(100, "lifetimes")
+        solved = await index.search(100, "lifetimes", solved=True)
+        index.remove(3)
+        removed = await index.search(100, "lifetimes")
+        await index.close()
+        return ranked, solved, removed
+
+    ranked, solved, removed = asyncio.run(scenario())
+    assert ranked[0].thread_id == 3
+    assert {result.thread_id for result in ranked} == {1, 2, 3}
+    assert [(result.thread_id, result.solved) for result in solved] == [(2, True)]
+    assert {result.thread_id for result in removed} == {1, 2}
@@ -0,0 +1,100 @@
+import asyncio
+from datetime import timedelta
+from types import SimpleNamespace
+
+import discord
+
+from cogs import qa
+from core.rest_scheduler import RestScheduler
+
+QA_CHANNEL = 300
+
+
+class FakeThread:
+    def __init__(self, thread_id: int, name: str, idle: timedelta, archived: bool = False):
+        self.id = thread_id
+        self.name = name
+        self.archived = archived
+        self.locked = False
+        self.last_message_id = discord.utils.time_snowflake(discord.utils.utcnow() - idle)
+        self.edits: list[dict] = []
+
+    async def edit(self, **kwargs):
+        self.edits.append(kwargs)
+        return self
+
+
+class FakeChannel(discord.TextChannel):
+    def __init__(self, threads):
+        self._fake_threads = threads
+
+    @property
+    def threads(self):
+        return self._fake_threads
+
+
+def make_cog(tmp_path, threads, action: str = "archive"):
+    channel = FakeChannel(threads)
+    guild = SimpleNamespace(id=1, get_channel=lambda channel_id: channel if channel_id == QA_CHANNEL else None)
+    guild_config = SimpleNamespace(qa_channel_id=QA_CHANNEL, qa_stale_days=7, qa_stale_action=action)
+    bot = SimpleNamespace(
+        config=SimpleNamespace(
+            settings=SimpleNamespace(database_path=str(tmp_path / "qa.db"), qa_sweep_batch_size=2),
+            guild=lambda guild_id: guild_config
+        ),
+        guilds=[guild],
+        rest=RestScheduler()
+    )
+    return qa.QASystem(bot)
+
+
+def test_idle_threads_are_archived_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(qa, "SWEEP_PAUSE", 0)
+    threads = [
+        FakeThread(1, "Old question", timedelta(days=10)),
+        FakeThread(2, "Fresh question", timedelta(hours=1)),
+        FakeThread(3, "Old but archived", timedelta(days=30), archived=True),
+        FakeThread(4, "Another old one", timedelta(days=8)),
+        FakeThread(5, "Oldest", timedelta(days=90)),
+    ]
+
+    async def scenario():
+        cog = make_cog(tmp_path, threads)
+        cog.bot.rest.start()
+        swept = await cog.sweep()
+        await cog.bot.rest.close()
+        return swept
+
+    assert asyncio.run(scenario()) == 3
+    assert {thread.id for thread in threads if thread.edits == [{"archived": True}]} == {1, 4, 5}
+    assert threads[1].edits == [] and threads[2].edits == []
+
+
+def test_tagging_marks_idle_threads_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(qa, "SWEEP_PAUSE", 0)
+    threads = [
+        FakeThread(1, "Old question", timedelta(days=10)),
+        FakeThread(2, f"{qa.STALE_PREFIX}Tagged last time", timedelta(days=10)),
+    ]
+
+    async def scenario():
+        cog = make_cog(tmp_path, threads, action="tag")
+        cog.bot.rest.start()
+        swept = await cog.sweep()
+        await cog.bot.rest.close()
+        return swept
+
+    assert asyncio.run(scenario()) == 1
+    assert threads[0].edits == [{"name": f"{qa.STALE_PREFIX}Old question"}]
+    assert threads[1].edits == []
+
+
+def test_solved_button_survives_a_restart_through_its_custom_id():
+    async def scenario():
+        view = qa.SolvedView(1234, solved=True)
+        button = view.children[0]
+        match = qa.SolvedButton.__discord_ui_compiled_template__.fullmatch(button.custom_id)
+        restored = await qa.SolvedButton.from_custom_id(None, button, match)
+        return view.timeout, button.item.disabled, restored.author_id
+
+    assert asyncio.run(scenario()) == (None, True, 1234)
@@ -0,0 +1,180 @@
+import asyncio
+
+import pytest
+
+from core import rest_scheduler
+from core.rest_scheduler import Priority, RestScheduler
+
+
+def write(log: list, name: str, delay: float = 0.0):
+    async def run():
+        if delay:
+            await asyncio.sleep(delay)
+        log.append(name)
+        return name
+    return run
+
+
+def test_lanes_are_served_by_priority():
+    async def scenario():
+        rest = RestScheduler(workers=1)
+        log = []
+        futures = [
+            await rest._enqueue(Priority.COSMETIC, write(log, "cosmetic"), None, None),
+            await rest._enqueue(Priority.LOG, write(log, "log"), None, None),
+            await rest._enqueue(Priority.INTERACTION, write(log, "interaction"), None, None),
+            await rest._enqueue(Priority.MODERATION, write(log, "moderation"), None, None),
+        ]
+        rest.start()
+        await asyncio.gather(*futures)
+        await rest.close()
+        return log
+
+    assert asyncio.run(scenario()) == ["moderation", "interaction", "log", "cosmetic"]
+
+
+def test_keyed_writes_merge_into_the_newest():
+    async def scenario():
+        rest = RestScheduler()
+        log = []
+        first = asyncio.create_task(rest.submit(Priority.COSMETIC, write(log, "old"), key="edit:1"))
+        second = asyncio.create_task(rest.submit(Priority.COSMETIC, write(log, "new"), key="edit:1"))
+        await asyncio.sleep(0)
+        rest.start()
+        results = await asyncio.gather(first, second)
+        await rest.close()
+        return log, results, rest.stats()
+
+    log, results, stats = asyncio.run(scenario())
+    assert log == ["new"]
+    assert results == ["new", "new"]
+    assert stats["merged"] == 1
+    assert stats["completed"] == 1
+
+
+def test_full_cosmetic_lane_drops_its_oldest_write(monkeypatch):
+    monkeypatch.setitem(rest_scheduler.LANE_LIMITS, Priority.COSMETIC, 2)
+
+    async def scenario():
+        rest = RestScheduler()
+        log = []
+        futures = [
+            await rest._enqueue(Priority.COSMETIC, write(log, name), None, None)
+            for name in ("a", "b", "c")
+        ]
+        rest.start()
+        results = await asyncio.gather(*futures)
+        await rest.close()
+        return log, results, rest.dropped
+
+    log, results, dropped = asyncio.run(scenario())
+    assert log == ["b", "c"]
+    assert results == [None, "b", "c"]
+    assert dropped == 1
+
+
+def test_cancelled_write_never_runs():
+    async def scenario():
+        rest = RestScheduler()
+        log = []
+        future = await rest._enqueue(Priority.COSMETIC, write(log, "edit"), None, "edit:1")
+        assert rest.cancel("edit:1")
+        assert not rest.cancel("edit:1")
+        rest.start()
+        result = await future
+        await rest.close()
+        return log, result
+
+    assert asyncio.run(scenario()) == ([], None)
+
+
+def test_route_limit_caps_parallel_writes_and_keeps_order():
+    async def scenario():
+        rest = RestScheduler(workers=4, route_limit=2)
+        running, peak, log = 0, 0, []
+
+        def job(name):
+            async def run():
+                nonlocal running, peak
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+                log.append(name)
+            return run
+
+        rest.start()
+        await asyncio.gather(*(
+            rest.submit(Priority.MODERATION, job(i), route="guild:1") for i in range(8)
+        ))
+        other = await rest.submit(Priority.MODERATION, write([], "other"), route="guild:2")
+        await rest.close()
+        return peak, log, other
+
+    peak, log, other = asyncio.run(scenario())
+    assert peak == 2
+    assert sorted(log) == list(range(8))
+    assert log[:2] == [0, 1]
+    assert other == "other"
+
+
+def test_busy_route_does_not_hold_up_other_routes():
+    async def scenario():
+        rest = RestScheduler(workers=4, route_limit=1)
+        log = []
+        rest.start()
+        slow = asyncio.create_task(rest.submit(Priority.MODERATION, write(log, "slow", 0.1), route="guild:1"))
+        queued = asyncio.create_task(rest.submit(Priority.MODERATION, write(log, "queued"), route="guild:1"))
+        await asyncio.sleep(0.01)
+        await rest.submit(Priority.MODERATION, write(log, "other"), route="guild:2")
+        await asyncio.gather(slow, queued)
+        await rest.close()
+        return log
+
+    assert asyncio.run(scenario()) == ["other", "slow", "queued"]
+
+
+def test_low_priority_work_leaves_a_worker_free():
+    async def scenario():
+        rest = RestScheduler(workers=2)
+        log = []
+        rest.start()
+        logs = [
+            asyncio.create_task(rest.submit(Priority.LOG, write(log, f"log{i}", 0.1)))
+            for i in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        await rest.submit(Priority.MODERATION, write(log, "moderation"))
+        await asyncio.gather(*logs)
+        await rest.close()
+        return log
+
+    assert asyncio.run(scenario())[0] == "moderation"
+
+
+def test_errors_reach_the_caller():
+    async def scenario():
+        rest = RestScheduler()
+        rest.start()
+
+        async def fail():
+            raise ValueError("bad request")
+
+        try:
+            with pytest.raises(ValueError):
+                await rest.submit(Priority.INTERACTION, fail)
+        finally:
+            await rest.close()
+
+    asyncio.run(scenario())
+
+
+def test_closed_scheduler_rejects_writes():
+    async def scenario():
+        rest = RestScheduler()
+        rest.start()
+        await rest.close()
+        with pytest.raises(RuntimeError):
+            await rest.submit(Priority.INTERACTION, write([], "late"))
+
+    asyncio.run(scenario())
@@ -0,0 +1,99 @@
+import asyncio
+from types import SimpleNamespace
+
+import discord
+
+from cogs.suggestions import Suggestions
+from core.metrics import Metrics
+from core.rest_scheduler import RestScheduler
+
+STAFF_ROLE = 77
+
+
+class FakeThread:
+    def __init__(self, guild, fail: set[int] = frozenset()):
+        self.id = 500
+        self.guild = guild
+        self.fail = fail
+        self.added: list[int] = []
+        self.sent: list[tuple[str, discord.AllowedMentions]] = []
+        self.in_flight = 0
+        self.peak = 0
+
+    async def add_user(self, member):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            if member.id in self.fail:
+                raise discord.HTTPException(SimpleNamespace(status=403, reason="Forbidden"), "Missing Access")
+            self.added.append(member.id)
+        finally:
+            self.in_flight -= 1
+
+    async def send(self, content, allowed_mentions=None):
+        self.sent.append((content, allowed_mentions))
+
+
+def make_cog(tmp_path, mode: str, concurrency: int = 2, members: int = 6):
+    role = SimpleNamespace(
+        id=STAFF_ROLE,
+        mention=f"<@&{STAFF_ROLE}>",
+        members=[SimpleNamespace(id=member_id) for member_id in range(1, members + 1)]
+    )
+    guild = SimpleNamespace(id=1, get_role=lambda role_id: role if role_id == STAFF_ROLE else None)
+    guild_config = SimpleNamespace(
+        staff_role_id=STAFF_ROLE,
+        staff_thread_mode=mode,
+        staff_fanout_concurrency=concurrency
+    )
+
+    async def ensure_staff(guild):
+        pass
+
+    bot = SimpleNamespace(
+        config=SimpleNamespace(
+            settings=SimpleNamespace(database_path=str(tmp_path / "votes.db"), vote_edit_window_seconds=2.0),
+            guild=lambda guild_id: guild_config
+        ),
+        rest=RestScheduler(),
+        metrics=Metrics(),
+        member_cache=SimpleNamespace(ensure_staff=ensure_staff)
+    )
+    return Suggestions(bot), guild
+
+
+def test_staff_are_added_from_the_role_with_bounded_concurrency(tmp_path):
+    async def scenario():
+        cog, guild = make_cog(tmp_path, "add", concurrency=2)
+        cog.bot.rest.start()
+        thread = FakeThread(guild, fail={3})
+        cog.start_fan_out(thread)
+        await asyncio.gather(*cog.fanout_jobs)
+        await cog.bot.rest.close()
+        return cog, thread
+
+    cog, thread = asyncio.run(scenario())
+    # A failed add is logged and skipped, the rest still go through
+    assert sorted(thread.added) == [1, 2, 4, 5, 6]
+    assert thread.peak <= 2
+    assert not cog.fanout_jobs
+    assert cog.bot.metrics.counters["suggest.staff_fanout.members"] == 5
+    assert cog.bot.metrics.timings["suggest.staff_fanout"].count == 1
+
+
+def test_mention_mode_pings_the_role_once(tmp_path):
+    async def scenario():
+        cog, guild = make_cog(tmp_path, "mention")
+        cog.bot.rest.start()
+        thread = FakeThread(guild)
+        await cog.fan_out(thread)
+        await cog.bot.rest.close()
+        return cog, thread
+
+    cog, thread = asyncio.run(scenario())
+    assert thread.added == []
+    [(content, allowed)] = thread.sent
+    assert content == f"<@&{STAFF_ROLE}>"
+    assert [role.id for role in allowed.roles] == [STAFF_ROLE]
+    assert cog.bot.metrics.counters["suggest.staff_fanout.members"] == 6
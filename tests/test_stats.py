@@ -0,0 +1,56 @@
+import asyncio
+from types import SimpleNamespace
+
+from core.stats import BotStats
+
+
+def guild(guild_id: int, user_ids, chunked: bool = True, member_count: int | None = None):
+    members = [SimpleNamespace(id=user_id) for user_id in user_ids]
+    return SimpleNamespace(id=guild_id, members=members, chunked=chunked, member_count=member_count or len(members))
+
+
+def member(guild_id: int, user_id: int):
+    return SimpleNamespace(id=user_id, guild=SimpleNamespace(id=guild_id))
+
+
+def removed(guild_id: int, user_id: int):
+    return SimpleNamespace(guild_id=guild_id, user=SimpleNamespace(id=user_id))
+
+
+def test_users_in_several_guilds_are_counted_once():
+    stats = BotStats(bot=None)
+
+    async def scenario():
+        await stats.on_guild_available(guild(1, [10, 11, 12]))
+        await stats.on_guild_join(guild(2, [11, 12, 13]))
+        first = stats.snapshot()
+
+        await stats.on_member_join(member(2, 14))
+        await stats.on_raw_member_remove(removed(1, 11))
+        second = stats.snapshot()
+
+        await stats.on_guild_remove(guild(2, [11, 12, 13, 14]))
+        return first, second, stats.snapshot()
+
+    first, second, third = asyncio.run(scenario())
+    assert first == {"guilds": 2, "members": 6, "users": 4}
+    # 11 is still in guild 2, so it is not gone yet
+    assert second == {"guilds": 2, "members": 6, "users": 5}
+    assert third == {"guilds": 1, "members": 2, "users": 2}
+    assert stats.exact
+
+
+def test_unchunked_guilds_make_the_user_count_an_upper_bound():
+    stats = BotStats(bot=None)
+
+    async def scenario():
+        await stats.on_guild_available(guild(1, [10, 11]))
+        await stats.on_guild_available(guild(2, [], chunked=False, member_count=500))
+        await stats.on_member_join(member(2, 10))
+        counted = stats.users, stats.exact
+        await stats.on_guild_unavailable(guild(2, [], chunked=False))
+        return counted, (stats.users, stats.exact)
+
+    counted, after = asyncio.run(scenario())
+    assert counted == (2 + 501, False)
+    assert after == (2, True)
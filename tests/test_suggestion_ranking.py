@@ -0,0 +1,63 @@
+import random
+
+from core.suggestion_ranking import SuggestionRanking, wilson_lower_bound
+
+GUILD_ID = 1
+
+
+def test_wilson_rewards_more_evidence():
+    assert wilson_lower_bound(0, 0) == 0.0
+    assert wilson_lower_bound(40, 5) > wilson_lower_bound(3, 0)
+    assert wilson_lower_bound(10, 0) > wilson_lower_bound(10, 1)
+    assert 0.0 <= wilson_lower_bound(1, 100) < wilson_lower_bound(100, 1) < 1.0
+
+
+def ids(ranking: SuggestionRanking, status: str = "pending", offset: int = 0, limit: int = 100) -> list[int]:
+    return [entry.message_id for entry in ranking.page(GUILD_ID, status, offset, limit)]
+
+
+def test_best_first_and_newest_first_among_ties():
+    ranking = SuggestionRanking()
+    ranking.add(1, GUILD_ID, "pending", 3, 0)
+    ranking.add(2, GUILD_ID, "pending", 40, 5)
+    ranking.add(3, GUILD_ID, "pending", 0, 0)
+    ranking.add(4, GUILD_ID, "pending", 0, 0)
+    ranking.add(5, 2, "pending", 100, 0)
+    assert ids(ranking) == [2, 1, 4, 3]
+
+
+def test_votes_and_status_changes_move_entries():
+    ranking = SuggestionRanking()
+    for message_id in range(1, 6):
+        ranking.add(message_id, GUILD_ID, "pending", message_id, 0)
+    assert ids(ranking) == [5, 4, 3, 2, 1]
+
+    ranking.update(1, 50, 0)
+    ranking.set_status(5, "accepted")
+    ranking.remove(3)
+    ranking.update(999, 1, 1)
+
+    assert ids(ranking) == [1, 4, 2]
+    assert ids(ranking, "accepted") == [5]
+    assert ranking.count(GUILD_ID, "pending") == 3
+    assert len(ranking) == 4
+
+
+def test_pages_match_a_full_sort_after_random_votes():
+    rng = random.Random(11)
+    ranking = SuggestionRanking()
+    votes = {}
+    for message_id in range(1, 301):
+        ranking.add(message_id, GUILD_ID, "pending")
+        votes[message_id] = [0, 0]
+
+    for _ in range(5000):
+        message_id = rng.randint(1, 300)
+        votes[message_id][rng.random() < 0.3] += 1
+        ranking.update(message_id, *votes[message_id])
+
+    expected = sorted(votes, key=lambda m: (-wilson_lower_bound(*votes[m]), -m))
+    pages = [ids(ranking, offset=offset, limit=10) for offset in range(0, 300, 10)]
+    assert [m for page in pages for m in page] == expected
+    assert ids(ranking, offset=295, limit=10) == expected[295:]
+    assert ids(ranking, "rejected") == []
@@ -0,0 +1,145 @@
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+
+from core.timers import MAX_DURATION, TimerScheduler, parse_duration
+
+GUILD_ID = 1
+
+
+def test_parse_duration():
+    assert parse_duration("1d12h") == timedelta(days=1, hours=12)
+    assert parse_duration(" 90m ") == timedelta(minutes=90)
+    assert parse_duration("2W") == timedelta(weeks=2)
+
+
+@pytest.mark.parametrize("text", ["", "soon", "12", "1d and some", "99999999999d", "53w"])
+def test_parse_duration_rejects_garbage_and_huge_values(text):
+    with pytest.raises(ValueError):
+        parse_duration(text)
+
+
+def test_parse_duration_accepts_the_maximum():
+    assert parse_duration(f"{MAX_DURATION.days}d") == MAX_DURATION
+
+
+async def open_scheduler(path, **kwargs) -> TimerScheduler:
+    timers = TimerScheduler(str(path), **kwargs)
+    await timers.open()
+    return timers
+
+
+def test_due_timers_fire_in_order_and_are_deleted(tmp_path):
+    async def scenario():
+        timers = await open_scheduler(tmp_path / "timers.db")
+        fired = []
+
+        async def handler(batch):
+            fired.extend(timer.target_id for timer in batch)
+
+        timers.register("unban", handler)
+        timers.start()
+        now = time.time()
+        await timers.schedule("unban", now + 0.10, GUILD_ID, 2)
+        await timers.schedule("unban", now + 0.05, GUILD_ID, 1)
+        await timers.schedule("unban", now + 600, GUILD_ID, 3)
+        await asyncio.sleep(0.3)
+
+        left = await timers.db.fetchall("SELECT target_id FROM timers")
+        await timers.close()
+        return fired, left, timers.fired
+
+    fired, left, count = asyncio.run(scenario())
+    assert fired == [1, 2]
+    assert left == [(3,)]
+    assert count == 2
+
+
+def test_timers_outside_the_horizon_are_picked_up_by_a_refill(tmp_path):
+    async def scenario():
+        timers = await open_scheduler(tmp_path / "timers.db", horizon=0.2)
+        fired = []
+
+        async def handler(batch):
+            fired.extend(timer.payload["n"] for timer in batch)
+
+        timers.register("remute", handler)
+        timers.start()
+        await asyncio.sleep(0)
+        await timers.schedule("remute", time.time() + 0.5, GUILD_ID, 1, {"n": 1})
+        held = timers.pending()
+        await asyncio.sleep(0.8)
+        await timers.close()
+        return held, fired
+
+    held, fired = asyncio.run(scenario())
+    assert held == 0
+    assert fired == [1]
+
+
+def test_overdue_timers_fire_after_a_restart(tmp_path):
+    path = tmp_path / "timers.db"
+
+    async def scenario():
+        timers = await open_scheduler(path)
+        await timers.schedule("unban", time.time() - 60, GUILD_ID, 1)
+        await timers.close()
+
+        timers = await open_scheduler(path)
+        fired = []
+
+        async def handler(batch):
+            fired.extend(timer.target_id for timer in batch)
+
+        timers.register("unban", handler)
+        timers.start()
+        await asyncio.sleep(0.1)
+        await timers.close()
+        return fired
+
+    assert asyncio.run(scenario()) == [1]
+
+
+def test_cancelled_timers_do_not_fire(tmp_path):
+    async def scenario():
+        timers = await open_scheduler(tmp_path / "timers.db")
+        fired = []
+
+        async def handler(batch):
+            fired.extend(timer.target_id for timer in batch)
+
+        timers.register("unban", handler)
+        timers.start()
+        await asyncio.sleep(0)
+        await timers.schedule("unban", time.time() + 0.1, GUILD_ID, 1)
+        await timers.schedule("unban", time.time() + 0.1, GUILD_ID, 2)
+        cancelled = await timers.cancel("unban", GUILD_ID, 1)
+        await asyncio.sleep(0.3)
+        await timers.close()
+        return cancelled, fired
+
+    assert asyncio.run(scenario()) == (1, [2])
+
+
+def test_failed_handler_retries_later(tmp_path):
+    async def scenario():
+        timers = await open_scheduler(tmp_path / "timers.db", retry_delay=0.1)
+        calls = []
+
+        async def handler(batch):
+            calls.append(len(batch))
+            if len(calls) == 1:
+                raise RuntimeError("Discord is down")
+
+        timers.register("unban", handler)
+        timers.start()
+        await asyncio.sleep(0)
+        await timers.schedule("unban", time.time(), GUILD_ID, 1)
+        await asyncio.sleep(0.4)
+        left = await timers.db.fetchall("SELECT id FROM timers")
+        await timers.close()
+        return calls, left
+
+    assert asyncio.run(scenario()) == ([1, 1], [])
@@ -0,0 +1,27 @@
+from core.vote_set import VoteSet
+
+
+def test_members_are_kept_sorted_and_unique():
+    votes = VoteSet([30, 10, 20, 10])
+    assert list(votes) == [10, 20, 30]
+    assert len(votes) == 3
+
+
+def test_add_and_discard_report_whether_anything_changed():
+    votes = VoteSet()
+    assert votes.add(5)
+    assert not votes.add(5)
+    assert votes.add(1)
+    assert list(votes) == [1, 5]
+
+    assert votes.discard(5)
+    assert not votes.discard(5)
+    assert 5 not in votes
+    assert 1 in votes
+
+
+def test_full_snowflakes_fit():
+    snowflake = 2 ** 63 + 12345
+    votes = VoteSet([snowflake])
+    assert snowflake in votes
+    assert snowflake - 1 not in votes
@@ -0,0 +1,169 @@
+import asyncio
+
+from core.vote_store import DOWNVOTE, UPVOTE, VoteStore
+
+GUILD_ID = 1
+CHANNEL_ID = 2
+
+
+async def open_store(path) -> VoteStore:
+    store = VoteStore(str(path), flush_interval=3600)
+    await store.open()
+    return store
+
+
+def test_votes_survive_a_restart(tmp_path):
+    path = tmp_path / "votes.db"
+
+    async def scenario():
+        store = await open_store(path)
+        await store.create(100, GUILD_ID, CHANNEL_ID, 7, "add a music channel")
+        assert store.vote(100, 10, UPVOTE)
+        assert store.vote(100, 11, UPVOTE)
+        assert store.vote(100, 12, DOWNVOTE)
+        await store.close()
+
+        store = await open_store(path)
+        record = store.get(100)
+        await store.close()
+        return record
+
+    record = asyncio.run(scenario())
+    assert record.content == "add a music channel"
+    assert list(record.upvotes) == [10, 11]
+    assert list(record.downvotes) == [12]
+
+
+def test_repeat_vote_is_rejected_and_switching_moves_the_vote(tmp_path):
+    async def scenario():
+        store = await open_store(tmp_path / "votes.db")
+        await store.create(100, GUILD_ID, CHANNEL_ID, 7, "text")
+        results = [
+            store.vote(100, 10, UPVOTE),
+            store.vote(100, 10, UPVOTE),
+            store.vote(100, 10, DOWNVOTE),
+        ]
+        record = store.get(100)
+        await store.close()
+        return results, record
+
+    results, record = asyncio.run(scenario())
+    assert results == [True, False, True]
+    assert list(record.upvotes) == []
+    assert list(record.downvotes) == [10]
+
+
+def test_closed_suggestions_are_not_reloaded_as_open(tmp_path):
+    path = tmp_path / "votes.db"
+
+    async def scenario():
+        store = await open_store(path)
+        await store.create(100, GUILD_ID, CHANNEL_ID, 7, "text")
+        store.vote(100, 10, UPVOTE)
+        closed = await store.close_suggestion(100, "accepted")
+        await store.close()
+
+        store = await open_store(path)
+        reopened = store.get(100)
+        await store.close()
+        return closed, reopened
+
+    closed, reopened = asyncio.run(scenario())
+    assert closed is not None and list(closed.upvotes) == [10]
+    assert reopened is None
+
+
+def test_full_batch_is_flushed_without_waiting_for_the_interval(tmp_path):
+    async def scenario():
+        store = VoteStore(str(tmp_path / "votes.db"), flush_interval=3600, max_batch=3)
+        await store.open()
+        await store.create(100, GUILD_ID, CHANNEL_ID, 7, "text")
+        for user_id in (10, 11, 12):
+            store.vote(100, user_id, UPVOTE)
+        await asyncio.sleep(0.1)
+
+        rows = await store.db.fetchall("SELECT user_id FROM suggestion_votes ORDER BY user_id")
+        await store.close()
+        return rows
+
+    assert asyncio.run(scenario()) == [(10,), (11,), (12,)]
+
+
+def test_failed_flush_keeps_the_batch_without_clobbering_newer_votes(tmp_path):
+    async def scenario():
+        store = await open_store(tmp_path / "votes.db")
+        await store.create(100, GUILD_ID, CHANNEL_ID, 7, "text")
+        store.vote(100, 10, UPVOTE)
+
+        transaction = store.db.transaction
+
+        async def failing(fn):
+            # The user switches their vote while the write is failing
+            store.vote(100, 10, DOWNVOTE)
+            raise RuntimeError("disk full")
+
+        store.db.transaction = failing
+        try:
+            await store.flush()
+        except RuntimeError:
+            pass
+        store.db.transaction = transaction
+
+        await store.flush()
+        rows = await store.db.fetchall("SELECT user_id, value FROM suggestion_votes")
+        await store.close()
+        return rows
+
+    assert asyncio.run(scenario()) == [(10, DOWNVOTE)]
+
+
+def test_only_one_of_two_concurrent_reviews_closes_the_suggestion(tmp_path):
+    async def scenario():
+        store = await open_store(tmp_path / "votes.db")
+        await store.create(100, GUILD_ID, CHANNEL_ID, 7, "text")
+        results = await asyncio.gather(
+            store.close_suggestion(100, "accepted"),
+            store.close_suggestion(100, "rejected"),
+        )
+        status = await store.db.fetchone("SELECT status FROM suggestions WHERE message_id = 100")
+        ranked = store.ranking.count(GUILD_ID, "accepted"), store.ranking.count(GUILD_ID, "rejected")
+        await store.close()
+        return results, status, ranked
+
+    results, status, ranked = asyncio.run(scenario())
+    assert results[0] is not None and results[1] is None
+    assert status == ("accepted",)
+    assert ranked == (1, 0)
+
+
+def test_merge_unions_voters_and_closes_the_source(tmp_path):
+    path = tmp_path / "votes.db"
+
+    async def scenario():
+        store = await open_store(path)
+        await store.create(100, GUILD_ID, CHANNEL_ID, 7, "source")
+        await store.create(200, GUILD_ID, CHANNEL_ID, 8, "target")
+        store.vote(100, 10, UPVOTE)
+        store.vote(100, 11, DOWNVOTE)
+        store.vote(100, 12, UPVOTE)
+        # Already voted on the target: that vote wins
+        store.vote(200, 12, DOWNVOTE)
+
+        moved = await store.merge(100, 200)
+        again = await store.merge(100, 200)
+        status = await store.db.fetchone("SELECT status FROM suggestions WHERE message_id = 100")
+        await store.close()
+
+        store = await open_store(path)
+        target = store.get(200)
+        source = store.get(100)
+        await store.close()
+        return moved, again, status, target, source
+
+    moved, again, status, target, source = asyncio.run(scenario())
+    assert moved == 2
+    assert again is None
+    assert status == ("merged",)
+    assert list(target.upvotes) == [10]
+    assert list(target.downvotes) == [11, 12]
+    assert source is None